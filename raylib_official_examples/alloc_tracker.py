@@ -0,0 +1,163 @@
+"""
+Per-frame allocation tracker for example main loops: rl.ffi.new() calls and Python heap.
+
+Allocating every frame (rl.ffi.new() for shader values, rl.Vector2/rl.Color temporaries, lists...)
+creates garbage collector churn, which shows up as frame hitches. AllocationTracker measures it:
+- rl.ffi is replaced by a proxy counting the rl.ffi.new() calls and their size, including those
+  done by pyray itself (struct constructors such as rl.Vector2(), string conversions), and
+  attributing them to the first calling source line outside of pyray,
+- tracemalloc measures, for each frame, the peak of the Python heap above its level at the start
+  of the frame (memory allocated and released during the frame) and its net growth,
+- after the warmup frames, a tracemalloc snapshot is taken; at the end, it is compared with a
+  new snapshot to find the source lines that retained memory.
+
+Frames are delimited by rl.end_drawing(). Usage with example_harness.py (any example):
+
+    python raylib_official_examples/example_harness.py --track-allocs raylib_official_examples/shaders/shaders_mesh_instancing.py
+
+--alloc-budget N makes the run fail when the example averages more than N rl.ffi.new() calls per
+frame, so regressions can be caught by benchmark jobs.
+"""
+import array
+import os
+import sys
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
+
+import pyray as rl
+
+TOP_LINES = 10  # Number of source lines listed in the summary
+TRACEMALLOC_FRAMES = 1  # Stack depth recorded by tracemalloc, the allocating line is enough
+
+PYRAY_DIR = os.path.dirname(rl.__file__)
+THIS_FILE = os.path.abspath(__file__)
+
+# The tracker's own allocations are not reported
+SNAPSHOT_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, THIS_FILE)]
+
+
+class CountingFFI:
+    """Forwards everything to the cffi FFI instance, counting the new() calls."""
+
+    def __init__(self, ffi, tracker: "AllocationTracker"):
+        self._ffi = ffi
+        self._tracker = tracker
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._ffi, name)
+
+    def new(self, cdecl, init=None):
+        cdata = self._ffi.new(cdecl, init)
+        ctype = self._ffi.typeof(cdata)
+        # Owned memory is the pointed item for pointers, the whole array for arrays
+        size = self._ffi.sizeof(ctype.item) if ctype.kind == "pointer" else self._ffi.sizeof(cdata)
+        self._tracker.count_ffi_allocation(size)
+        return cdata
+
+
+class AllocationTracker:
+    """Counts allocations per frame, see the module docstring."""
+
+    def __init__(self, warmup_frames: int = 0):
+        self.warmup_frames = warmup_frames
+        self.frame_count = 0
+        # Per measured frame series
+        self.ffi_allocs_per_frame = array.array("l")
+        self.ffi_bytes_per_frame = array.array("l")
+        self.heap_peak_bytes_per_frame = array.array("l")
+        self.heap_net_bytes_per_frame = array.array("l")
+        self.ffi_lines: Counter = Counter()
+        self._frame_ffi_allocs = 0
+        self._frame_ffi_bytes = 0
+        self._frame_start_heap = 0
+        self._baseline_snapshot = None
+        self._retained_lines: List[Tuple[str, int, int]] = []
+        self._originals: Dict[str, Callable[..., Any]] = {}
+        self._original_ffi = None
+
+    def count_ffi_allocation(self, size: int):
+        self._frame_ffi_allocs += 1
+        self._frame_ffi_bytes += size
+        if self.frame_count >= self.warmup_frames:
+            frame = sys._getframe(2)
+            while frame is not None and (frame.f_code.co_filename.startswith(PYRAY_DIR)
+                                         or frame.f_code.co_filename == THIS_FILE):
+                frame = frame.f_back
+            if frame is not None:
+                self.ffi_lines[f"{frame.f_code.co_filename}:{frame.f_lineno}"] += 1
+
+    def install(self):
+        """Starts tracemalloc, and patches rl.ffi and rl.end_drawing()."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._original_ffi = rl.ffi
+        rl.ffi = CountingFFI(self._original_ffi, self)
+        self._originals["end_drawing"] = rl.end_drawing
+        original_end_drawing = self._originals["end_drawing"]
+
+        def end_drawing():
+            original_end_drawing()
+            self.end_frame()
+
+        rl.end_drawing = end_drawing
+        self._frame_start_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def end_frame(self):
+        """Records the allocations of the frame that just ended."""
+        current, peak = tracemalloc.get_traced_memory()
+        if self.frame_count >= self.warmup_frames:
+            self.ffi_allocs_per_frame.append(self._frame_ffi_allocs)
+            self.ffi_bytes_per_frame.append(self._frame_ffi_bytes)
+            self.heap_peak_bytes_per_frame.append(peak - self._frame_start_heap)
+            self.heap_net_bytes_per_frame.append(current - self._frame_start_heap)
+        self.frame_count += 1
+        if self.frame_count == self.warmup_frames:
+            self._baseline_snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        self._frame_ffi_allocs = 0
+        self._frame_ffi_bytes = 0
+        # Measured after the snapshot, its own allocations are not accounted to the next frame
+        self._frame_start_heap = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def uninstall(self):
+        """Restores rl.ffi and rl.end_drawing(), and compares the heap with the one after warmup."""
+        if self._baseline_snapshot is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+            statistics = snapshot.compare_to(self._baseline_snapshot, "lineno")
+            self._retained_lines = [(f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff,
+                                     stat.count_diff) for stat in statistics[:TOP_LINES] if stat.size_diff > 0]
+            self._baseline_snapshot = None
+        tracemalloc.stop()
+        if self._original_ffi is not None:
+            rl.ffi = self._original_ffi
+            self._original_ffi = None
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
+
+    def mean_ffi_allocs_per_frame(self) -> float:
+        frames = len(self.ffi_allocs_per_frame)
+        return sum(self.ffi_allocs_per_frame) / frames if frames else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the per-frame means and maximums, and the top allocating source lines."""
+        frames = len(self.ffi_allocs_per_frame)
+
+        def mean(values) -> float:
+            return sum(values) / frames if frames else 0.0
+
+        return {
+            "measured_frames": frames,
+            "ffi_allocs_per_frame": mean(self.ffi_allocs_per_frame),
+            "ffi_allocs_per_frame_max": max(self.ffi_allocs_per_frame, default=0),
+            "ffi_bytes_per_frame": mean(self.ffi_bytes_per_frame),
+            "heap_peak_bytes_per_frame": mean(self.heap_peak_bytes_per_frame),
+            "heap_peak_bytes_per_frame_max": max(self.heap_peak_bytes_per_frame, default=0),
+            "heap_net_bytes_per_frame": mean(self.heap_net_bytes_per_frame),
+            "top_ffi_lines": [{"line": line, "allocs_per_frame": count / frames if frames else 0.0}
+                              for line, count in self.ffi_lines.most_common(TOP_LINES)],
+            "top_retaining_lines": [{"line": line, "bytes": size, "blocks": count}
+                                    for line, size, count in self._retained_lines],
+        }
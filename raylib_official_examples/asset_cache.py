@@ -0,0 +1,216 @@
+"""
+Reference-counted asset cache for textures, images, fonts and models.
+
+Examples load their assets directly with rl.load_texture(), rl.load_font()... A screen manager
+(see core/core_basic_screen_manager.py) that loads the assets of a screen when entering it, and
+unloads them when leaving it, pays the file decoding and the GPU upload again each time the same
+screen is entered. AssetCache avoids that:
+- assets are keyed by (kind, path, load parameters, file modification time): loading the same
+  asset twice returns the same handle, and a modified file is loaded again,
+- each load increments a reference count, release() decrements it,
+- released assets are not unloaded immediately: they stay in the cache, in least recently used
+  order, and are only unloaded when the estimated RAM or VRAM use exceeds its budget.
+  Assets still referenced are never unloaded, even over budget.
+
+    cache = AssetCache()
+    texture = cache.texture(str(THIS_DIR/"resources/ps3.png"))  # Loads the texture
+    cache.release(texture)  # Still loaded
+    texture = cache.texture(str(THIS_DIR/"resources/ps3.png"))  # Same texture, no load
+    ...
+    cache.unload_all()  # Before rl.close_window()
+
+AssetScope groups the assets of a screen, so they can all be released when leaving it.
+"""
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import pyray as rl
+
+DEFAULT_RAM_BUDGET = 256 * 1024 * 1024
+DEFAULT_VRAM_BUDGET = 512 * 1024 * 1024
+
+
+def texture_size(texture) -> int:
+    """Estimated GPU memory of a texture, including its mipmaps."""
+    size = rl.get_pixel_data_size(texture.width, texture.height, texture.format)
+    return size * 4 // 3 if texture.mipmaps > 1 else size
+
+
+def image_size(image) -> int:
+    return rl.get_pixel_data_size(image.width, image.height, image.format)
+
+
+def font_ram_size(font) -> int:
+    """Estimated CPU memory of a font: glyph infos, rectangles and glyph images."""
+    size = font.glyphCount * (rl.ffi.sizeof("GlyphInfo") + rl.ffi.sizeof("Rectangle"))
+    for i in range(font.glyphCount):
+        size += image_size(font.glyphs[i].image)
+    return size
+
+
+def model_size(model) -> int:
+    """Estimated memory of the meshes of a model (raylib keeps a CPU copy of the GPU buffers)."""
+    size = 0
+    for i in range(model.meshCount):
+        mesh = model.meshes[i]
+        # Positions, texcoords and normals, as floats, and 16 bits indices
+        size += mesh.vertexCount * (3 + 2 + 3) * 4 + mesh.triangleCount * 3 * 2
+    return size
+
+
+class CacheEntry:
+    def __init__(self, key: Tuple[Hashable, ...], asset: Any, unload: Callable[[Any], None],
+                 ram_bytes: int, vram_bytes: int):
+        self.key = key
+        self.asset = asset
+        self.unload = unload
+        self.ram_bytes = ram_bytes
+        self.vram_bytes = vram_bytes
+        self.references = 0
+
+
+class AssetCache:
+    """Loads assets once, and unloads the unreferenced ones in LRU order when over budget."""
+
+    def __init__(self, ram_budget: int = DEFAULT_RAM_BUDGET, vram_budget: int = DEFAULT_VRAM_BUDGET):
+        self.ram_budget = ram_budget
+        self.vram_budget = vram_budget
+        self.ram_bytes = 0
+        self.vram_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: Dict[Tuple[Hashable, ...], CacheEntry] = {}
+        self._entries_by_asset: Dict[int, CacheEntry] = {}  # id() of the returned handle -> entry
+        self._unreferenced: "OrderedDict[Tuple[Hashable, ...], CacheEntry]" = OrderedDict()  # LRU first
+
+    def texture(self, path: str):
+        return self._acquire("texture", path, (), lambda: self._load_texture(path))
+
+    def image(self, path: str):
+        return self._acquire("image", path, (), lambda: self._load_image(path))
+
+    def font(self, path: str):
+        return self._acquire("font", path, (), lambda: self._load_font(rl.load_font(path)))
+
+    def font_ex(self, path: str, font_size: int, codepoints: Optional[Sequence[int]] = None):
+        """Same as rl.load_font_ex(), codepoints is a sequence of int (None: default character set)."""
+        params = (font_size, tuple(codepoints) if codepoints is not None else None)
+
+        def load():
+            if codepoints is None:
+                return self._load_font(rl.load_font_ex(path, font_size, rl.ffi.NULL, 0))
+            return self._load_font(rl.load_font_ex(path, font_size, rl.ffi.new("int[]", list(codepoints)),
+                                                   len(codepoints)))
+
+        return self._acquire("font", path, params, load)
+
+    def model(self, path: str):
+        return self._acquire("model", path, (), lambda: self._load_model(path))
+
+    @staticmethod
+    def _load_texture(path: str):
+        texture = rl.load_texture(path)
+        return texture, rl.unload_texture, 0, texture_size(texture)
+
+    @staticmethod
+    def _load_image(path: str):
+        image = rl.load_image(path)
+        return image, rl.unload_image, image_size(image), 0
+
+    @staticmethod
+    def _load_font(font):
+        return font, rl.unload_font, font_ram_size(font), texture_size(font.texture)
+
+    @staticmethod
+    def _load_model(path: str):
+        model = rl.load_model(path)
+        size = model_size(model)
+        return model, rl.unload_model, size, size
+
+    def _acquire(self, kind: str, path: str, params: Tuple[Hashable, ...], load: Callable[[], Tuple]):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            mtime = 0  # Let raylib report the missing file
+        key = (kind, os.path.abspath(path), params, mtime)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = CacheEntry(key, *load())
+            self._entries[key] = entry
+            self._entries_by_asset[id(entry.asset)] = entry
+            self.ram_bytes += entry.ram_bytes
+            self.vram_bytes += entry.vram_bytes
+        else:
+            self.hits += 1
+            self._unreferenced.pop(key, None)
+        entry.references += 1
+        self._evict()
+        return entry.asset
+
+    def release(self, asset):
+        """Releases one reference to an asset returned by the cache."""
+        entry = self._entries_by_asset[id(asset)]
+        if entry.references <= 0:
+            raise ValueError(f"Asset {entry.key} released more times than acquired")
+        entry.references -= 1
+        if entry.references == 0:
+            self._unreferenced[entry.key] = entry
+            self._evict()
+
+    def _evict(self):
+        """Unloads the least recently used unreferenced assets until both budgets are met."""
+        while self._unreferenced and (self.ram_bytes > self.ram_budget or self.vram_bytes > self.vram_budget):
+            _, entry = self._unreferenced.popitem(last=False)
+            self._unload(entry)
+            self.evictions += 1
+
+    def _unload(self, entry: CacheEntry):
+        entry.unload(entry.asset)
+        del self._entries[entry.key]
+        del self._entries_by_asset[id(entry.asset)]
+        self.ram_bytes -= entry.ram_bytes
+        self.vram_bytes -= entry.vram_bytes
+
+    def unload_all(self):
+        """Unloads every asset, referenced or not. Must be called before rl.close_window()."""
+        for entry in list(self._entries.values()):
+            self._unload(entry)
+        self._unreferenced.clear()
+
+    def scope(self) -> "AssetScope":
+        return AssetScope(self)
+
+
+class AssetScope:
+    """Loads assets through a cache, and remembers them so release_all() releases them together."""
+
+    def __init__(self, cache: AssetCache):
+        self.cache = cache
+        self._assets: List[Any] = []
+
+    def _keep(self, asset):
+        self._assets.append(asset)
+        return asset
+
+    def texture(self, path: str):
+        return self._keep(self.cache.texture(path))
+
+    def image(self, path: str):
+        return self._keep(self.cache.image(path))
+
+    def font(self, path: str):
+        return self._keep(self.cache.font(path))
+
+    def font_ex(self, path: str, font_size: int, codepoints: Optional[Sequence[int]] = None):
+        return self._keep(self.cache.font_ex(path, font_size, codepoints))
+
+    def model(self, path: str):
+        return self._keep(self.cache.model(path))
+
+    def release_all(self):
+        for asset in self._assets:
+            self.cache.release(asset)
+        self._assets.clear()
@@ -0,0 +1,261 @@
+"""
+Asynchronous asset loader: decoding on worker threads, GPU uploads on the main thread.
+
+Loading a level with rl.load_texture(), rl.load_font_ex()... blocks the render thread for the
+whole file decoding. AsyncAssetLoader splits each load in two stages:
+- decode, on worker threads: rl.load_image(), rl.load_wave(), rl.load_file_data() and
+  rl.load_font_data() + rl.gen_image_font_atlas(). These produce CPU memory only, and cffi
+  releases the GIL during the C calls, so the workers really run in parallel,
+- upload, on the main thread (OpenGL calls must be made by the thread owning the context):
+  rl.load_texture_from_image(), rl.load_sound_from_wave()... update() performs the pending
+  uploads each frame, until its time budget is spent (at least one upload per call, so
+  loading always progresses).
+
+Requests are processed by priority (lower value first, then in request order), and can be
+cancelled until they are done. Typical usage:
+
+    loader = AsyncAssetLoader()
+    request = loader.request_texture(str(THIS_DIR/"resources/ps3.png"), priority=0)
+    while not rl.window_should_close():
+        loader.update()  # In the main loop, e.g. before rl.begin_drawing()
+        if request.state == LoadState.DONE:
+            texture = request.result
+        ...  # Draw loader.progress
+    loader.shutdown()
+"""
+import heapq
+import itertools
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+import pyray as rl
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_UPLOAD_BUDGET_MS = 4.0  # Upload time allowed per frame
+FONT_GLYPH_PADDING = 4  # Same as raylib FONT_TTF_DEFAULT_CHARS_PADDING
+DEFAULT_GLYPH_COUNT = 95  # Glyphs loaded by raylib when no codepoints are given
+FONT_IMAGE_KEY = rl.MAGENTA  # Key color separating the glyphs of image fonts (see rl.load_font())
+FONT_IMAGE_FIRST_CHAR = 32
+
+
+class LoadState:
+    PENDING = 0  # Waiting for a worker
+    DECODING = 1
+    DECODED = 2  # Waiting for the upload on the main thread
+    DONE = 3
+    CANCELLED = 4
+    FAILED = 5
+
+
+class LoadRequest:
+    """One asset to load. result is set once state is LoadState.DONE."""
+
+    def __init__(self, kind: str, path: str, priority: int, decode: Callable[[], Any],
+                 upload: Callable[[Any], Any], discard: Callable[[Any], None]):
+        self.kind = kind
+        self.path = path
+        self.priority = priority
+        self.state = LoadState.PENDING
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._decode = decode
+        self._upload = upload
+        self._discard = discard  # Frees decoded data that won't be uploaded
+        self._decoded: Any = None
+        self._cancelled = False
+
+    def cancel(self):
+        """Cancels the request if it is not done. Decoded data is freed by the next update()."""
+        self._cancelled = True
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (LoadState.DONE, LoadState.CANCELLED, LoadState.FAILED)
+
+
+class AsyncAssetLoader:
+    """Decodes assets on worker threads and uploads them within a per-frame budget, see the module docstring."""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, upload_budget_ms: float = DEFAULT_UPLOAD_BUDGET_MS):
+        self.upload_budget_ns = int(upload_budget_ms * 1e6)
+        self._order = itertools.count()  # Tie breaker keeping the request order for equal priorities
+        self._pending: "queue.PriorityQueue[Tuple[int, int, Optional[LoadRequest]]]" = queue.PriorityQueue()
+        self._decoded: List[Tuple[int, int, LoadRequest]] = []  # Heap, only used with _decoded_lock
+        self._decoded_lock = threading.Lock()
+        self._requests: List[LoadRequest] = []
+        self._workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+        for worker in self._workers:
+            worker.start()
+
+    # Requests
+    def _request(self, kind: str, path: str, priority: int, decode: Callable[[], Any],
+                 upload: Callable[[Any], Any], discard: Callable[[Any], None]) -> LoadRequest:
+        request = LoadRequest(kind, path, priority, decode, upload, discard)
+        self._requests.append(request)
+        self._pending.put((priority, next(self._order), request))
+        return request
+
+    def request_image(self, path: str, priority: int = 0) -> LoadRequest:
+        """Loads an rl.Image (CPU only, no upload)."""
+        return self._request("image", path, priority, lambda: self._decode_image(path), lambda image: image,
+                             rl.unload_image)
+
+    def request_texture(self, path: str, priority: int = 0) -> LoadRequest:
+        return self._request("texture", path, priority, lambda: self._decode_image(path), self._upload_texture,
+                             rl.unload_image)
+
+    def request_wave(self, path: str, priority: int = 0) -> LoadRequest:
+        """Loads an rl.Wave (CPU only, no upload)."""
+        return self._request("wave", path, priority, lambda: self._decode_wave(path), lambda wave: wave,
+                             rl.unload_wave)
+
+    def request_sound(self, path: str, priority: int = 0) -> LoadRequest:
+        """Loads an rl.Sound, the audio device must be initialized."""
+        return self._request("sound", path, priority, lambda: self._decode_wave(path), self._upload_sound,
+                             rl.unload_wave)
+
+    def request_font(self, path: str, font_size: int = 32, priority: int = 0) -> LoadRequest:
+        """Loads an rl.Font from a TTF/OTF file (glyphs and atlas are generated by the worker),
+        or from an image font (glyphs are extracted from the image on the main thread)."""
+        if rl.is_file_extension(path, ".ttf;.otf"):
+            return self._request("font", path, priority, lambda: self._decode_font(path, font_size),
+                                 self._upload_font, self._discard_font)
+        return self._request("font", path, priority, lambda: self._decode_image(path), self._upload_image_font,
+                             rl.unload_image)
+
+    # Worker threads
+    @staticmethod
+    def _decode_image(path: str):
+        image = rl.load_image(path)
+        if image.data == rl.ffi.NULL:
+            raise ValueError(f"Failed to load image {path}")
+        return image
+
+    @staticmethod
+    def _decode_wave(path: str):
+        wave = rl.load_wave(path)
+        if wave.data == rl.ffi.NULL:
+            raise ValueError(f"Failed to load wave {path}")
+        return wave
+
+    def _worker(self):
+        while True:
+            _, order, request = self._pending.get()
+            if request is None:  # Shutdown
+                return
+            if request._cancelled:
+                request.state = LoadState.CANCELLED
+                continue
+            request.state = LoadState.DECODING
+            try:
+                request._decoded = request._decode()
+            except Exception as e:
+                request.error = f"{type(e).__name__}: {e}"
+                request.state = LoadState.FAILED
+                continue
+            request.state = LoadState.DECODED
+            with self._decoded_lock:
+                heapq.heappush(self._decoded, (request.priority, order, request))
+
+    @staticmethod
+    def _decode_font(path: str, font_size: int):
+        data_size = rl.ffi.new("int *")
+        file_data = rl.load_file_data(path, data_size)
+        if file_data == rl.ffi.NULL:
+            raise ValueError(f"Failed to load font file {path}")
+        try:
+            glyphs = rl.load_font_data(file_data, data_size[0], font_size, rl.ffi.NULL, 0, rl.FONT_DEFAULT)
+        finally:
+            rl.unload_file_data(file_data)
+        if glyphs == rl.ffi.NULL:
+            raise ValueError(f"Failed to load font data from {path}")
+        recs = rl.ffi.new("Rectangle **")
+        atlas = rl.gen_image_font_atlas(glyphs, recs, DEFAULT_GLYPH_COUNT, font_size, FONT_GLYPH_PADDING, 0)
+        return font_size, glyphs, recs[0], atlas
+
+    # Main thread
+    @staticmethod
+    def _upload_texture(image):
+        texture = rl.load_texture_from_image(image)
+        rl.unload_image(image)
+        return texture
+
+    @staticmethod
+    def _upload_sound(wave):
+        sound = rl.load_sound_from_wave(wave)
+        rl.unload_wave(wave)
+        return sound
+
+    @staticmethod
+    def _upload_font(decoded):
+        font_size, glyphs, recs, atlas = decoded
+        texture = rl.load_texture_from_image(atlas)
+        rl.unload_image(atlas)
+        # Same fields as set by rl.load_font_ex(), the font can be unloaded with rl.unload_font()
+        return rl.Font(font_size, DEFAULT_GLYPH_COUNT, FONT_GLYPH_PADDING, texture, recs, glyphs)
+
+    @staticmethod
+    def _discard_font(decoded):
+        _, glyphs, recs, atlas = decoded
+        rl.unload_font_data(glyphs, DEFAULT_GLYPH_COUNT)
+        rl.mem_free(recs)
+        rl.unload_image(atlas)
+
+    @staticmethod
+    def _upload_image_font(image):
+        font = rl.load_font_from_image(image, FONT_IMAGE_KEY, FONT_IMAGE_FIRST_CHAR)
+        rl.unload_image(image)
+        return font
+
+    def update(self) -> int:
+        """Uploads decoded assets until the per-frame budget is spent. Returns the number of uploads."""
+        start_ns = time.perf_counter_ns()
+        uploads = 0
+        while True:
+            with self._decoded_lock:
+                if not self._decoded:
+                    break
+                _, _, request = heapq.heappop(self._decoded)
+            decoded, request._decoded = request._decoded, None
+            if request._cancelled:
+                request._discard(decoded)
+                request.state = LoadState.CANCELLED
+                continue
+            request.result = request._upload(decoded)
+            request.state = LoadState.DONE
+            uploads += 1
+            if time.perf_counter_ns() - start_ns >= self.upload_budget_ns:
+                break
+        return uploads
+
+    @property
+    def progress(self) -> float:
+        """Fraction of the requests that are finished (done, cancelled or failed), 1.0 without request."""
+        if not self._requests:
+            return 1.0
+        return sum(1 for request in self._requests if request.finished) / len(self._requests)
+
+    @property
+    def idle(self) -> bool:
+        """True when all the requests are finished."""
+        return all(request.finished for request in self._requests)
+
+    def cancel_all(self):
+        for request in self._requests:
+            request.cancel()
+
+    def clear(self):
+        """Forgets the finished requests (their results are not unloaded), so progress restarts from 0."""
+        self._requests = [request for request in self._requests if not request.finished]
+
+    def shutdown(self):
+        """Cancels the pending requests, stops the workers and frees the decoded data not uploaded."""
+        self.cancel_all()
+        for _ in self._workers:
+            self._pending.put((-1, -1, None))  # Sorted before any request
+        for worker in self._workers:
+            worker.join()
+        self.update()
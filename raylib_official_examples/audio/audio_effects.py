@@ -0,0 +1,193 @@
+"""
+Audio effects processing blocks of samples with NumPy, chained in one audio processor.
+
+Audio processors attached with rl.attach_audio_stream_processor() (or
+rl.attach_audio_mixed_processor()) are called from the audio thread with a buffer of float
+samples to modify in place. Processing the samples one by one in Python, through
+rl.ffi.cast("float *", buffer), takes a large part of the time available before the next
+buffer is needed, so the audio underruns as soon as a second effect is attached. The effects
+of this module process the whole buffer at once instead:
+- samples_array() views the buffer as a (frames, channels) float32 NumPy array, without copy,
+- LowPassFilter is a one-pole IIR filter (y += k*(x - y)), computed with its closed form
+  over blocks of samples (cumulative sums scaled by powers of the pole), the filter state
+  being carried from block to block,
+- Delay is a feedback delay line, reading and writing its ring buffer with slices, in blocks
+  no longer than the delay,
+- Gain scales the samples, Shaper raises them to an exponent (keeping their sign).
+
+Effects are nodes of an EffectChain, which registers a single processor (one C to Python call
+per buffer, whatever the number of effects) running its nodes in order, over float64 scratch
+buffers allocated once. Nodes are bypassed by setting their bypass attribute, without
+detaching anything, their state being kept meanwhile:
+
+    chain = EffectChain()
+    lpf = chain.add(LowPassFilter(70.0, 44100))
+    delay = chain.add(Delay(1.0, 48000), bypass=True)
+    rl.attach_audio_stream_processor(music.stream, chain.callback)
+    ...
+    delay.bypass = not delay.bypass  # From the main thread, while attached
+
+Nodes are Effect subclasses, implementing process(samples, scratch). The nodes list must not be
+changed while the chain is attached, bypass and the node parameters can.
+"""
+import math
+from typing import Callable, List, Optional
+
+import numpy as np
+
+import pyray as rl
+
+# The closed form of the IIR filter scales samples by pole^-n, blocks are short enough to keep
+# these factors below MAX_POLE_SCALE (float64 cumulative sums keep enough precision)
+MAX_POLE_SCALE = 1e6
+DEFAULT_MAX_FRAMES = 4096  # Frames of the chain scratch buffers, grown if a larger buffer is processed
+
+
+def samples_array(buffer, frames: int, channels: int = 2) -> np.ndarray:
+    """Returns a writable (frames, channels) float32 array viewing a processor buffer, without copy."""
+    samples = rl.ffi.buffer(rl.ffi.cast("float *", buffer), frames * channels * 4)
+    return np.frombuffer(samples, np.float32).reshape(frames, channels)
+
+
+def stream_processor(process: Callable[[np.ndarray], None], channels: int = 2):
+    """Returns the C callback of process(samples), for rl.attach_audio_stream_processor() or
+    rl.attach_audio_mixed_processor(). A reference to it must be kept while it is attached."""
+    def processor(buffer, frames):
+        process(samples_array(buffer, frames, channels))
+    return rl.ffi.callback("void(void*, unsigned int)")(processor)
+
+
+class Effect:
+    """Effect node: modifies (frames, channels) float32 samples in place, see the module docstring."""
+
+    bypass = False  # Skipped by the chain when True
+
+    def process(self, samples: np.ndarray, scratch: Optional[np.ndarray] = None):
+        """Processes samples in place. scratch is a float64 array of at least the samples shape, for
+        temporary values (allocated by the effect if None, e.g. when not run by a chain)."""
+        raise NotImplementedError
+
+
+class LowPassFilter(Effect):
+    """One-pole low-pass filter, same as y += k*(x - y) for each sample of each channel."""
+
+    def __init__(self, cutoff: float, sample_rate: float = 44100.0, channels: int = 2):
+        self.channels = channels
+        self.state = np.zeros(channels)  # Last output of each channel
+        self.set_cutoff(cutoff, sample_rate)
+
+    def set_cutoff(self, cutoff: float, sample_rate: float = 44100.0):
+        if cutoff <= 0.0:
+            raise ValueError("Cutoff frequency must be positive")
+        rc_cutoff = cutoff / sample_rate
+        self.k = rc_cutoff / (rc_cutoff + 1.0 / (2.0 * math.pi))  # RC filter formula
+        pole = 1.0 - self.k
+        self._state_scale = pole / self.k
+        self.block = max(1, int(math.log(MAX_POLE_SCALE) / -math.log(pole)))
+        n = np.arange(self.block, dtype=np.float64)
+        # Output n is pole^(n+1)*previous output + k*pole^n * sum(pole^-m*input m, m <= n)
+        self._gains = (self.k * pole ** n)[:, None]
+        self._inverse_powers = (pole ** -n)[:, None]
+
+    def process(self, samples: np.ndarray, scratch: Optional[np.ndarray] = None):
+        if scratch is None:
+            scratch = np.empty((min(len(samples), self.block), samples.shape[1]))
+        state = self.state
+        for start in range(0, len(samples), self.block):
+            x = samples[start:start + self.block]
+            n = len(x)
+            y = scratch[:n]
+            np.multiply(x, self._inverse_powers[:n], out=y)
+            y[0] += self._state_scale * state  # pole^(n+1)*previous output, inside the sums
+            np.cumsum(y, axis=0, out=y)
+            y *= self._gains[:n]
+            x[...] = y
+            state = y[-1].copy()
+        self.state = state
+
+
+class Delay(Effect):
+    """Feedback delay: output = dry*input + wet*delayed output, the delay being seconds long."""
+
+    def __init__(self, seconds: float = 1.0, sample_rate: float = 48000.0, channels: int = 2,
+                 dry: float = 0.5, wet: float = 0.5):
+        self.dry = dry
+        self.wet = wet
+        length = max(2, int(seconds * sample_rate))
+        self.buffer = np.zeros((length, channels), np.float32)  # Ring buffer of outputs
+        self.write_index = 0
+        # Outputs are read one frame after the write position: written length - 1 frames before
+        self.delay = length - 1
+
+    def process(self, samples: np.ndarray, scratch: Optional[np.ndarray] = None):
+        if scratch is None:
+            scratch = np.empty(samples.shape)
+        length = len(self.buffer)
+        start = 0
+        while start < len(samples):
+            # Outputs read by a block are written before the block, if it isn't longer than the delay,
+            # and the block must not be split by the end of the ring buffer when written
+            n = min(len(samples) - start, self.delay, length - self.write_index)
+            x = samples[start:start + n]
+            delayed = scratch[:n]
+            read_index = (self.write_index + 1) % length
+            first = min(n, length - read_index)  # Read wraps around after first frames
+            delayed[:first] = self.buffer[read_index:read_index + first]
+            delayed[first:] = self.buffer[:n - first]
+            delayed *= self.wet
+            x *= self.dry
+            x += delayed
+            self.buffer[self.write_index:self.write_index + n] = x
+            self.write_index = (self.write_index + n) % length
+            start += n
+
+
+class Gain(Effect):
+    """Multiplies the samples by gain."""
+
+    def __init__(self, gain: float = 1.0):
+        self.gain = gain
+
+    def process(self, samples: np.ndarray, scratch: Optional[np.ndarray] = None):
+        samples *= self.gain
+
+
+class Shaper(Effect):
+    """Raises the sample magnitudes to exponent, keeping their sign: a distortion above 1.0."""
+
+    def __init__(self, exponent: float = 1.0):
+        self.exponent = exponent
+
+    def process(self, samples: np.ndarray, scratch: Optional[np.ndarray] = None):
+        if scratch is None:
+            scratch = np.empty(samples.shape)
+        magnitudes = scratch[:len(samples)]
+        np.abs(samples, out=magnitudes)
+        np.power(magnitudes, self.exponent, out=magnitudes)
+        np.copysign(magnitudes, samples, out=samples, casting="same_kind")
+
+
+class EffectChain:
+    """Effects run in order by a single audio processor, see the module docstring."""
+
+    def __init__(self, channels: int = 2, max_frames: int = DEFAULT_MAX_FRAMES):
+        self.channels = channels
+        self.nodes: List[Effect] = []
+        self._scratch = np.empty((max_frames, channels))
+        # Processor to attach, a reference is kept here as long as the chain exists
+        self.callback = stream_processor(self.process, channels)
+
+    def add(self, node: Effect, bypass: bool = False) -> Effect:
+        """Appends node to the chain, and returns it."""
+        node.bypass = bypass
+        self.nodes.append(node)
+        return node
+
+    def process(self, samples: np.ndarray):
+        """Runs the nodes not bypassed over (frames, channels) samples, in place."""
+        if len(samples) > len(self._scratch):
+            self._scratch = np.empty((len(samples), self.channels))
+        scratch = self._scratch[:len(samples)]
+        for node in self.nodes:
+            if not node.bypass:
+                node.process(samples, scratch)
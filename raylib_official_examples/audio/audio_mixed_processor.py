@@ -8,38 +8,38 @@ Copyright (c) 2023-2025 hkc (@hatkidchan)
 
 This source has been converted from C raylib examples to Python.
 """
+import sys
 from pathlib import Path
 
 import pyray as rl
-import math
+
+try:
+    import numpy as np
+    from audio_effects import Effect, EffectChain, Shaper
+    from ring_buffer import RingBuffer
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
 
 THIS_DIR = Path(__file__).resolve().parent
 
 exponent = 1.0  # Audio exponentiation value
-average_volume = [0.0] * 400  # Average volume history
-
-# Audio processing function
-def process_audio(buffer, frames):
-    samples = rl.ffi.cast("float *", buffer)  # Samples internally stored as <float>s
-    average = 0.0  # Temporary average volume
-
-    for frame in range(frames):
-        left = samples[frame * 2 + 0]
-        right = samples[frame * 2 + 1]
+average_volume = np.zeros(400, np.float32)  # Average volume history, copied from volume_history to be drawn
 
-        samples[frame * 2 + 0] = math.pow(math.fabs(left), exponent) * (-1.0 if left < 0.0 else 1.0)
-        samples[frame * 2 + 1] = math.pow(math.fabs(right), exponent) * (-1.0 if right < 0.0 else 1.0)
+# NOTE: The audio thread pushes the averages into a ring buffer in O(1), and the main loop copies
+# the latest ones without lock, instead of shifting a shared history list at each buffer
+volume_history = RingBuffer(512)
 
-        average += math.fabs(left) / frames  # accumulating average volume
-        average += math.fabs(right) / frames
+# Audio processing node, recording the average volume of the buffers
+class VolumeHistory(Effect):
+    def process(self, samples, scratch=None):
+        average = float(np.abs(samples).sum()) / len(samples)  # Left and right volumes summed
 
-    # Moving history to the left
-    for i in range(399):
-        average_volume[i] = average_volume[i + 1]
-
-    average_volume[399] = average  # Adding last average value
+        volume_history.push(average)  # Adding last average value
 
 def main():
+    global exponent # Declare exponent as global to modify it
+
     # Initialization
     screen_width = 800
     screen_height = 450
@@ -48,9 +48,12 @@ def main():
 
     rl.init_audio_device()  # Initialize audio device
 
-    # rl.ffi.callback() creates a trampoline to convert the C function call done by raylib to a python function call.
-    c_process_audio = rl.ffi.callback("void(void*, unsigned int)")(process_audio)
-    rl.attach_audio_mixed_processor(c_process_audio)
+    # The chain callback is a trampoline converting the C function call done by raylib to a python
+    # function call, which runs the nodes over a NumPy view of the samples (see audio_effects.py)
+    processor = EffectChain()
+    processor.add(VolumeHistory())  # Volume before the distortion
+    shaper = processor.add(Shaper(exponent))
+    rl.attach_audio_mixed_processor(processor.callback)
 
     music = rl.load_music_stream(str( THIS_DIR / "resources/country.mp3" ))
     sound = rl.load_sound(str( THIS_DIR / "resources/coin.wav" ))
@@ -59,8 +62,6 @@ def main():
 
     rl.set_target_fps(60)  # Set our game to run at 60 frames-per-second
 
-    global exponent # Declare exponent as global to modify it
-
     # Main game loop
     while not rl.window_should_close():  # Detect window close button or ESC key
         # Update
@@ -77,9 +78,13 @@ def main():
         if exponent >= 3.0:
             exponent = 3.0
 
+        shaper.exponent = exponent
+
         if rl.is_key_pressed(rl.KEY_SPACE):
             rl.play_sound(sound)
 
+        volume_history.snapshot(average_volume)  # Latest 400 averages, oldest first
+
         # Draw
         rl.begin_drawing()
 
@@ -102,7 +107,7 @@ def main():
     # De-Initialization
     rl.unload_music_stream(music)  # Unload music stream buffers from RAM
 
-    rl.detach_audio_mixed_processor(c_process_audio)  # Disconnect audio processor
+    rl.detach_audio_mixed_processor(processor.callback)  # Disconnect audio processor
 
     rl.close_audio_device()  # Close audio device (music streaming is automatically stopped)
 
@@ -9,10 +9,16 @@ Copyright (c) 2015-2025 Ramon Santamaria (@raysan5) and James Hofmann (@triplefo
 This source has been converted from C raylib examples to Python.
 """
 
+import sys
 import pyray as rl
-import math
 from pathlib import Path
-import ctypes
+
+try:
+    import numpy as np
+    from wavetable import SAW, SINE, WavetableSynth
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
 
 THIS_DIR = Path(__file__).resolve().parent
 
@@ -20,33 +26,19 @@ THIS_DIR = Path(__file__).resolve().parent
 MAX_SAMPLES = 512
 MAX_SAMPLES_PER_UPDATE = 4096
 
+# With --chorus, 32 detuned sawtooth voices are played instead of one sine voice
+CHORUS_VOICES = 32 if "--chorus" in sys.argv[1:] else 0
+
 # Cycles per second (hz)
 frequency = 440.0
 
-# Audio frequency, for smoothing
-audio_frequency = 440.0
-
-# Previous value, used to test if sine needs to be rewritten, and to smoothly modulate frequency
+# Previous value, used to test if sine needs to be rewritten
 old_frequency = 1.0
 
-# Index for audio rendering
-sine_idx = 0.0
-
-# Audio input processing callback
-def audio_input_callback(buffer, frames):
-    global audio_frequency, frequency, sine_idx
-    
-    audio_frequency = frequency + (audio_frequency - frequency) * 0.95
-    
-    incr = audio_frequency / 44100.0
-    
-    d = rl.ffi.cast("short *", buffer)
-    
-    for i in range(frames):
-        d[i] = int(32000.0 * math.sin(2 * math.pi * sine_idx))
-        sine_idx += incr
-        if sine_idx > 1.0:
-            sine_idx -= 1.0
+# NOTE: The synthesizer renders whole blocks with NumPy (see wavetable.py), computing
+# math.sin() per sample in the audio callback is too slow for more than a voice or two.
+# Frequency and pan changes are smoothed per block by the synthesizer
+synth = WavetableSynth(44100, channels=2)
 
 # Main function
 def main():
@@ -62,19 +54,22 @@ def main():
     
     rl.set_audio_stream_buffer_size_default(MAX_SAMPLES_PER_UPDATE)
     
-    # Init raw audio stream (sample rate: 44100, sample size: 16bit-short, channels: 1-mono)
-    stream = rl.load_audio_stream(44100, 16, 1)
+    # Init raw audio stream (sample rate: 44100, sample size: 16bit-short, channels: 2-stereo, panned by the synthesizer)
+    stream = rl.load_audio_stream(44100, 16, 2)
     
-    # Set the callback using the correct function from PyRay
-    # rl.ffi.callback() creates a trampoline to convert the C function call done by raylib to a python function call.
-    c_audio_input_callback = rl.ffi.callback("void(void*, unsigned int)")(audio_input_callback)
-    rl.set_audio_stream_callback(stream, c_audio_input_callback)
+    # The synthesizer callback is a trampoline converting the C function call done by raylib to a python function call
+    rl.set_audio_stream_callback(stream, synth.callback)
     
-    # Buffer for the single cycle waveform we are synthesizing
-    data = (ctypes.c_short * MAX_SAMPLES)()
+    if CHORUS_VOICES:
+        detunes = np.linspace(-0.02, 0.02, CHORUS_VOICES)  # Frequency ratios around the frequency
+        voices = [synth.note_on(frequency * (1.0 + detune), amplitude=1.0 / CHORUS_VOICES, pan=0.5, shape=SAW)
+                  for detune in detunes]
+    else:
+        detunes = np.zeros(1)
+        voices = [synth.note_on(frequency, amplitude=32000.0 / 32767.0, shape=SINE)]
     
-    # Frame buffer, describing the waveform when repeated over the course of a frame
-    write_buf = (ctypes.c_short * MAX_SAMPLES_PER_UPDATE)()
+    # Buffer for the single cycle waveform we are synthesizing (drawn)
+    data = np.zeros(MAX_SAMPLES, np.int16)
     
     rl.play_audio_stream(stream)  # Start processing stream buffer (no data loaded currently)
     
@@ -98,7 +93,9 @@ def main():
             frequency = 40.0 + float(fp)
             
             pan = float(mouse_position.x) / float(screen_width)
-            rl.set_audio_stream_pan(stream, pan)
+            for voice, detune in zip(voices, detunes):
+                synth.set_frequency(voice, frequency * (1.0 + detune))
+                synth.set_pan(voice, pan)
         
         # Rewrite the sine wave
         # Compute two cycles to allow the buffer padding, simplifying any modulation, resampling, etc.
@@ -111,12 +108,10 @@ def main():
                 wave_length = 1
             
             # Write sine wave
-            for i in range(wave_length * 2):
-                data[i] = int(math.sin(((2 * math.pi * float(i) / wave_length))) * 32000)
+            data[:wave_length * 2] = np.sin(2 * np.pi * np.arange(wave_length * 2) / wave_length) * 32000
             
             # Make sure the rest of the line is flat
-            for j in range(wave_length * 2, MAX_SAMPLES):
-                data[j] = 0
+            data[wave_length * 2:] = 0
             
             old_frequency = frequency
         
@@ -126,6 +121,7 @@ def main():
         rl.clear_background(rl.RAYWHITE)
         
         rl.draw_text(f"sine frequency: {int(frequency)}", screen_width - 220, 10, 20, rl.RED)
+        rl.draw_text(f"voices: {synth.voice_count}", screen_width - 220, 35, 20, rl.RED)
         rl.draw_text("click mouse button to change frequency or pan", 10, 10, 20, rl.DARKGRAY)
         
         # Draw the current buffer state proportionate to the screen
@@ -138,7 +134,7 @@ def main():
         rl.end_drawing()
     
     # De-Initialization
-    rl.unload_audio_stream(stream)  # Close raw audio stream and delete buffers from RAM
+    rl.unload_audio_stream(stream)  # Close raw audio stream and delete buffers from RAM (stops the callback)
     rl.close_audio_device()         # Close audio device
     
     rl.close_window()               # Close window and OpenGL context
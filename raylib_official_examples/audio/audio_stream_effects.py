@@ -8,68 +8,25 @@ Copyright (c) 2022-2025 Ramon Santamaria (@raysan5)
 This source has been converted from C raylib examples to Python.
 """
 
+import sys
 import pyray as rl
-import ctypes
 from pathlib import Path
 
+try:
+    from audio_effects import Delay, EffectChain, LowPassFilter  # Requires NumPy
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
+
 # Get the directory where this script is located
 THIS_DIR = Path(__file__).resolve().parent
 
-# Required delay effect variables
-delay_buffer = None
-delay_buffer_size = 0
-delay_read_index = 2
-delay_write_index = 0
-
-low = [0.0, 0.0]
-
-# Audio effect: lowpass filter
-def audio_process_effect_lpf(buffer, frames):
-    global low
-
-    cutoff = 70.0 / 44100.0  # 70 Hz lowpass filter
-    k = cutoff / (cutoff + 0.1591549431)  # RC filter formula
-
-    # Converts the buffer data before using it
-    buffer_data = rl.ffi.cast("float *", buffer)
-    
-    for i in range(0, frames * 2, 2):
-        l = buffer_data[i]
-        r = buffer_data[i + 1]
-
-        low[0] += k * (l - low[0])
-        low[1] += k * (r - low[1])
-        
-        buffer_data[i] = low[0]
-        buffer_data[i + 1] = low[1]
-c_audio_process_effect_lpf = rl.ffi.callback("void(void*, unsigned int)")(audio_process_effect_lpf)
-
-# Audio effect: delay
-def audio_process_effect_delay(buffer, frames):
-    global delay_buffer, delay_buffer_size, delay_read_index, delay_write_index
-    
-    buffer_data = rl.ffi.cast("float *", buffer)
-
-    for i in range(0, frames * 2, 2):
-        left_delay = delay_buffer[delay_read_index]
-        delay_read_index += 1
-        right_delay = delay_buffer[delay_read_index]
-        delay_read_index += 1
-
-        if delay_read_index == delay_buffer_size:
-            delay_read_index = 0
-
-        buffer_data[i] = 0.5 * buffer_data[i] + 0.5 * left_delay
-        buffer_data[i + 1] = 0.5 * buffer_data[i + 1] + 0.5 * right_delay
-
-        delay_buffer[delay_write_index] = buffer_data[i]
-        delay_write_index += 1
-        delay_buffer[delay_write_index] = buffer_data[i + 1]
-        delay_write_index += 1
-        
-        if delay_write_index == delay_buffer_size:
-            delay_write_index = 0
-c_audio_process_effect_delay = rl.ffi.callback("void(void*, unsigned int)")(audio_process_effect_delay)
+# NOTE: The effects process the whole buffer with NumPy (see audio_effects.py), looping over
+# the samples in Python is too slow for the audio thread once both effects are attached.
+# They run in one processor, in order, and are toggled by bypassing them (their state is kept)
+effects = EffectChain()
+effect_lpf = effects.add(LowPassFilter(70.0, 44100.0), bypass=True)  # 70 Hz lowpass filter
+effect_delay = effects.add(Delay(1.0, 48000.0), bypass=True)  # 1 second delay (device sampleRate)
 
 # Initialization
 #--------------------------------------------------------------------------------------
@@ -82,9 +39,7 @@ rl.init_audio_device()              # Initialize audio device
 
 music = rl.load_music_stream(str(THIS_DIR/"resources/country.mp3"))
 
-# Allocate buffer for the delay effect
-delay_buffer_size = 48000 * 2      # 1 second delay (device sampleRate*channels)
-delay_buffer = (ctypes.c_float * delay_buffer_size)()  # Create ctypes array of floats
+rl.attach_audio_stream_processor(music.stream, effects.callback)  # Runs the effects not bypassed
 
 rl.play_music_stream(music)
 
@@ -120,18 +75,12 @@ while not rl.window_should_close():    # Detect window close button or ESC key
     # Add/Remove effect: lowpass filter
     if rl.is_key_pressed(rl.KEY_F):
         enable_effect_lpf = not enable_effect_lpf
-        if enable_effect_lpf:
-            rl.attach_audio_stream_processor(music.stream, c_audio_process_effect_lpf)
-        else:
-            rl.detach_audio_stream_processor(music.stream, c_audio_process_effect_lpf)
+        effect_lpf.bypass = not enable_effect_lpf
 
     # Add/Remove effect: delay
     if rl.is_key_pressed(rl.KEY_D):
         enable_effect_delay = not enable_effect_delay
-        if enable_effect_delay:
-            rl.attach_audio_stream_processor(music.stream, c_audio_process_effect_delay)
-        else:
-            rl.detach_audio_stream_processor(music.stream, c_audio_process_effect_delay)
+        effect_delay.bypass = not enable_effect_delay
     
     # Get normalized time played for current music stream
     time_played = rl.get_music_time_played(music) / rl.get_music_time_length(music)
@@ -163,11 +112,11 @@ while not rl.window_should_close():    # Detect window close button or ESC key
 
 # De-Initialization
 #--------------------------------------------------------------------------------------
+rl.detach_audio_stream_processor(music.stream, effects.callback)  # Disconnect audio processor
+
 rl.unload_music_stream(music)   # Unload music stream buffers from RAM
 
 rl.close_audio_device()         # Close audio device (music streaming is automatically stopped)
 
-# No need to free delay_buffer in Python as garbage collection will handle it
-
 rl.close_window()               # Close window and OpenGL context
 #--------------------------------------------------------------------------------------
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+Single producer, single consumer ring buffer, passing values from audio callbacks to the render thread.
+
+Audio callbacks run on the audio thread, at the same time as the main loop, so the values they
+compute for display (volume meters, waveform snapshots, spectra...) must be handed over without
+blocking the audio thread, and without the render thread seeing half updated data. Shifting a
+history list in the callback costs O(history) per buffer, and the main thread may read it while
+it is shifted. RingBuffer stores the entries in a preallocated NumPy array instead:
+- the producer (audio callback) writes an entry into the next slot in O(1), then publishes it
+  by incrementing write_count, the oldest entries being overwritten once the buffer is full,
+- the consumer (render thread) copies the latest entries with snapshot(), without lock: it
+  checks after the copy that the producer didn't start overwriting the copied slots meanwhile,
+  and copies them again if it did, so snapshots never mix old and new entries.
+
+Entries are scalars, or arrays of a fixed shape (e.g. waveform blocks or spectra):
+
+    volumes = RingBuffer(512)  # Scalar float32 entries
+    waveforms = RingBuffer(4, (512,))  # Entries of 512 samples
+    # Audio callback
+    volumes.push(average)
+    waveforms.push(samples[:512, 0])
+    # Render thread
+    history = volumes.snapshot(np.zeros(400, np.float32))  # Latest 400 entries, oldest first
+    waveform = waveforms.latest()
+
+NOTE: Only one thread may push, and only one thread may read. The capacity should be larger than
+the snapshots, so the producer doesn't overwrite the slots being copied at each frame. Publishing
+relies on Python attribute stores being seen in order by the other thread (true with the GIL).
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class RingBuffer:
+    """Preallocated ring of entries, pushed by one thread and read by another, see the module docstring."""
+
+    def __init__(self, capacity: int, shape: Tuple[int, ...] = (), dtype=np.float32):
+        self.capacity = capacity
+        self.entries = np.zeros((capacity,) + tuple(shape), dtype)
+        self.write_count = 0  # Entries pushed (published) since the creation
+        self._writing_count = 0  # write_count once the entries being written are published
+
+    def push(self, value):
+        """Appends an entry (a scalar, or an array of the entry shape), overwriting the oldest if full."""
+        count = self.write_count
+        self._writing_count = count + 1  # Before writing: readers discard the slot from now on
+        self.entries[count % self.capacity] = value
+        self.write_count = count + 1
+
+    def extend(self, values):
+        """Appends entries (an array of entries, at most capacity), overwriting the oldest if full."""
+        values = np.asarray(values)
+        count = self.write_count
+        n = len(values)
+        self._writing_count = count + n
+        first = count % self.capacity
+        split = min(n, self.capacity - first)  # Entries written before wrapping around
+        self.entries[first:first + split] = values[:split]
+        self.entries[:n - split] = values[split:]
+        self.write_count = count + n
+
+    def _copy(self, start: int, end: int, out: np.ndarray):
+        first = start % self.capacity
+        split = min(end - start, self.capacity - first)
+        out[:split] = self.entries[first:first + split]
+        out[split:] = self.entries[:end - start - split]
+
+    def snapshot(self, out: np.ndarray, fill=0) -> np.ndarray:
+        """Copies the latest len(out) entries into out, oldest first, and returns it. Entries not pushed
+        yet (at the beginning of out) are set to fill."""
+        count = min(len(out), self.capacity)
+        while True:
+            end = self.write_count
+            available = min(count, end)
+            start = end - available
+            self._copy(start, end, out[len(out) - available:])
+            # Slots overwritten (or being overwritten) meanwhile hold entries below _writing_count - capacity
+            if self._writing_count - self.capacity <= start:
+                break
+        out[:len(out) - available] = fill
+        return out
+
+    def latest(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """Returns a copy of the latest entry (into out if given), None if nothing was pushed."""
+        if self.write_count == 0:
+            return None
+        if out is None:
+            out = np.empty((1,) + self.entries.shape[1:], self.entries.dtype)
+        else:
+            out = out.reshape((1,) + self.entries.shape[1:])
+        return self.snapshot(out)[0]
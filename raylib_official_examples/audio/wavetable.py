@@ -0,0 +1,200 @@
+"""
+Wavetable synthesizer: band-limited tables and voices rendered by blocks with NumPy.
+
+An audio stream callback computing math.sin() for each sample, in Python, can't produce more
+than a voice or two before the audio thread misses its deadline. WavetableSynth renders many
+voices by whole blocks instead:
+- each waveform is precomputed as band-limited tables of TABLE_SIZE samples, one per octave of
+  fundamental frequency, holding only the harmonics below the Nyquist frequency (so high notes
+  don't alias), the voices read the table of their octave with linear interpolation,
+- the phases of all the voices over a block are computed at once, as a (voices, frames) array,
+  from the phase increments of the voices (vectorized phase accumulator),
+- frequency changes are smoothed once per block (glide), amplitude and pan changes are ramped
+  linearly over the block, so parameters set from the main thread don't click,
+- the mixed block is converted to 16 bit samples and written into the stream buffer with one
+  slice assignment.
+
+    synth = WavetableSynth(44100, channels=2)
+    stream = rl.load_audio_stream(44100, 16, 2)
+    rl.set_audio_stream_callback(stream, synth.callback)  # Keep the synth alive while the stream plays
+    voice = synth.note_on(440.0, amplitude=0.5, pan=0.5, shape=SAW)
+    ...
+    synth.set_frequency(voice, 220.0)  # From the main thread, applied by the next block
+    synth.note_off(voice)  # Fades out over one block, then frees the voice
+"""
+import math
+
+import numpy as np
+
+import pyray as rl
+
+TABLE_SIZE = 2048  # Samples per table (one waveform cycle)
+BASE_FREQUENCY = 20.0  # Fundamental of the lowest octave table
+DEFAULT_MAX_VOICES = 64
+DEFAULT_GLIDE = 0.95  # Part of the frequency change not applied yet after each block
+
+# Waveform shapes
+SINE = 0
+SAW = 1
+SQUARE = 2
+TRIANGLE = 3
+SHAPES = (SINE, SAW, SQUARE, TRIANGLE)
+
+
+def harmonic_amplitudes(shape: int, harmonics: int) -> np.ndarray:
+    """Returns the sine amplitudes of harmonics 1..harmonics of a waveform shape (Fourier series)."""
+    n = np.arange(1, harmonics + 1, dtype=np.float64)
+    if shape == SINE:
+        return (n == 1).astype(np.float64)
+    if shape == SAW:
+        return 1.0 / n
+    odd = (n % 2) == 1
+    if shape == SQUARE:
+        return np.where(odd, 1.0 / n, 0.0)
+    if shape == TRIANGLE:
+        return np.where(odd, (-1.0) ** ((n - 1) // 2) / (n * n), 0.0)
+    raise ValueError(f"Unknown waveform shape: {shape}")
+
+
+def octave_count(sample_rate: float) -> int:
+    """Number of octave tables from BASE_FREQUENCY up to the Nyquist frequency."""
+    return max(1, math.ceil(math.log2(sample_rate / 2.0 / BASE_FREQUENCY)))
+
+
+def band_limited_tables(shape: int, sample_rate: float) -> np.ndarray:
+    """Returns the (octaves, TABLE_SIZE + 1) float32 tables of a shape, scaled to a peak of 1.0.
+    Table i is played for fundamentals up to BASE_FREQUENCY*2^(i+1), its harmonics stay below
+    the Nyquist frequency. The last sample repeats the first one, for interpolation."""
+    octaves = octave_count(sample_rate)
+    tables = np.empty((octaves, TABLE_SIZE + 1), np.float32)
+    for octave in range(octaves):
+        highest_fundamental = BASE_FREQUENCY * 2.0 ** (octave + 1)
+        harmonics = max(1, min(int(sample_rate / 2.0 / highest_fundamental), TABLE_SIZE // 2 - 1))
+        spectrum = np.zeros(TABLE_SIZE // 2 + 1, np.complex128)
+        # sin(2*pi*n*t) is the imaginary part -1/2 of the bins n and -n
+        spectrum[1:harmonics + 1] = -0.5j * TABLE_SIZE * harmonic_amplitudes(shape, harmonics)
+        table = np.fft.irfft(spectrum, TABLE_SIZE)
+        tables[octave, :TABLE_SIZE] = table / np.abs(table).max()
+        tables[octave, TABLE_SIZE] = tables[octave, 0]
+    return tables
+
+
+class WavetableSynth:
+    """Voices rendered by blocks into an audio stream callback, see the module docstring."""
+
+    def __init__(self, sample_rate: float = 44100.0, channels: int = 1, max_voices: int = DEFAULT_MAX_VOICES,
+                 glide: float = DEFAULT_GLIDE):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.glide = glide
+        self.octaves = octave_count(sample_rate)
+        # All the tables in one flat array, gathered with np.take(): (shape, octave, sample)
+        self.tables = np.stack([band_limited_tables(shape, sample_rate) for shape in SHAPES])
+        self._flat_tables = self.tables.reshape(-1)
+        # Voices, as arrays, targets being set by the main thread and reached by the next block
+        self.active = np.zeros(max_voices, bool)
+        self.shapes = np.zeros(max_voices, np.intp)
+        self.phases = np.zeros(max_voices)  # Cycles [0.0..1.0)
+        self.frequencies = np.zeros(max_voices)
+        self.target_frequencies = np.zeros(max_voices)
+        self.gains = np.zeros((max_voices, channels))  # Amplitude and pan of each channel
+        self.amplitudes = np.zeros(max_voices)  # Targets
+        self.pans = np.full(max_voices, 0.5)  # Targets, 0.0 is left, 1.0 right
+        self._steps = np.zeros(0)
+        self._ramp = np.zeros(0)
+        # Callback to pass to rl.set_audio_stream_callback(), a reference is kept here
+        self.callback = rl.ffi.callback("void(void*, unsigned int)")(self._write)
+
+    @property
+    def voice_count(self) -> int:
+        return int(np.count_nonzero(self.active))
+
+    def note_on(self, frequency: float, amplitude: float = 1.0, pan: float = 0.5, shape: int = SINE) -> int:
+        """Starts a voice, faded in over one block. Returns its index, or -1 if all the voices are playing."""
+        free = np.flatnonzero(~self.active)
+        if len(free) == 0:
+            return -1
+        voice = int(free[0])
+        self.shapes[voice] = shape
+        self.phases[voice] = 0.0
+        self.frequencies[voice] = self.target_frequencies[voice] = frequency
+        self.gains[voice] = 0.0
+        self.amplitudes[voice] = amplitude
+        self.pans[voice] = pan
+        self.active[voice] = True  # Last, the audio thread may render the voice from now on
+        return voice
+
+    def note_off(self, voice: int):
+        """Fades the voice out over one block, then frees it."""
+        self.amplitudes[voice] = 0.0
+
+    def set_frequency(self, voice: int, frequency: float):
+        self.target_frequencies[voice] = frequency
+
+    def set_amplitude(self, voice: int, amplitude: float):
+        self.amplitudes[voice] = amplitude
+
+    def set_pan(self, voice: int, pan: float):
+        self.pans[voice] = pan
+
+    def _target_gains(self, voices: np.ndarray) -> np.ndarray:
+        amplitudes = self.amplitudes[voices]
+        if self.channels == 1:
+            return amplitudes[:, None]
+        angles = np.clip(self.pans[voices], 0.0, 1.0) * (math.pi / 2.0)  # Constant power panning
+        gains = np.zeros((len(voices), self.channels))
+        gains[:, 0] = amplitudes * np.cos(angles)
+        gains[:, 1] = amplitudes * np.sin(angles)
+        return gains
+
+    def render(self, frames: int) -> np.ndarray:
+        """Returns the next (frames, channels) float64 block, the voices mixed, and advances the voices."""
+        mix = np.zeros((frames, self.channels))
+        voices = np.flatnonzero(self.active)
+        if len(voices) == 0:
+            return mix
+        if len(self._steps) < frames:
+            self._steps = np.arange(frames, dtype=np.float64)
+        steps = self._steps[:frames]
+        ramp = steps / frames  # Parameter changes are interpolated linearly over the block
+
+        # Frequency glide, once per block
+        frequencies = self.target_frequencies[voices] + (self.frequencies[voices] - self.target_frequencies[voices]) * self.glide
+        self.frequencies[voices] = frequencies
+        increments = frequencies / self.sample_rate
+
+        # Phases of all the voices over the block, and table positions
+        phases = self.phases[voices]
+        positions = increments[:, None] * steps
+        positions += phases[:, None]
+        np.remainder(positions, 1.0, out=positions)
+        positions *= TABLE_SIZE
+        self.phases[voices] = (phases + increments * frames) % 1.0
+        indices = positions.astype(np.intp)
+        fractions = positions
+        fractions -= indices
+
+        # Octave tables, limiting the harmonics of each voice below the Nyquist frequency
+        octaves = np.clip(np.floor(np.log2(np.maximum(frequencies, 1e-6) / BASE_FREQUENCY)), 0, self.octaves - 1)
+        tables = (self.shapes[voices] * self.octaves + octaves.astype(np.intp)) * (TABLE_SIZE + 1)
+        indices += tables[:, None]
+        samples = np.take(self._flat_tables, indices)
+        samples += (np.take(self._flat_tables, indices + 1) - samples) * fractions
+
+        # Mix, channel gains going linearly from their previous values to their targets:
+        # sum(samples*(gains + (targets - gains)*ramp)) over the voices
+        gains = self.gains[voices]
+        targets = self._target_gains(voices)
+        mix += (gains.T @ samples).T
+        mix += ((targets - gains).T @ samples).T * ramp[:, None]
+        self.gains[voices] = targets
+        released = voices[self.amplitudes[voices] == 0.0]
+        self.active[released] = False
+        return mix
+
+    def _write(self, buffer, frames):
+        samples = np.frombuffer(rl.ffi.buffer(rl.ffi.cast("short *", buffer), frames * self.channels * 2), np.int16)
+        mix = self.render(frames)
+        mix *= 32767.0
+        np.clip(mix, -32767.0, 32767.0, out=mix)
+        samples[:] = mix.reshape(-1)
@@ -0,0 +1,220 @@
+"""
+Audio callback timing monitor: execution time of the Python audio callbacks against their deadline.
+
+Audio callbacks (rl.set_audio_stream_callback(), rl.attach_audio_stream_processor(),
+rl.attach_audio_mixed_processor()) run on the audio thread, and must return before the audio
+device needs the buffer they fill: a buffer of N frames at R Hz lasts N / R seconds, its
+real-time budget. A Python callback taking longer than that (or close to it, the GIL being
+shared with the main thread) makes the device run out of samples, an underrun heard as crackles.
+
+AudioCallbackMonitor times every invocation of the callbacks it wraps, with
+time.perf_counter_ns(). For each callback, it keeps:
+- the last HISTORY_SIZE durations and budgets in preallocated ring buffers, for the mean,
+  percentiles, and the load graph (duration / budget),
+- the number of calls, the worst duration, the invocations above warning_load of their budget
+  (warnings) and above their whole budget (likely underruns).
+
+Usage, wrapping the Python function before rl.ffi.callback():
+
+    monitor = AudioCallbackMonitor()
+    c_callback = rl.ffi.callback("void(void*, unsigned int)")(monitor.wrap("synth", callback, 44100))
+    ...
+    monitor.draw(10, 10)  # Load graphs and statistics, while drawing
+    monitor.write_json(Path("audio_callbacks.json"))
+
+Or, without modifying the example, monitor.install() patches pyray so that the callbacks given to
+the functions above are wrapped automatically, and drawn before rl.end_drawing() (this is what
+example_harness.py --audio-monitor does).
+
+NOTE: Stream processors and mixed processors get buffers at the device sample rate, which raylib
+doesn't expose: device_sample_rate is assumed (48000 Hz by default, the usual device rate).
+Statistics are read by the main thread while the audio thread writes them, they may lag by one call.
+"""
+import array
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pyray as rl
+
+HISTORY_SIZE = 512  # Invocations kept per callback
+DEFAULT_DEVICE_SAMPLE_RATE = 48000
+DEFAULT_WARNING_LOAD = 0.5  # Part of the budget above which an invocation is a warning
+
+GRAPH_WIDTH = 256  # Latest invocations drawn, one pixel each
+GRAPH_HEIGHT = 40
+GRAPH_MAX_LOAD = 1.25  # Load at the top of the graph, 1.0 (the budget) being drawn as a red line
+
+
+class CallbackStats:
+    """Timings of one audio callback: ring buffers of the latest invocations, and lifetime counters."""
+
+    def __init__(self, name: str, sample_rate: float, warning_load: float):
+        self.name = name
+        self.sample_rate = sample_rate
+        self.warning_load = warning_load
+        self.durations_ns = array.array("q", [0]) * HISTORY_SIZE
+        self.budgets_ns = array.array("q", [0]) * HISTORY_SIZE
+        self.calls = 0
+        self.worst_ns = 0
+        self.worst_load = 0.0
+        self.warnings = 0
+        self.underruns = 0
+        self.last_underrun_call = -1
+
+    def push(self, duration_ns: int, frames: int):
+        budget_ns = int(frames * 1e9 / self.sample_rate)
+        index = self.calls % HISTORY_SIZE
+        self.durations_ns[index] = duration_ns
+        self.budgets_ns[index] = budget_ns
+        if duration_ns > self.worst_ns:
+            self.worst_ns = duration_ns
+        if budget_ns > 0:
+            load = duration_ns / budget_ns
+            if load > self.worst_load:
+                self.worst_load = load
+            if load > self.warning_load:
+                self.warnings += 1
+            if load > 1.0:
+                self.underruns += 1
+                self.last_underrun_call = self.calls
+        self.calls += 1
+
+    def history(self) -> List[tuple]:
+        """Returns the (duration_ns, budget_ns) of the latest invocations, oldest first."""
+        count = min(self.calls, HISTORY_SIZE)
+        first = self.calls - count
+        return [(self.durations_ns[i % HISTORY_SIZE], self.budgets_ns[i % HISTORY_SIZE])
+                for i in range(first, first + count)]
+
+    def summary(self) -> Dict[str, Any]:
+        history = self.history()
+        durations = sorted(duration for duration, _ in history)
+
+        def percentile_ms(fraction: float) -> float:
+            if not durations:
+                return 0.0
+            return durations[min(len(durations) - 1, int(fraction * len(durations)))] / 1e6
+
+        return {
+            "sample_rate": self.sample_rate,
+            "calls": self.calls,
+            "budget_ms": history[-1][1] / 1e6 if history else 0.0,
+            "mean_ms": sum(durations) / len(durations) / 1e6 if durations else 0.0,
+            "p50_ms": percentile_ms(0.50),
+            "p95_ms": percentile_ms(0.95),
+            "p99_ms": percentile_ms(0.99),
+            "worst_ms": self.worst_ns / 1e6,
+            "worst_load": self.worst_load,
+            "warnings": self.warnings,
+            "likely_underruns": self.underruns,
+        }
+
+
+class AudioCallbackMonitor:
+    """Times audio callbacks against their real-time budget, see the module docstring for usage."""
+
+    def __init__(self, device_sample_rate: float = DEFAULT_DEVICE_SAMPLE_RATE,
+                 warning_load: float = DEFAULT_WARNING_LOAD):
+        self.device_sample_rate = device_sample_rate
+        self.warning_load = warning_load
+        self.callbacks: List[CallbackStats] = []
+        self._wrapped: Dict[Any, Any] = {}  # Original C callback: wrapping C callback (kept alive)
+        self._originals: Dict[str, Callable[..., Any]] = {}
+
+    def wrap(self, name: str, callback: Callable[[Any, int], None], sample_rate: float) -> Callable[[Any, int], None]:
+        """Returns a function calling callback(buffer, frames) and timing it, to pass to rl.ffi.callback()."""
+        stats = CallbackStats(name, sample_rate, self.warning_load)
+        self.callbacks.append(stats)
+
+        def timed_callback(buffer, frames):
+            start_ns = time.perf_counter_ns()
+            try:
+                callback(buffer, frames)
+            finally:
+                stats.push(time.perf_counter_ns() - start_ns, frames)
+
+        return timed_callback
+
+    def wrap_callback(self, name: str, c_callback, sample_rate: float):
+        """Returns a C callback calling c_callback (an rl.ffi.callback()) and timing it."""
+        wrapper = self._wrapped.get(c_callback)
+        if wrapper is None:
+            wrapper = rl.ffi.callback("void(void*, unsigned int)")(self.wrap(name, c_callback, sample_rate))
+            self._wrapped[c_callback] = wrapper
+        return wrapper
+
+    def install(self, draw_x: Optional[int] = 10, draw_y: int = 10):
+        """Patches pyray to time the audio callbacks of an unmodified example, and draws the monitor at
+        (draw_x, draw_y) before rl.end_drawing() (not drawn if draw_x is None)."""
+        for name in ("set_audio_stream_callback", "attach_audio_stream_processor", "detach_audio_stream_processor",
+                     "attach_audio_mixed_processor", "detach_audio_mixed_processor", "end_drawing"):
+            self._originals[name] = getattr(rl, name)
+        originals = self._originals
+
+        def set_audio_stream_callback(stream, callback):
+            name = f"stream callback {len(self.callbacks)}"
+            originals["set_audio_stream_callback"](stream, self.wrap_callback(name, callback, stream.sampleRate))
+
+        def attach_audio_stream_processor(stream, processor):
+            name = f"stream processor {len(self.callbacks)}"
+            wrapper = self.wrap_callback(name, processor, self.device_sample_rate)
+            originals["attach_audio_stream_processor"](stream, wrapper)
+
+        def detach_audio_stream_processor(stream, processor):
+            originals["detach_audio_stream_processor"](stream, self._wrapped.get(processor, processor))
+
+        def attach_audio_mixed_processor(processor):
+            name = f"mixed processor {len(self.callbacks)}"
+            originals["attach_audio_mixed_processor"](self.wrap_callback(name, processor, self.device_sample_rate))
+
+        def detach_audio_mixed_processor(processor):
+            originals["detach_audio_mixed_processor"](self._wrapped.get(processor, processor))
+
+        def end_drawing():
+            if draw_x is not None:
+                self.draw(draw_x, draw_y)
+            originals["end_drawing"]()
+
+        rl.set_audio_stream_callback = set_audio_stream_callback
+        rl.attach_audio_stream_processor = attach_audio_stream_processor
+        rl.detach_audio_stream_processor = detach_audio_stream_processor
+        rl.attach_audio_mixed_processor = attach_audio_mixed_processor
+        rl.detach_audio_mixed_processor = detach_audio_mixed_processor
+        rl.end_drawing = end_drawing
+
+    def uninstall(self):
+        """Restores the functions patched by install(). Wrapped callbacks stay alive, they may still be attached."""
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the statistics of each callback, by name."""
+        return {stats.name: stats.summary() for stats in self.callbacks}
+
+    def write_json(self, path: Path):
+        path.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+
+    def draw(self, pos_x: int, pos_y: int):
+        """Draws the load graph (duration / budget of the latest invocations) and the statistics of each callback."""
+        for stats in self.callbacks:
+            rl.draw_rectangle(pos_x, pos_y, GRAPH_WIDTH, GRAPH_HEIGHT, rl.fade(rl.BLACK, 0.7))
+            bottom = pos_y + GRAPH_HEIGHT
+            history = stats.history()[-GRAPH_WIDTH:]
+            for x, (duration_ns, budget_ns) in enumerate(history):
+                load = duration_ns / budget_ns if budget_ns else 0.0
+                height = min(int(load / GRAPH_MAX_LOAD * GRAPH_HEIGHT), GRAPH_HEIGHT)
+                if height > 0:
+                    color = rl.RED if load > 1.0 else rl.ORANGE if load > stats.warning_load else rl.LIME
+                    rl.draw_line(pos_x + x, bottom, pos_x + x, bottom - height, color)
+            budget_y = bottom - int(GRAPH_HEIGHT / GRAPH_MAX_LOAD)
+            rl.draw_line(pos_x, budget_y, pos_x + GRAPH_WIDTH, budget_y, rl.RED)
+
+            summary = stats.summary()
+            underrun_recently = stats.last_underrun_call >= 0 and stats.calls - stats.last_underrun_call <= HISTORY_SIZE
+            rl.draw_text(f"{stats.name}: p99 {summary['p99_ms']:.2f} ms / {summary['budget_ms']:.1f} ms  "
+                         f"worst {summary['worst_ms']:.2f} ms  underruns {stats.underruns}",
+                         pos_x, bottom + 4, 10, rl.RED if underrun_recently else rl.LIME)
+            pos_y = bottom + 20
@@ -0,0 +1,127 @@
+"""
+Deterministic input replay (and recording) for unmodified examples, using raylib automation events.
+
+AutomationReplay plays a recorded automation event list (.rae text file, see core/core_automation_events.py,
+or .rael binary log, see core/automation_event_log.py) into any example main loop, by patching pyray:
+- rl.window_should_close(), called once at the start of each frame, plays the events of that frame
+  (after the input polling done by the previous rl.end_drawing(), so the whole frame sees them),
+- rl.get_frame_time() and rl.get_time() return a fixed time step, so the simulation does not
+  depend on the actual frame rate,
+- the Python and raylib random generators are seeded. NumPy generators are not: examples using
+  NumPy create them with np.random.default_rng(random.getrandbits(64)), so they follow the seed.
+
+This makes two runs of the same example with the same recording do exactly the same work, so frame
+times can be compared between builds. Combined with the frame budget patch of example_harness.py,
+the replay runs in fast-forward mode (no vsync, no sleep in rl.end_drawing()):
+
+    python raylib_official_examples/example_harness.py --frames 0 \
+        --replay raylib_official_examples/replays/textures_bunnymark.rae \
+        raylib_official_examples/textures/textures_bunnymark.py
+
+AutomationRecorder records the inputs of an interactive session of any example into a .rae file:
+
+    python raylib_official_examples/example_harness.py --frames 0 --realtime --record bunnymark.rae \
+        raylib_official_examples/textures/textures_bunnymark.py
+"""
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+import pyray as rl
+
+from core.automation_event_log import AutomationEventLog, load_event_log
+
+FIXED_FRAME_TIME = 1.0 / 60.0
+RANDOM_SEED = 12345
+
+
+class AutomationReplay:
+    """Plays the events of a .rae/.rael file into the example, one frame per rl.window_should_close() call."""
+
+    def __init__(self, path: Path, fixed_frame_time: float = FIXED_FRAME_TIME, seed: int = RANDOM_SEED):
+        self.path = path
+        self.fixed_frame_time = fixed_frame_time
+        self.seed = seed
+        self.event_log: AutomationEventLog = load_event_log(path)
+        self.event_count = len(self.event_log)
+        if self.event_count == 0:
+            raise ValueError(f"No automation events loaded from {path}")
+        self.frame = 0  # Index of the frame being played
+        self.event_index = 0  # Next event to play
+        self._originals: Dict[str, Callable[..., Any]] = {}
+
+    @property
+    def last_frame(self) -> int:
+        """Frame of the last recorded event (events are sorted by frame)."""
+        return self.event_log.last_frame
+
+    @property
+    def finished(self) -> bool:
+        return self.event_index >= self.event_count
+
+    def install(self):
+        """Patches pyray, see the module docstring."""
+        for name in ("window_should_close", "get_frame_time", "get_time"):
+            self._originals[name] = getattr(rl, name)
+        original_window_should_close = self._originals["window_should_close"]
+        event_log = self.event_log
+        count = self.event_count
+
+        def window_should_close():
+            # Multiple events could be on the same frame
+            while self.event_index < count and event_log.frame(self.event_index) <= self.frame:
+                event_log.play(self.event_index)
+                self.event_index += 1
+            self.frame += 1
+            return original_window_should_close()
+
+        rl.window_should_close = window_should_close
+        rl.get_frame_time = lambda: self.fixed_frame_time
+        rl.get_time = lambda: self.frame * self.fixed_frame_time
+        random.seed(self.seed)
+        rl.set_random_seed(self.seed)
+
+    def uninstall(self):
+        """Restores the functions patched by install() and closes the event log."""
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
+        self.event_log.close()
+
+
+class AutomationRecorder:
+    """Records the inputs of the example, from its first frame, and exports them on uninstall()."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.aelist = rl.load_automation_event_list("")
+        self.recording = False
+        self._originals: Dict[str, Callable[..., Any]] = {}
+
+    def install(self):
+        """Patches rl.window_should_close() to start recording at the first frame (window is opened)."""
+        self._originals["window_should_close"] = rl.window_should_close
+        original_window_should_close = self._originals["window_should_close"]
+
+        def window_should_close():
+            if not self.recording:
+                rl.set_automation_event_list(self.aelist)
+                rl.set_automation_event_base_frame(0)
+                rl.start_automation_event_recording()
+                self.recording = True
+            return original_window_should_close()
+
+        rl.window_should_close = window_should_close
+
+    def uninstall(self):
+        """Stops recording, exports the events, and restores rl.window_should_close()."""
+        if self.recording:
+            rl.stop_automation_event_recording()
+            self.recording = False
+            if self.aelist.count > 0:
+                rl.export_automation_event_list(self.aelist, str(self.path))
+                rl.trace_log(rl.LOG_WARNING, f"Recorded {self.aelist.count} events into {self.path}")
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
+        rl.unload_automation_event_list(self.aelist)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the working examples headlessly and writes one JSON report.
+
+Each example listed in 'examples_list_working.txt' is run for a fixed number of frames with
+the frame rate uncapped (see example_harness.py), in its own Python process: raylib keeps
+global window state, and a crashing example must not take the other runs down.
+Several examples are run in parallel (--jobs).
+
+By default, the examples are rendered on a virtual X display (Xvfb) with Mesa software
+rendering (llvmpipe), so the benchmark can run on a Linux box without GPU:
+
+    python raylib_official_examples/bench_examples.py --frames 300 --jobs 4 --output bench.json
+
+Use --no-xvfb to render on the current display/GPU instead, and --filter to select a subset
+of the examples (e.g. --filter textures_). With --profile, the report also contains the
+update/draw/end_drawing breakdown of each example (see frame_profiler.py), and with
+--track-allocs, the allocations per frame (see alloc_tracker.py). Use --gc-monitor for the
+garbage collector pauses (see gc_monitor.py), and --audio-monitor for the timings of the audio
+callbacks against their real-time budget (see audio_callback_monitor.py).
+
+Examples that have an input recording in the replays/ directory (same name as the example, with
+the .rael or .rae extension) are driven by it, for reproducible frame times (see automation_replay.py).
+"""
+import argparse
+import concurrent.futures
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from example_harness import DEFAULT_FRAMES, DEFAULT_WARMUP_FRAMES, clamp_warmup
+from list_working_examples import NON_EXAMPLE_MODULES
+
+THIS_DIR: Path = Path(__file__).resolve().parent
+
+EXAMPLES_LIST_FILENAME: str = "examples_list_working.txt"
+HARNESS_FILENAME: str = "example_harness.py"
+REPLAYS_DIR_NAME: str = "replays"
+DEFAULT_TIMEOUT_S: float = 120.0
+XVFB_SCREEN: str = "1920x1080x24"
+
+# Mesa environment forcing software rendering, without vsync
+SOFTWARE_GL_ENV: Dict[str, str] = {
+    "LIBGL_ALWAYS_SOFTWARE": "1",
+    "GALLIUM_DRIVER": "llvmpipe",
+    "vblank_mode": "0",
+}
+
+
+def read_examples_list(list_file: Path) -> List[str]:
+    """Reads the examples list, without the tools and helper modules (see NON_EXAMPLE_MODULES), which
+    older lists may contain."""
+    examples: List[str] = []
+    for line in list_file.read_text(encoding="utf-8").splitlines():
+        example: str = line.strip()
+        if example and example not in NON_EXAMPLE_MODULES:
+            examples.append(example)
+    return examples
+
+
+@contextmanager
+def virtual_display(enabled: bool) -> Iterator[Dict[str, str]]:
+    """Starts an Xvfb server for the duration of the context.
+
+    Yields the environment variables to pass to the example processes.
+    """
+    if not enabled:
+        yield {}
+        return
+    xvfb: Optional[str] = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("Xvfb not found. Install it (e.g. apt install xvfb) or use --no-xvfb.")
+
+    # Xvfb picks a free display number and writes it to the given file descriptor
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen([xvfb, "-displayfd", str(write_fd), "-screen", "0", XVFB_SCREEN,
+                                "-nolisten", "tcp"], pass_fds=(write_fd,), stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    try:
+        with os.fdopen(read_fd) as display_pipe:
+            display_number: str = display_pipe.readline().strip()
+        if not display_number:
+            raise RuntimeError("Xvfb failed to start.")
+        yield {"DISPLAY": f":{display_number}", **SOFTWARE_GL_ENV}
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def run_one(example: str, frames: int, warmup: int, timeout_s: float, env: Dict[str, str],
+            extra_args: List[str]) -> Dict[str, Any]:
+    """Runs one example in a child process through example_harness.py and returns its results."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file: Path = Path(temp_dir) / "result.json"
+        # Harness options before the example path: the arguments after it are passed to the example
+        command: List[str] = [sys.executable, str(THIS_DIR / HARNESS_FILENAME),
+                              "--frames", str(frames), "--warmup", str(warmup), "--output", str(output_file),
+                              *extra_args, example]
+        try:
+            completed = subprocess.run(command, cwd=THIS_DIR, env={**os.environ, **env},
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                       timeout=timeout_s, text=True, errors="replace")
+        except subprocess.TimeoutExpired:
+            return {"example": example, "status": "timeout"}
+
+        if output_file.is_file():
+            return json.loads(output_file.read_text(encoding="utf-8"))
+        # The process died without writing its results (e.g. segmentation fault in raylib)
+        return {"example": example, "status": "crashed", "returncode": completed.returncode,
+                "error": completed.stderr[-2000:]}
+
+
+def replay_args(example: str, replays_dir: Path) -> List[str]:
+    """Returns the harness arguments to replay the input recording of the example, if there is one."""
+    for extension in (".rael", ".rae"):
+        replay_file: Path = replays_dir / (Path(example).stem + extension)
+        if replay_file.is_file():
+            return ["--replay", str(replay_file.resolve())]
+    return []
+
+
+def main() -> None:
+    """
+    Main function: benchmarks the working examples and writes the JSON report.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks the working pyray examples headlessly.")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Number of frames per example")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP_FRAMES,
+                        help="Number of initial frames excluded from the statistics")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                        help="Number of examples run in parallel")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Timeout per example (s)")
+    parser.add_argument("--filter", default="", help="Only run examples whose path contains this string")
+    parser.add_argument("--no-xvfb", action="store_true", help="Use the current display instead of Xvfb")
+    parser.add_argument("--profile", action="store_true", help="Add the per-phase frame times to the report")
+    parser.add_argument("--track-allocs", action="store_true", help="Add the allocations per frame to the report")
+    parser.add_argument("--gc-monitor", action="store_true", help="Add the garbage collector pauses to the report")
+    parser.add_argument("--audio-monitor", action="store_true",
+                        help="Add the audio callback timings (load, likely underruns) to the report")
+    parser.add_argument("--replays", type=Path, default=THIS_DIR / REPLAYS_DIR_NAME,
+                        help="Directory of the .rae input recordings, named after the examples")
+    parser.add_argument("--output", type=Path, default=Path("bench_report.json"), help="JSON report file")
+    args = parser.parse_args()
+    args.warmup = clamp_warmup(args.frames, args.warmup)
+
+    examples: List[str] = [example for example in read_examples_list(THIS_DIR / EXAMPLES_LIST_FILENAME)
+                           if args.filter in example]
+    if not examples:
+        print("\nNo examples to benchmark.")
+        return
+
+    extra_args: List[str] = []
+    if args.profile:
+        extra_args.append("--profile")
+    if args.track_allocs:
+        extra_args.append("--track-allocs")
+    if args.gc_monitor:
+        extra_args.append("--gc-monitor")
+    if args.audio_monitor:
+        extra_args.append("--audio-monitor")
+    results: Dict[str, Dict[str, Any]] = {}
+    with virtual_display(not args.no_xvfb) as env:
+        # Threads are enough to drive the pool: each example runs in its own child process
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            futures = {executor.submit(run_one, example, args.frames, args.warmup, args.timeout, env,
+                                       extra_args + replay_args(example, args.replays)): example
+                       for example in examples}
+            for future in concurrent.futures.as_completed(futures):
+                result: Dict[str, Any] = future.result()
+                results[futures[future]] = result
+                print(f"{result['status']:>12} {result.get('p50_ms', 0.0):8.2f} ms p50  {futures[future]}")
+
+    report: Dict[str, Any] = {
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "software_rendering": not args.no_xvfb,
+        "frames": args.frames,
+        "warmup_frames": args.warmup,
+        "examples": {example: results[example] for example in sorted(results)},
+    }
+    args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    num_ok: int = sum(1 for result in results.values() if result["status"] == "ok")
+    print(f"\n{num_ok}/{len(results)} examples ran the full frame budget. Report written to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Compact binary format for automation event recordings, with a frame index for fast seeking.
+
+The text .rae export of raylib (rl.export_automation_event_list()) needs ~40 bytes per event,
+is limited to the capacity of one AutomationEventList (16384 events), and must be parsed and
+scanned from the first event to find the events of a given frame. The .rael format stores:
+
+    header:  magic "RAEL", version, record size, event count, index offset, index entry count
+    events:  fixed-size records (frame, type, params[4]), sorted by frame, written in chunks
+    index:   one entry (first frame, first event) per chunk, written when the log is closed
+
+AutomationEventLogWriter streams events to the file while recording: call drain() every frame to
+move the events recorded by raylib into the log. drain() empties the AutomationEventList, so the
+recording length is not limited by its capacity.
+
+AutomationEventLog memory-maps the file for playback. seek_frame() finds the first event of a
+frame in O(log n): binary search in the chunk index, then in the records of the chunk. If the log
+was not closed properly (e.g. a crash during a soak recording), the events written so far are
+still readable, and the binary search is done over all the records. Playing events only sets the
+input state, so replaying a log from its start needs release_keys() for the keys left down.
+
+Convert a .rae file, or print information about a log:
+
+    python raylib_official_examples/core/automation_event_log.py convert automation.rae automation.rael
+    python raylib_official_examples/core/automation_event_log.py info automation.rael
+"""
+import argparse
+import bisect
+import io
+import mmap
+import struct
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Tuple, Union
+
+import pyray as rl
+
+MAGIC: bytes = b"RAEL"
+VERSION: int = 1
+HEADER = struct.Struct("<4sHHQQQ")  # magic, version, record size, event count, index offset, index entries
+RECORD = struct.Struct("<IIiiii")  # frame, type, params[0..3]
+INDEX_ENTRY = struct.Struct("<IQ")  # first frame of the chunk, index of the first event of the chunk
+FRAME = struct.Struct("<I")
+DEFAULT_CHUNK_EVENTS: int = 4096
+INPUT_KEY_UP: int = 1  # AutomationEventType of raylib (not exposed by pyray), params[0] is the key
+
+Buffer = Union[bytes, bytearray, mmap.mmap]
+
+
+class AutomationEventLogWriter:
+    """Appends events to a .rael file, one chunk at a time."""
+
+    def __init__(self, file: Union[Path, str, BinaryIO], chunk_events: int = DEFAULT_CHUNK_EVENTS):
+        self._owns_file: bool = isinstance(file, (Path, str))
+        self._file: BinaryIO = open(file, "wb") if isinstance(file, (Path, str)) else file
+        self._chunk = bytearray(RECORD.size * chunk_events)
+        self._chunk_events: int = chunk_events
+        self._chunk_count: int = 0  # Events in the current chunk
+        self._index: List[Tuple[int, int]] = []
+        self.event_count: int = 0
+        self.last_frame: int = 0
+        # Header is rewritten on close(), with the event count and the index location
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, 0, 0))
+
+    def append(self, frame: int, event_type: int, param0: int = 0, param1: int = 0, param2: int = 0,
+               param3: int = 0) -> None:
+        """Appends one event. Events must be appended in frame order."""
+        if frame < self.last_frame:
+            raise ValueError(f"Events must be appended in frame order ({frame} < {self.last_frame})")
+        if self._chunk_count == 0:
+            self._index.append((frame, self.event_count))
+        RECORD.pack_into(self._chunk, self._chunk_count * RECORD.size, frame, event_type,
+                         param0, param1, param2, param3)
+        self._chunk_count += 1
+        self.event_count += 1
+        self.last_frame = frame
+        if self._chunk_count == self._chunk_events:
+            self.flush()
+
+    def drain(self, aelist) -> int:
+        """Appends the events recorded in aelist (an rl.AutomationEventList), then empties it.
+
+        raylib keeps recording into the list from index 0, so call this at least once per frame
+        during recording. Returns the number of events appended.
+        """
+        count: int = aelist.count
+        for i in range(count):
+            event = aelist.events[i]
+            params = event.params
+            self.append(event.frame, event.type, params[0], params[1], params[2], params[3])
+        aelist.count = 0
+        return count
+
+    def flush(self) -> None:
+        """Writes the events of the current chunk to the file."""
+        if self._chunk_count:
+            self._file.write(memoryview(self._chunk)[:self._chunk_count * RECORD.size])
+            self._chunk_count = 0
+            self._file.flush()
+
+    def close(self) -> None:
+        """Writes the remaining events, the chunk index, and the final header."""
+        self.flush()
+        index_offset: int = HEADER.size + self.event_count * RECORD.size
+        for first_frame, first_event in self._index:
+            self._file.write(INDEX_ENTRY.pack(first_frame, first_event))
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.event_count, index_offset,
+                                     len(self._index)))
+        self._file.seek(0, io.SEEK_END)
+        if self._owns_file:
+            self._file.close()
+
+
+class AutomationEventLog:
+    """Read-only view of a .rael log, memory-mapped by open()."""
+
+    def __init__(self, buffer: Buffer):
+        if len(buffer) < HEADER.size:
+            raise ValueError(f"Automation event log too short ({len(buffer)} bytes), empty or truncated file")
+        magic, version, record_size, event_count, index_offset, index_entries = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            raise ValueError("Not a supported automation event log")
+        if index_offset == 0:
+            # Log not closed: use the complete records written so far, without chunk index
+            event_count = (len(buffer) - HEADER.size) // RECORD.size
+        elif index_offset + index_entries * INDEX_ENTRY.size > len(buffer) \
+                or HEADER.size + event_count * RECORD.size > index_offset:
+            raise ValueError(f"Truncated automation event log ({event_count} events, {len(buffer)} bytes)")
+        self._buffer: Buffer = buffer
+        self._event_count: int = event_count
+        self._index_frames: List[int] = []
+        self._index_events: List[int] = []
+        for i in range(index_entries):
+            first_frame, first_event = INDEX_ENTRY.unpack_from(buffer, index_offset + i * INDEX_ENTRY.size)
+            self._index_frames.append(first_frame)
+            self._index_events.append(first_event)
+        self._index_events.append(event_count)  # End of the last chunk
+        # Reused for each played event, so playback doesn't allocate
+        self._event = rl.ffi.new("AutomationEvent *")
+
+    @classmethod
+    def open(cls, path: Union[Path, str]) -> "AutomationEventLog":
+        """Memory-maps a .rael file. Raises ValueError if it is empty, truncated or not a log."""
+        with open(path, "rb") as file:
+            if Path(path).stat().st_size < HEADER.size:  # mmap can't map an empty file
+                raise ValueError(f"{path} is too short to be an automation event log, empty or truncated file")
+            return cls(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def from_event_list(cls, aelist) -> "AutomationEventLog":
+        """Builds an in-memory log from an rl.AutomationEventList (e.g. loaded from a .rae file)."""
+        stream = io.BytesIO()
+        writer = AutomationEventLogWriter(stream)
+        for i in range(aelist.count):
+            event = aelist.events[i]
+            writer.append(event.frame, event.type, *event.params)
+        writer.close()
+        return cls(stream.getvalue())
+
+    def close(self) -> None:
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __len__(self) -> int:
+        return self._event_count
+
+    def frame(self, index: int) -> int:
+        """Returns the frame of the event at index."""
+        return FRAME.unpack_from(self._buffer, HEADER.size + index * RECORD.size)[0]
+
+    def event(self, index: int) -> Tuple[int, int, int, int, int, int]:
+        """Returns the event at index, as (frame, type, param0, param1, param2, param3)."""
+        return RECORD.unpack_from(self._buffer, HEADER.size + index * RECORD.size)
+
+    @property
+    def last_frame(self) -> int:
+        return self.frame(self._event_count - 1) if self._event_count else 0
+
+    def seek_frame(self, frame: int) -> int:
+        """Returns the index of the first event at or after frame (len(self) if there is none)."""
+        low: int = 0
+        high: int = self._event_count
+        if self._index_frames:
+            # The first event at or after frame is in the last chunk starting before frame,
+            # or is the first event of the next chunk
+            chunk: int = bisect.bisect_left(self._index_frames, frame) - 1
+            if chunk < 0:
+                return 0
+            low = self._index_events[chunk]
+            high = self._index_events[chunk + 1]
+        while low < high:
+            middle: int = (low + high) // 2
+            if self.frame(middle) < frame:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def play(self, index: int) -> None:
+        """Plays the event at index with rl.play_automation_event()."""
+        event = self._event
+        (event.frame, event.type, event.params[0], event.params[1], event.params[2],
+         event.params[3]) = RECORD.unpack_from(self._buffer, HEADER.size + index * RECORD.size)
+        rl.play_automation_event(event[0])
+
+
+def release_keys(keys: Iterable[int]) -> None:
+    """Plays INPUT_KEY_UP events for the keys currently down, e.g. before replaying a log from its start."""
+    event = rl.ffi.new("AutomationEvent *")
+    event.type = INPUT_KEY_UP
+    for key in keys:
+        if rl.is_key_down(key):
+            event.params[0] = key
+            rl.play_automation_event(event[0])
+
+
+def load_event_log(path: Union[Path, str]) -> AutomationEventLog:
+    """Loads a .rael log, or a .rae text file converted into an in-memory log."""
+    if str(path).endswith(".rael"):
+        return AutomationEventLog.open(path)
+    aelist = rl.load_automation_event_list(str(path))
+    try:
+        return AutomationEventLog.from_event_list(aelist)
+    finally:
+        rl.unload_automation_event_list(aelist)
+
+
+def main() -> None:
+    """
+    Main function: converts .rae files to .rael logs, or prints information about a log.
+    """
+    parser = argparse.ArgumentParser(description="Automation event logs (.rael) tool.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    convert_parser = subparsers.add_parser("convert", help="Convert a .rae file to a .rael log")
+    convert_parser.add_argument("input", type=Path, help=".rae input file")
+    convert_parser.add_argument("output", type=Path, help=".rael output file")
+    info_parser = subparsers.add_parser("info", help="Print information about a .rae/.rael file")
+    info_parser.add_argument("input", type=Path, help=".rae or .rael file")
+    args = parser.parse_args()
+
+    log: AutomationEventLog = load_event_log(args.input)
+    if args.command == "convert":
+        writer = AutomationEventLogWriter(args.output)
+        for index in range(len(log)):
+            writer.append(*log.event(index))
+        writer.close()
+        print(f"{len(log)} events written to: {args.output}")
+    else:
+        print(f"{args.input}: {len(log)} events, last frame: {log.last_frame}")
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
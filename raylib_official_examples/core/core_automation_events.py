@@ -7,11 +7,22 @@ BSD-like license that allows static linking with closed source software
 Copyright (c) 2023-2025 Ramon Santamaria (@raysan5)
 
 This source has been converted from C raylib examples to Python.
+
+Recorded events are streamed to a binary log (automation.rael, see automation_event_log.py) instead
+of being exported as text, so recordings are not limited by the AutomationEventList capacity.
+While playing, the recording can be scrubbed with PAGE UP/PAGE DOWN: the game state only depends
+on the played events, so seeking resets the scene (when seeking backward) and simulates the frames
+up to the target frame without drawing them.
 """
 
 import pyray as rl
 import ctypes # Required for AutomationEventList interaction
 import math
+from pathlib import Path
+
+from automation_event_log import AutomationEventLog, AutomationEventLogWriter, load_event_log, release_keys
+
+THIS_DIR = Path(__file__).resolve().parent
 
 # Constants
 GRAVITY = 400.0
@@ -19,6 +30,9 @@ PLAYER_JUMP_SPD = 350.0
 PLAYER_HOR_SPD = 200.0
 MAX_ENVIRONMENT_ELEMENTS = 5
 FIXED_DELTA_TIME = 0.015  # As used in the C example
+EVENT_LOG_FILENAME = "automation.rael"
+SEEK_FRAMES = 600  # Frames skipped by PAGE UP/PAGE DOWN while playing
+GAME_KEYS = (rl.KEY_LEFT, rl.KEY_RIGHT, rl.KEY_SPACE)
 
 # Player class
 class Player:
@@ -34,6 +48,83 @@ class EnvElement:
         self.blocking = blocking
         self.color = color
 
+def reset_scene(player, camera, screen_width, screen_height):
+    player.position = rl.Vector2(400, 280)
+    player.speed = 0
+    player.can_jump = False
+    camera.target = player.position
+    camera.offset = rl.Vector2(screen_width / 2.0, screen_height / 2.0)
+    camera.rotation = 0.0
+    camera.zoom = 1.0
+
+def update_player(player, env_elements, delta_time):
+    if rl.is_key_down(rl.KEY_LEFT):
+        player.position.x -= PLAYER_HOR_SPD * delta_time
+    if rl.is_key_down(rl.KEY_RIGHT):
+        player.position.x += PLAYER_HOR_SPD * delta_time
+    if rl.is_key_down(rl.KEY_SPACE) and player.can_jump:
+        player.speed = -PLAYER_JUMP_SPD
+        player.can_jump = False
+
+    hit_obstacle = False
+    for element in env_elements:
+        if element.blocking:
+            # Check collision with platform logic (simplified for player's bottom center point)
+            player_bottom_x = player.position.x
+            player_next_y = player.position.y + player.speed * delta_time
+            
+            if (element.rect.x <= player_bottom_x <= element.rect.x + element.rect.width and
+                element.rect.y >= player.position.y and # Player is above or at platform level
+                element.rect.y <= player_next_y):      # Player will be at or below platform level
+                
+                hit_obstacle = True
+                player.speed = 0.0
+                player.position.y = element.rect.y # Snap to platform
+                break 
+
+    if not hit_obstacle:
+        player.position.y += player.speed * delta_time
+        player.speed += GRAVITY * delta_time
+        player.can_jump = False
+    else:
+        player.can_jump = True
+
+def update_camera(camera, player, screen_width, screen_height):
+    camera.target = player.position
+    # Mouse wheel zoom (check if event playing might affect this)
+    # The C example applies mouse wheel AFTER potential event playing for the frame.
+    # If an event sets mouse wheel, GetMouseWheelMove will pick it up.
+    camera.zoom += rl.get_mouse_wheel_move() * 0.05
+    if camera.zoom > 3.0: camera.zoom = 3.0
+    elif camera.zoom < 0.25: camera.zoom = 0.25
+
+    # Camera clamping (simplified version from C example)
+    # This part needs careful translation if full C logic is required.
+    # For now, a simpler target following is implemented.
+    # The C example's camera bounding is more complex, ensuring all env elements are visible.
+    # Simplified:
+    camera.offset = rl.Vector2(screen_width / 2.0, screen_height / 2.0)
+
+def play_frame_events(event_log, play_event_index, frame):
+    """Plays the events of the log up to frame, from play_event_index. Returns the next event index."""
+    # Multiple events could be on the same frame
+    while play_event_index < len(event_log) and event_log.frame(play_event_index) <= frame:
+        event_log.play(play_event_index)
+        play_event_index += 1
+    return play_event_index
+
+def fast_forward(event_log, play_event_index, frame, target_frame, player, camera, env_elements,
+                 screen_width, screen_height):
+    """Simulates the playing frames from frame to target_frame, like the main loop does but without
+    drawing. Returns the next event index."""
+    while frame < target_frame:
+        update_player(player, env_elements, FIXED_DELTA_TIME)
+        play_event_index = play_frame_events(event_log, play_event_index, frame)
+        update_camera(camera, player, screen_width, screen_height)
+        rl.poll_input_events()  # Done by rl.end_drawing() otherwise: pressed keys and mouse wheel of the frame
+        frame += 1
+    return play_event_index
+
 def main():
     screen_width = 800
     screen_height = 450
@@ -60,9 +151,13 @@ def main():
     camera.zoom = 1.0
 
     # Automation events
+    # aelist only buffers the events recorded during the current frame: they are moved
+    # to the event log writer every frame. Playback reads from event_log.
     aelist = rl.load_automation_event_list("")
     # Tell raylib to record into this list instance if recording starts.
     rl.set_automation_event_list(aelist)
+    event_log = None  # AutomationEventLog being played
+    event_log_writer = None  # AutomationEventLogWriter while recording
     
     event_recording = False
     event_playing = False
@@ -83,12 +178,11 @@ def main():
             if dropped_files.count > 0:
                 # Check only the first dropped file
                 filepath = rl.ensure_str(dropped_files.paths[0])
-                if rl.is_file_extension(filepath, ".txt") or rl.is_file_extension(filepath, ".rae"):
-                    if aelist.events: # If aelist was previously loaded or recorded into
-                        rl.unload_automation_event_list(aelist) # Unload old events
-                    
-                    aelist = rl.load_automation_events(filepath.encode('utf-8')) # Load new list
-                    # rl.set_automation_event_list(ctypes.byref(aelist)) # Not needed again unless we intend to record into the newly loaded list
+                if rl.is_file_extension(filepath, ".txt;.rae;.rael") and not event_recording:
+                    if event_log is not None:
+                        event_log.close()
+                    # .rael logs are memory-mapped, .rae/.txt files are converted to an in-memory log
+                    event_log = load_event_log(filepath)
                     
                     event_recording = False
                     event_playing = True
@@ -96,98 +190,53 @@ def main():
                     play_event_index = 0
                     
                     # Reset scene state to play
-                    player.position = rl.Vector2(400, 280)
-                    player.speed = 0
-                    player.can_jump = False
-                    camera.target = player.position
-                    camera.offset = rl.Vector2(screen_width / 2.0, screen_height / 2.0)
-                    camera.rotation = 0.0
-                    camera.zoom = 1.0
+                    reset_scene(player, camera, screen_width, screen_height)
                     
                     rl.trace_log(rl.LOG_INFO, f"Successfully loaded automation events from: {filepath}")
 
             rl.unload_dropped_files(dropped_files)
 
+        # Seek in the recording: replay from the start (backward) or from the current frame (forward)
+        if event_playing and event_log is not None and len(event_log) > 0:
+            target_frame = None
+            if rl.is_key_pressed(rl.KEY_PAGE_DOWN):
+                # Stop before the last frame, so its events are played (and playing finishes) normally
+                target_frame = min(automation_frame_counter + SEEK_FRAMES, event_log.last_frame)
+            elif rl.is_key_pressed(rl.KEY_PAGE_UP):
+                target_frame = max(0, automation_frame_counter - SEEK_FRAMES)
+            if target_frame is not None:
+                if target_frame < automation_frame_counter:
+                    release_keys(GAME_KEYS)  # Keys pressed later in the recording are up at its start
+                    reset_scene(player, camera, screen_width, screen_height)
+                    automation_frame_counter = 0
+                    play_event_index = 0
+                play_event_index = fast_forward(event_log, play_event_index, automation_frame_counter, target_frame,
+                                                player, camera, env_elements, screen_width, screen_height)
+                automation_frame_counter = max(automation_frame_counter, target_frame)
+
         # Update player
-        if rl.is_key_down(rl.KEY_LEFT):
-            player.position.x -= PLAYER_HOR_SPD * delta_time
-        if rl.is_key_down(rl.KEY_RIGHT):
-            player.position.x += PLAYER_HOR_SPD * delta_time
-        if rl.is_key_down(rl.KEY_SPACE) and player.can_jump:
-            player.speed = -PLAYER_JUMP_SPD
-            player.can_jump = False
-
-        hit_obstacle = False
-        for element in env_elements:
-            if element.blocking:
-                # Check collision with platform logic (simplified for player's bottom center point)
-                player_bottom_x = player.position.x
-                player_next_y = player.position.y + player.speed * delta_time
-                
-                if (element.rect.x <= player_bottom_x <= element.rect.x + element.rect.width and
-                    element.rect.y >= player.position.y and # Player is above or at platform level
-                    element.rect.y <= player_next_y):      # Player will be at or below platform level
-                    
-                    hit_obstacle = True
-                    player.speed = 0.0
-                    player.position.y = element.rect.y # Snap to platform
-                    break 
-
-        if not hit_obstacle:
-            player.position.y += player.speed * delta_time
-            player.speed += GRAVITY * delta_time
-            player.can_jump = False
-        else:
-            player.can_jump = True
+        update_player(player, env_elements, delta_time)
 
         if rl.is_key_pressed(rl.KEY_R): # Reset game
-            player.position = rl.Vector2(400, 280)
-            player.speed = 0
-            player.can_jump = False
-            camera.target = player.position
-            camera.offset = rl.Vector2(screen_width / 2.0, screen_height / 2.0)
-            camera.rotation = 0.0
-            camera.zoom = 1.0
+            reset_scene(player, camera, screen_width, screen_height)
             automation_frame_counter = 0
             play_event_index = 0
             # event_playing = False # Optionally stop playing on reset
 
         # Events playing
-        if event_playing and aelist.events and aelist.count > 0:
-            # Multiple events could be on the same frame
-            while play_event_index < aelist.count and \
-                  aelist.events[play_event_index].frame == automation_frame_counter:
-                
-                rl.trace_log(rl.LOG_INFO, f"Playing event: frame {aelist.events[play_event_index].frame}, type {aelist.events[play_event_index].type}")
-                rl.play_automation_event(aelist.events[play_event_index])
-                play_event_index += 1
-
-                if play_event_index >= aelist.count:
-                    event_playing = False
-                    play_event_index = 0
-                    # automation_frame_counter = 0 # Reset counter or let it continue? C example resets.
-                    rl.trace_log(rl.LOG_INFO, "FINISH PLAYING AUTOMATION EVENTS!")
-                    break 
-            
-            if event_playing: # If still playing after processing current frame's events
-                 automation_frame_counter += 1
+        if event_playing and event_log is not None and len(event_log) > 0:
+            play_event_index = play_frame_events(event_log, play_event_index, automation_frame_counter)
+            if play_event_index >= len(event_log):
+                event_playing = False
+                play_event_index = 0
+                # automation_frame_counter = 0 # Reset counter or let it continue? C example resets.
+                rl.trace_log(rl.LOG_INFO, "FINISH PLAYING AUTOMATION EVENTS!")
+            else: # If still playing after processing current frame's events
+                automation_frame_counter += 1
 
 
         # Update camera
-        camera.target = player.position
-        # Mouse wheel zoom (check if event playing might affect this)
-        # The C example applies mouse wheel AFTER potential event playing for the frame.
-        # If an event sets mouse wheel, GetMouseWheelMove will pick it up.
-        camera.zoom += rl.get_mouse_wheel_move() * 0.05
-        if camera.zoom > 3.0: camera.zoom = 3.0
-        elif camera.zoom < 0.25: camera.zoom = 0.25
-
-        # Camera clamping (simplified version from C example)
-        # This part needs careful translation if full C logic is required.
-        # For now, a simpler target following is implemented.
-        # The C example's camera bounding is more complex, ensuring all env elements are visible.
-        # Simplified:
-        camera.offset = rl.Vector2(screen_width / 2.0, screen_height / 2.0)
+        update_camera(camera, player, screen_width, screen_height)
 
 
         # Event management (Recording/Playing Toggle)
@@ -196,29 +245,31 @@ def main():
                 if event_recording: # Stop recording
                     rl.stop_automation_event_recording()
                     event_recording = False
-                    if aelist.count > 0:
-                         rl.export_automation_event_list(aelist, b"automation.rae")
-                         rl.trace_log(rl.LOG_INFO, f"STOPPED RECORDING. Events recorded: {aelist.count}. Saved to automation.rae")
+                    event_log_writer.drain(aelist)
+                    event_log_writer.close()
+                    event_count = event_log_writer.event_count
+                    event_log_writer = None
+                    if event_count > 0:
+                         event_log = AutomationEventLog.open(EVENT_LOG_FILENAME)
+                         rl.trace_log(rl.LOG_INFO, f"STOPPED RECORDING. Events recorded: {event_count}. Saved to {EVENT_LOG_FILENAME}")
                     else:
                          rl.trace_log(rl.LOG_INFO, "STOPPED RECORDING. No events recorded.")
                 else: # Start recording
-                    # If there's an existing list (e.g. loaded), clear it before new recording?
-                    # C example implies StartAutomationEventRecording reuses/clears the list set by SetAutomationEventList.
-                    # We might need to re-initialize aelist or ensure it's clean.
-                    # For safety, let's unload if it has events, then re-init for recording.
-                    if aelist.events:
-                        rl.unload_automation_event_list(aelist)
-                    aelist = rl.load_automation_event_list("") # Get a fresh, empty list
-                    rl.set_automation_event_list(aelist) # Point raylib to the new list
-
-                    rl.set_automation_event_base_frame(automation_frame_counter) # C example used 180, here using current for flexibility
+                    if event_log is not None:
+                        event_log.close()  # The log file may be overwritten
+                        event_log = None
+                    aelist.count = 0
+                    event_log_writer = AutomationEventLogWriter(EVENT_LOG_FILENAME)
+
+                    # Recorded frames start at 0, like automation_frame_counter when playing
+                    rl.set_automation_event_base_frame(0)
                     rl.start_automation_event_recording()
                     event_recording = True
                     automation_frame_counter = 0 # Reset for recording duration
                     rl.trace_log(rl.LOG_INFO, "STARTED RECORDING EVENTS...")
 
         elif rl.is_key_pressed(rl.KEY_A): # Toggle events playing
-            if not event_recording and aelist.events and aelist.count > 0:
+            if not event_recording and event_log is not None and len(event_log) > 0:
                 if event_playing: # If playing, stop/pause (C example doesn't have pause, just restarts play)
                     event_playing = False
                     automation_frame_counter = 0
@@ -230,20 +281,16 @@ def main():
                     play_event_index = 0
                     
                     # Reset scene state to play
-                    player.position = rl.Vector2(400, 280)
-                    player.speed = 0
-                    player.can_jump = False
-                    camera.target = player.position
-                    camera.offset = rl.Vector2(screen_width / 2.0, screen_height / 2.0)
-                    camera.rotation = 0.0
-                    camera.zoom = 1.0
-                    rl.trace_log(rl.LOG_INFO, f"STARTED PLAYING {aelist.count} EVENTS...")
-            elif not event_recording and (not aelist.events or aelist.count == 0):
+                    reset_scene(player, camera, screen_width, screen_height)
+                    rl.trace_log(rl.LOG_INFO, f"STARTED PLAYING {len(event_log)} EVENTS...")
+            elif not event_recording and (event_log is None or len(event_log) == 0):
                  rl.trace_log(rl.LOG_INFO, "No events to play. Record (S) or drop a .rae file.")
 
 
         if event_recording : # Only increment if actively recording new events
             automation_frame_counter +=1
+            # Stream the events recorded by raylib to the log, and empty aelist for the next frame
+            event_log_writer.drain(aelist)
         
         # Draw
         rl.begin_drawing()
@@ -259,15 +306,16 @@ def main():
         rl.end_mode_2d()
 
         # UI Text
-        rl.draw_rectangle(10, 10, 320, 155, rl.fade(rl.SKYBLUE, 0.5))
-        rl.draw_rectangle_lines(10, 10, 320, 155, rl.fade(rl.BLUE, 0.8))
+        rl.draw_rectangle(10, 10, 320, 170, rl.fade(rl.SKYBLUE, 0.5))
+        rl.draw_rectangle_lines(10, 10, 320, 170, rl.fade(rl.BLUE, 0.8))
 
         rl.draw_text("Controls:", 20, 20, 10, rl.BLACK)
         rl.draw_text("- Arrows to move, Space to jump", 30, 40, 10, rl.DARKGRAY)
         rl.draw_text("- R to reset game", 30, 55, 10, rl.DARKGRAY)
         rl.draw_text("- S to Start/Stop recording events", 30, 70, 10, rl.DARKGRAY)
         rl.draw_text("- A to Play/Stop recorded/loaded events", 30, 85, 10, rl.DARKGRAY)
-        rl.draw_text("- Drag & Drop .rae/.txt event file to load", 30, 100, 10, rl.DARKGRAY)
+        rl.draw_text("- Drag & Drop .rae/.rael event file to load", 30, 100, 10, rl.DARKGRAY)
+        rl.draw_text("- PAGE UP/PAGE DOWN to seek while playing", 30, 115, 10, rl.DARKGRAY)
 
         status_text = "IDLE"
         status_color = rl.BLACK
@@ -275,18 +323,26 @@ def main():
             status_text = f"RECORDING (Frame: {automation_frame_counter})"
             status_color = rl.RED
         elif event_playing:
-            status_text = f"PLAYING (Frame: {automation_frame_counter}, Event: {play_event_index}/{aelist.count if aelist else 0})"
+            status_text = f"PLAYING (Frame: {automation_frame_counter}, Event: {play_event_index}/{len(event_log)})"
             status_color = rl.LIME
         
-        rl.draw_text(status_text, 20, 125, 10, status_color)
-        rl.draw_text(f"Events in list: {aelist.count if aelist and aelist.events else 0}", 20, 140, 10, rl.DARKBLUE)
+        rl.draw_text(status_text, 20, 140, 10, status_color)
+        if event_recording:
+            rl.draw_text(f"Events recorded: {event_log_writer.event_count}", 20, 155, 10, rl.DARKBLUE)
+        else:
+            rl.draw_text(f"Events in log: {len(event_log) if event_log is not None else 0}", 20, 155, 10, rl.DARKBLUE)
         
         rl.draw_fps(screen_width - 90, 10)
         rl.end_drawing()
 
     # De-Initialization
-    if aelist.events: # Check if aelist has been populated before unloading
-        rl.unload_automation_event_list(aelist)
+    if event_log_writer is not None:
+        rl.stop_automation_event_recording()
+        event_log_writer.drain(aelist)
+        event_log_writer.close()
+    if event_log is not None:
+        event_log.close()
+    rl.unload_automation_event_list(aelist)
     rl.close_window()
 
 if __name__ == '__main__':
@@ -7,10 +7,19 @@ BSD-like license that allows static linking with closed source software
 Copyright (c) 2021-2025 Ramon Santamaria (@raysan5)
 
 This source has been converted from C raylib examples to Python.
+
+Screens load their texture through an AssetCache (see asset_cache.py): entering a screen again
+reuses the texture loaded the first time instead of loading it again.
 """
 
 import pyray as rl
 from enum import Enum # To define GameScreen enum
+from pathlib import Path
+import sys
+
+THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THIS_DIR.parent))  # asset_cache module is shared by other examples
+from asset_cache import AssetCache
 
 # GameScreen enum definition
 class GameScreen(Enum):
@@ -19,6 +28,12 @@ class GameScreen(Enum):
     GAMEPLAY = 2
     ENDING = 3
 
+# Texture displayed by each screen
+SCREEN_TEXTURES = {
+    GameScreen.TITLE: "resources/xbox.png",
+    GameScreen.GAMEPLAY: "resources/ps3.png",
+}
+
 def main():
     # Initialization
     screen_width = 800
@@ -29,6 +44,11 @@ def main():
     current_screen = GameScreen.LOGO
     frames_counter = 0  # Useful to count frames
 
+    asset_cache = AssetCache()
+    screen_assets = asset_cache.scope()  # Assets of the current screen
+    screen_texture = None
+    loaded_screen = None
+
     rl.set_target_fps(60)  # Set desired framerate (frames-per-second)
 
     # Main game loop
@@ -56,6 +76,13 @@ def main():
             if rl.is_key_pressed(rl.KEY_ENTER) or rl.is_gesture_detected(rl.GESTURE_TAP):
                 current_screen = GameScreen.TITLE
 
+        if current_screen != loaded_screen:
+            # Release the assets of the previous screen: they stay cached until the cache budget is exceeded
+            screen_assets.release_all()
+            texture_path = SCREEN_TEXTURES.get(current_screen)
+            screen_texture = screen_assets.texture(str(THIS_DIR/texture_path)) if texture_path else None
+            loaded_screen = current_screen
+
         # Draw
         rl.begin_drawing()
         rl.clear_background(rl.RAYWHITE)
@@ -79,9 +106,15 @@ def main():
             rl.draw_text("ENDING SCREEN", 20, 20, 40, rl.DARKBLUE)
             rl.draw_text("PRESS ENTER or TAP to RETURN to TITLE SCREEN", 120, 220, 20, rl.DARKBLUE)
 
+        if screen_texture is not None:
+            rl.draw_texture_ex(screen_texture, rl.Vector2(screen_width - 260, screen_height - 155), 0.0, 0.3, rl.WHITE)
+        rl.draw_text(f"Asset cache: {asset_cache.misses} loads, {asset_cache.hits} hits", 20, screen_height - 30, 10,
+                     rl.DARKGRAY)
+
         rl.end_drawing()
 
     # De-Initialization
+    asset_cache.unload_all()  # Unload all cached textures
     rl.close_window()  # Close window and OpenGL context
 
 if __name__ == '__main__':
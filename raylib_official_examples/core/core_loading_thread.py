@@ -9,35 +9,35 @@ Copyright (c) 2014-2025 Ramon Santamaria (@raysan5)
 This source has been converted from C raylib examples to Python.
 """
 
+import sys
+from pathlib import Path
+
 import pyray as rl
-import threading
-import time
 
-# Global variables for thread communication
-data_loaded = False
-data_progress = 0
-lock = threading.Lock()
+THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THIS_DIR.parent))  # async_loader module is shared by other examples
+from async_loader import AsyncAssetLoader, LoadState
+
+# Assets really loaded by the loading thread(s): textures first, then fonts, then sounds
+TEXTURE_FILES = sorted((THIS_DIR.parent/"textures/resources").glob("*.png"))
+FONT_FILES = sorted((THIS_DIR.parent/"text/resources").glob("*.ttf"))
+WAVE_FILES = sorted((THIS_DIR.parent/"audio/resources").glob("*.wav"))
+FONT_SIZE = 32
 
-def load_data_thread():
-    global data_loaded, data_progress
 
-    print("Loading thread started...")
-    time_counter = 0  # Time counted in ms
-    start_time = time.time()
+def request_assets(loader):
+    requests = [loader.request_texture(str(path), priority=0) for path in TEXTURE_FILES]
+    requests += [loader.request_font(str(path), FONT_SIZE, priority=1) for path in FONT_FILES]
+    requests += [loader.request_wave(str(path), priority=2) for path in WAVE_FILES]
+    return requests
 
-    # We simulate data loading with a time counter for 5 seconds
-    while time_counter < 5000:
-        current_time = (time.time() - start_time) * 1000  # Current time in ms
-        time_counter = int(current_time)
 
-        with lock:
-            data_progress = time_counter // 10
-        
-        time.sleep(0.01) # Simulate work and allow other threads to run
+def unload_assets(requests):
+    unload = {"texture": rl.unload_texture, "font": rl.unload_font, "wave": rl.unload_wave}
+    for request in requests:
+        if request.state == LoadState.DONE:
+            unload[request.kind](request.result)
 
-    with lock:
-        data_loaded = True
-    print("Loading thread finished.")
 
 class State:
     WAITING = 0
@@ -45,7 +45,6 @@ class State:
     FINISHED = 2
 
 def main():
-    global data_loaded, data_progress
     # Initialization
     # --------------------------------------------------------------------------------------
     screen_width = 800
@@ -53,7 +52,10 @@ def main():
 
     rl.init_window(screen_width, screen_height, "raylib [core] example - loading thread")
 
-    thread = None
+    # Images, fonts and waves are decoded by worker threads, the GPU uploads are done in the
+    # main loop by loader.update(), a few milliseconds per frame
+    loader = AsyncAssetLoader()
+    requests = []
     state = State.WAITING
     frames_counter = 0
 
@@ -64,32 +66,25 @@ def main():
     while not rl.window_should_close():  # Detect window close button or ESC key
         # Update
         # ----------------------------------------------------------------------------------
+        loader.update()
+
         if state == State.WAITING:
             if rl.is_key_pressed(rl.KeyboardKey.KEY_ENTER):
-                with lock:
-                    data_loaded = False
-                    data_progress = 0
-                thread = threading.Thread(target=load_data_thread)
-                thread.start()
-                print("Loading thread created and started.")
+                requests = request_assets(loader)
+                print(f"Loading {len(requests)} assets...")
                 state = State.LOADING
         elif state == State.LOADING:
             frames_counter += 1
-            with lock:
-                current_data_loaded = data_loaded
-            
-            if current_data_loaded:
+            if loader.idle:
                 frames_counter = 0
-                if thread and thread.is_alive():
-                    thread.join() # Wait for the thread to complete
-                print("Loading thread joined successfully.")
+                print("Loading finished.")
                 state = State.FINISHED
         elif state == State.FINISHED:
             if rl.is_key_pressed(rl.KeyboardKey.KEY_ENTER):
                 # Reset everything to launch again
-                with lock:
-                    data_loaded = False
-                    data_progress = 0
+                unload_assets(requests)
+                requests = []
+                loader.clear()
                 state = State.WAITING
         # ----------------------------------------------------------------------------------
 
@@ -101,14 +96,14 @@ def main():
         if state == State.WAITING:
             rl.draw_text("PRESS ENTER to START LOADING DATA", 150, 170, 20, rl.DARKGRAY)
         elif state == State.LOADING:
-            with lock:
-                current_progress = data_progress
-            rl.draw_rectangle(150, 200, current_progress, 60, rl.SKYBLUE)
+            rl.draw_rectangle(150, 200, int(loader.progress*500), 60, rl.SKYBLUE)
             if (frames_counter // 15) % 2:
                 rl.draw_text("LOADING DATA...", 240, 210, 40, rl.DARKBLUE)
         elif state == State.FINISHED:
             rl.draw_rectangle(150, 200, 500, 60, rl.LIME)
             rl.draw_text("DATA LOADED!", 250, 210, 40, rl.GREEN)
+            loaded = sum(1 for request in requests if request.state == LoadState.DONE)
+            rl.draw_text(f"{loaded}/{len(requests)} assets loaded", 150, 280, 20, rl.DARKGRAY)
 
         rl.draw_rectangle_lines(150, 200, 500, 60, rl.DARKGRAY)
         rl.end_drawing()
@@ -116,13 +111,8 @@ def main():
 
     # De-Initialization
     # --------------------------------------------------------------------------------------
-    # Ensure thread is joined if window is closed while loading
-    if thread and thread.is_alive():
-        # Signal the thread to stop if it's designed to check a flag
-        # For this example, we'll just wait for it to finish its current task
-        print("Window closing, joining loading thread...")
-        thread.join()
-        print("Loading thread joined before closing.")
+    loader.shutdown()  # Cancels the requests still loading, and stops the worker threads
+    unload_assets(requests)
 
     rl.close_window()  # Close window and OpenGL context
     # --------------------------------------------------------------------------------------
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Runs a single pyray example for a fixed number of frames and reports frame timings.
+
+The example is executed unmodified with runpy. The harness patches a few pyray functions
+before the example imports pyray (the example gets the same module object):
+- rl.set_target_fps() and FLAG_VSYNC_HINT are neutralized so frames are not capped,
+- rl.end_drawing() is timed, one sample per frame,
+- rl.window_should_close() returns True once the frame budget is reached (--frames 0: no budget).
+
+With --profile, a FrameProfiler (see frame_profiler.py) is also installed: it splits each frame
+into update/draw/end_drawing phases, replaces the rl.draw_fps() readout with its frame-time graph,
+and its per-phase statistics are added to the results.
+
+With --replay, the inputs recorded in a .rae file are played back into the example, with a fixed
+time step and seeded random generators (see automation_replay.py), so that runs are reproducible.
+The replay runs as fast as possible, unless --realtime is given (rl.set_target_fps() is honored).
+With --replay and --frames 0, the example runs until the last recorded event.
+--record records the inputs of an interactive run instead.
+
+With --track-allocs, rl.ffi.new() calls and Python heap allocations are measured per frame
+(see alloc_tracker.py). --alloc-budget sets the status to "over_budget" when the example makes
+more rl.ffi.new() calls per frame, on average, than allowed.
+
+With --gc-monitor, the garbage collector pauses are measured and attributed to frames; --gc-schedule
+moves the collections to the end of the frames that have time left, and --gc-freeze excludes the
+objects created by the example setup from collections (see gc_monitor.py).
+
+With --audio-monitor, the audio callbacks given to rl.set_audio_stream_callback(),
+rl.attach_audio_stream_processor() and rl.attach_audio_mixed_processor() are timed against the
+real-time budget of their buffers, their load graphs are drawn, and their statistics (percentiles,
+worst duration, likely underruns) are added to the results (see audio_callback_monitor.py).
+
+The results (frame time percentiles, wall time, peak RSS) are written as JSON, either to
+stdout or to the file given with --output. This script is used by bench_examples.py to run
+each example in its own process, but can also be used directly:
+
+    python raylib_official_examples/example_harness.py --frames 300 raylib_official_examples/textures/textures_bunnymark.py
+
+Arguments after the example path are passed to the example (e.g. textures_bunnymark.py --numpy).
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import runpy
+import sys
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import pyray as rl
+
+from alloc_tracker import AllocationTracker
+from audio_callback_monitor import AudioCallbackMonitor
+from automation_replay import AutomationRecorder, AutomationReplay
+from frame_profiler import FrameProfiler
+from gc_monitor import GcMonitor
+
+THIS_DIR: Path = Path(__file__).resolve().parent
+
+DEFAULT_FRAMES: int = 300
+DEFAULT_WARMUP_FRAMES: int = 30
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of an already sorted list (fraction in [0, 1])."""
+    if not sorted_values:
+        return 0.0
+    rank: int = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize_frame_times(frame_times_ns: List[int]) -> Dict[str, float]:
+    """Returns mean/p50/p95/p99/max of the frame times, in milliseconds."""
+    values_ms: List[float] = sorted(t / 1e6 for t in frame_times_ns)
+    if not values_ms:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "mean_ms": sum(values_ms) / len(values_ms),
+        "p50_ms": percentile(values_ms, 0.50),
+        "p95_ms": percentile(values_ms, 0.95),
+        "p99_ms": percentile(values_ms, 0.99),
+        "max_ms": values_ms[-1],
+    }
+
+
+def peak_rss_kb() -> int:
+    """Returns the peak resident set size of this process, in KiB."""
+    max_rss: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, in KiB on Linux
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def clamp_warmup(frames: int, warmup_frames: int) -> int:
+    """Returns the warmup frames, kept below the frame budget (if any) so some frames are measured."""
+    if frames > 0:
+        return max(0, min(warmup_frames, frames - 1))
+    return max(0, warmup_frames)
+
+
+class FrameBudgetPatch:
+    """Patches pyray so that an example runs uncapped for a fixed number of frames.
+
+    Frame times are measured between consecutive returns of rl.end_drawing(), so they include
+    the Python update code, the draw submission and the buffer swap.
+    A frames value of 0 means no frame budget. If uncapped is False, the frame rate set by the
+    example with rl.set_target_fps() and FLAG_VSYNC_HINT are honored.
+    """
+
+    def __init__(self, frames: int, warmup_frames: int, uncapped: bool = True):
+        self.frames: int = frames
+        self.warmup_frames: int = warmup_frames
+        self.uncapped: bool = uncapped
+        self.frame_count: int = 0
+        self.frame_times_ns: List[int] = []
+        self._last_frame_end_ns: Optional[int] = None
+        self._originals: Dict[str, Callable[..., Any]] = {}
+
+    def install(self) -> None:
+        """Replaces the pyray functions, keeping the originals for uninstall()."""
+        for name in ("window_should_close", "end_drawing"):
+            self._originals[name] = getattr(rl, name)
+        if self.uncapped:
+            for name in ("set_target_fps", "set_config_flags"):
+                self._originals[name] = getattr(rl, name)
+            rl.set_target_fps = self._set_target_fps
+            rl.set_config_flags = self._set_config_flags
+        rl.window_should_close = self._window_should_close
+        rl.end_drawing = self._end_drawing
+
+    def uninstall(self) -> None:
+        """Restores the original pyray functions."""
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
+
+    def _set_target_fps(self, fps: int) -> None:
+        self._originals["set_target_fps"](0)  # 0 means uncapped
+
+    def _set_config_flags(self, flags: int) -> None:
+        self._originals["set_config_flags"](flags & ~rl.FLAG_VSYNC_HINT)
+
+    def _window_should_close(self) -> bool:
+        if self.frames and self.frame_count >= self.frames:
+            return True
+        return self._originals["window_should_close"]()
+
+    def _end_drawing(self) -> None:
+        self._originals["end_drawing"]()
+        now_ns: int = time.perf_counter_ns()
+        if self._last_frame_end_ns is not None and self.frame_count >= self.warmup_frames:
+            self.frame_times_ns.append(now_ns - self._last_frame_end_ns)
+        self._last_frame_end_ns = now_ns
+        self.frame_count += 1
+
+
+def run_example(example_path: Path, frames: int = DEFAULT_FRAMES,
+                warmup_frames: int = DEFAULT_WARMUP_FRAMES,
+                profiler: Optional[FrameProfiler] = None,
+                replay: Optional[AutomationReplay] = None,
+                recorder: Optional[AutomationRecorder] = None,
+                alloc_tracker: Optional[AllocationTracker] = None,
+                alloc_budget: Optional[float] = None,
+                gc_monitor: Optional[GcMonitor] = None,
+                audio_monitor: Optional[AudioCallbackMonitor] = None,
+                uncapped: bool = True, example_args: Sequence[str] = ()) -> Dict[str, Any]:
+    """Runs the example in the current process and returns its benchmark results.
+
+    Must be called only once per process: raylib keeps global window state.
+    """
+    result: Dict[str, Any] = {"example": example_path.as_posix(), "status": "ok"}
+    example_path = example_path.resolve()
+    if replay is not None and frames == 0:
+        frames = replay.last_frame + 1
+    warmup_frames = clamp_warmup(frames, warmup_frames)
+    patch = FrameBudgetPatch(frames, warmup_frames, uncapped)
+
+    # Run the example as if launched with "python <example_path>"
+    sys.argv = [str(example_path), *example_args]
+    sys.path.insert(0, str(example_path.parent))
+    rl.set_trace_log_level(rl.LOG_WARNING)
+    patch.install()
+    # Installed after the frame budget patch: events are played before the budget is checked
+    extensions: List[Any] = [extension for extension in (replay, recorder, profiler, alloc_tracker, gc_monitor,
+                                                         audio_monitor)
+                             if extension is not None]
+    for extension in extensions:
+        extension.install()
+    start_ns: int = time.perf_counter_ns()
+    try:
+        runpy.run_path(str(example_path), run_name="__main__")
+    except SystemExit as e:
+        if e.code not in (None, 0):
+            result["status"] = "error"
+            result["error"] = f"SystemExit: {e.code}"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        result["traceback"] = traceback.format_exc()
+    finally:
+        for extension in reversed(extensions):
+            extension.uninstall()
+        if profiler is not None:
+            profiler.close()
+        patch.uninstall()
+    wall_time_ns: int = time.perf_counter_ns() - start_ns
+
+    result["frames"] = patch.frame_count
+    result["measured_frames"] = len(patch.frame_times_ns)
+    result.update(summarize_frame_times(patch.frame_times_ns))
+    result["wall_time_s"] = wall_time_ns / 1e9
+    result["peak_rss_kb"] = peak_rss_kb()
+    if profiler is not None:
+        result["profile"] = profiler.summary()
+    if alloc_tracker is not None:
+        result["allocations"] = alloc_tracker.summary()
+        if alloc_budget is not None and result["status"] == "ok" \
+                and alloc_tracker.mean_ffi_allocs_per_frame() > alloc_budget:
+            result["status"] = "over_budget"
+    if gc_monitor is not None:
+        result["gc"] = gc_monitor.summary()
+    if audio_monitor is not None:
+        result["audio_callbacks"] = audio_monitor.summary()
+    if replay is not None:
+        result["replay"] = {"file": replay.path.as_posix(), "events_played": replay.event_index,
+                            "events": replay.event_count}
+    if result["status"] == "ok" and patch.frame_count < frames:
+        result["status"] = "closed_early"
+    return result
+
+
+def main() -> None:
+    """
+    Main function: runs one example and writes its results as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Runs one pyray example for a fixed number of frames.")
+    parser.add_argument("example", type=Path, help="Path of the example script")
+    parser.add_argument("example_args", nargs=argparse.REMAINDER, help="Arguments passed to the example")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES, help="Number of frames to run")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP_FRAMES,
+                        help="Number of initial frames excluded from the statistics")
+    parser.add_argument("--output", type=Path, help="JSON output file (default: stdout)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time the update/draw/end_drawing phases and draw the frame-time graph")
+    parser.add_argument("--profile-csv", type=Path, help="Also write the per-frame phase times to this CSV file")
+    parser.add_argument("--replay", type=Path, help="Play the input events recorded in this .rae/.rael file")
+    parser.add_argument("--record", type=Path, help="Record the input events into this .rae file")
+    parser.add_argument("--track-allocs", action="store_true",
+                        help="Measure the rl.ffi.new() calls and Python heap allocations per frame")
+    parser.add_argument("--alloc-budget", type=float,
+                        help="Maximum mean number of rl.ffi.new() calls per frame (implies --track-allocs)")
+    parser.add_argument("--gc-monitor", action="store_true", help="Measure the garbage collector pauses per frame")
+    parser.add_argument("--gc-schedule", action="store_true",
+                        help="Run the garbage collector at the end of frames with time left (implies --gc-monitor)")
+    parser.add_argument("--gc-freeze", action="store_true",
+                        help="Freeze the objects created before the main loop (implies --gc-monitor)")
+    parser.add_argument("--audio-monitor", action="store_true",
+                        help="Time the audio callbacks against their real-time budget, and draw their load")
+    parser.add_argument("--realtime", action="store_true",
+                        help="Honor rl.set_target_fps() and vsync instead of running uncapped")
+    args = parser.parse_args()
+    args.warmup = clamp_warmup(args.frames, args.warmup)
+    if args.replay and args.record:
+        parser.error("--replay and --record can't be used together")
+
+    profiler: Optional[FrameProfiler] = None
+    if args.profile or args.profile_csv:
+        profiler = FrameProfiler(csv_path=args.profile_csv)
+
+    # Ask Mesa to not wait for vblank, set_target_fps(0) is not enough with some drivers
+    os.environ.setdefault("vblank_mode", "0")
+    replay: Optional[AutomationReplay] = AutomationReplay(args.replay) if args.replay else None
+    recorder: Optional[AutomationRecorder] = AutomationRecorder(args.record) if args.record else None
+    alloc_tracker: Optional[AllocationTracker] = None
+    if args.track_allocs or args.alloc_budget is not None:
+        alloc_tracker = AllocationTracker(args.warmup)
+    gc_monitor: Optional[GcMonitor] = None
+    if args.gc_monitor or args.gc_schedule or args.gc_freeze:
+        gc_monitor = GcMonitor(schedule=args.gc_schedule, freeze=args.gc_freeze)
+    audio_monitor: Optional[AudioCallbackMonitor] = AudioCallbackMonitor() if args.audio_monitor else None
+    result: Dict[str, Any] = run_example(args.example, args.frames, args.warmup, profiler, replay, recorder,
+                                         alloc_tracker, args.alloc_budget, gc_monitor, audio_monitor,
+                                         uncapped=not args.realtime, example_args=args.example_args)
+
+    content: str = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(content, encoding="utf-8")
+    else:
+        print(content)
+
+
+if __name__ == "__main__":
+    main()
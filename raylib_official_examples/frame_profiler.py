@@ -0,0 +1,289 @@
+"""
+Per-phase frame profiler, with an on-screen frame-time graph replacing rl.draw_fps().
+
+Phases (e.g. "update", "draw", "end_drawing") are timed with time.perf_counter_ns(). Each phase
+keeps its last HISTORY_SIZE frame samples in a preallocated ring buffer, and a rolling histogram
+of those samples used to compute percentiles. Nothing is allocated per frame, except the
+overlay text and the optional sink rows.
+
+Explicit usage in an example main loop:
+
+    profiler = FrameProfiler(["update", "draw", "end_drawing"])
+    while not rl.window_should_close():
+        profiler.begin("update")
+        ...  # Update
+        profiler.end("update")
+        rl.begin_drawing()
+        profiler.begin("draw")
+        ...  # Draw
+        profiler.draw(10, 10)  # instead of rl.draw_fps(10, 10)
+        profiler.end("draw")
+        profiler.begin("end_drawing")
+        rl.end_drawing()
+        profiler.end("end_drawing")
+        profiler.end_frame()
+
+Or, without modifying the example, profiler.install() patches pyray so that rl.begin_drawing(),
+rl.end_drawing() and rl.draw_fps() delimit and draw the phases automatically (this is what
+example_harness.py --profile does).
+
+Audio callbacks run on the audio thread: wrap them with profiler.wrap_callback("audio", callback),
+their time is accumulated into the frame during which they ran. The audio thread only adds to a
+running total, end_frame() takes the difference since the previous frame.
+"""
+import array
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO
+
+import pyray as rl
+
+HISTORY_SIZE = 240  # Number of frames kept per phase
+HISTOGRAM_BUCKET_NS = 100_000  # 0.1 ms per histogram bucket
+HISTOGRAM_BUCKETS = 1000  # Up to 100 ms, the last bucket collects everything above
+
+AUTO_PHASES = ("update", "draw", "end_drawing")
+
+# Graph colors, per phase index
+PHASE_COLORS = [rl.SKYBLUE, rl.ORANGE, rl.LIME, rl.VIOLET, rl.GOLD, rl.PINK, rl.BEIGE, rl.MAROON]
+
+GRAPH_WIDTH = HISTORY_SIZE
+GRAPH_HEIGHT = 60
+GRAPH_MAX_MS = 33.3  # Frame time at the top of the graph
+TARGET_FRAME_MS = 1000.0 / 60.0
+
+
+class PhaseStats:
+    """Ring buffer of the last HISTORY_SIZE samples of one phase, with a rolling histogram."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.samples_ns = array.array("q", [0]) * HISTORY_SIZE
+        self.histogram = array.array("l", [0]) * HISTOGRAM_BUCKETS
+        self.count = 0  # Number of valid samples, up to HISTORY_SIZE
+        self.total_ns = 0  # Sum of the valid samples
+        self.index = 0  # Next slot to write
+
+    def push(self, duration_ns: int):
+        """Adds a sample, evicting the oldest one once the ring buffer is full."""
+        if self.count == HISTORY_SIZE:
+            old_ns = self.samples_ns[self.index]
+            self.histogram[min(old_ns // HISTOGRAM_BUCKET_NS, HISTOGRAM_BUCKETS - 1)] -= 1
+            self.total_ns -= old_ns
+        else:
+            self.count += 1
+        self.samples_ns[self.index] = duration_ns
+        self.histogram[min(duration_ns // HISTOGRAM_BUCKET_NS, HISTOGRAM_BUCKETS - 1)] += 1
+        self.total_ns += duration_ns
+        self.index = (self.index + 1) % HISTORY_SIZE
+
+    def last_ns(self) -> int:
+        return self.samples_ns[(self.index - 1) % HISTORY_SIZE] if self.count else 0
+
+    def mean_ms(self) -> float:
+        return self.total_ns / self.count / 1e6 if self.count else 0.0
+
+    def percentile_ms(self, fraction: float) -> float:
+        """Returns the percentile from the histogram, with a HISTOGRAM_BUCKET_NS resolution."""
+        if not self.count:
+            return 0.0
+        rank = max(1, int(fraction * self.count + 0.5))
+        cumulated = 0
+        for bucket, bucket_count in enumerate(self.histogram):
+            cumulated += bucket_count
+            if cumulated >= rank:
+                return (bucket + 1) * HISTOGRAM_BUCKET_NS / 1e6  # Upper bound of the bucket
+        return HISTOGRAM_BUCKETS * HISTOGRAM_BUCKET_NS / 1e6
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "mean_ms": self.mean_ms(),
+            "p50_ms": self.percentile_ms(0.50),
+            "p95_ms": self.percentile_ms(0.95),
+            "p99_ms": self.percentile_ms(0.99),
+        }
+
+
+class FrameProfiler:
+    """Times named phases of each frame, see the module docstring for usage."""
+
+    def __init__(self, phases: Sequence[str] = AUTO_PHASES, csv_path: Optional[Path] = None):
+        self.phases: List[PhaseStats] = []
+        self._phase_indices: Dict[str, int] = {}
+        # Time accumulated by each phase during the current frame, and start of running phases
+        self._current_ns: List[int] = []
+        self._started_ns: List[int] = []
+        # Running totals of the wrapped callbacks (only written by their thread), and the values already
+        # accounted by end_frame(), per phase index
+        self._callback_totals_ns: Dict[int, List[int]] = {}
+        self._callback_seen_ns: Dict[int, int] = {}
+        # Graph line strips, one point per frame: (x, y) floats viewed as Vector2
+        self._graph_points = rl.ffi.new("float[]", HISTORY_SIZE * 2)
+        self._graph_points_v = rl.ffi.cast("Vector2 *", self._graph_points)
+        self._graph_stacked_ns = array.array("q", [0]) * HISTORY_SIZE  # Time of the phases drawn so far, per frame
+        self.frame = PhaseStats("frame")
+        self._frame_start_ns = time.perf_counter_ns()
+        self.frame_count = 0
+        self._csv_file: Optional[TextIO] = None
+        self._originals: Dict[str, Callable[..., Any]] = {}
+        for name in phases:
+            self.add_phase(name)
+        if csv_path is not None:
+            self.open_csv(csv_path)
+
+    def add_phase(self, name: str) -> int:
+        """Registers a phase (done implicitly by begin() for unknown phases) and returns its index."""
+        if name not in self._phase_indices:
+            if self._csv_file is not None:
+                raise ValueError(f"Can't add phase '{name}' once the CSV sink is opened")
+            self._phase_indices[name] = len(self.phases)
+            self.phases.append(PhaseStats(name))
+            self._current_ns.append(0)
+            self._started_ns.append(0)
+        return self._phase_indices[name]
+
+    def begin(self, name: str):
+        index = self._phase_indices.get(name)
+        if index is None:
+            index = self.add_phase(name)
+        self._started_ns[index] = time.perf_counter_ns()
+
+    def end(self, name: str):
+        index = self._phase_indices[name]
+        self._current_ns[index] += time.perf_counter_ns() - self._started_ns[index]
+
+    def add_time(self, name: str, duration_ns: int):
+        """Accumulates time measured elsewhere (e.g. on another thread) into the current frame."""
+        self._current_ns[self.add_phase(name)] += duration_ns
+
+    def wrap_callback(self, name: str, callback: Callable[..., Any]) -> Callable[..., Any]:
+        """Returns a function calling callback, and accounting its duration in phase 'name'.
+
+        Wrap the Python function before passing it to rl.ffi.callback(), e.g. for audio callbacks.
+        """
+        index = self.add_phase(name)
+        total_ns = self._callback_totals_ns.setdefault(index, [0])
+        self._callback_seen_ns.setdefault(index, 0)
+
+        def timed_callback(*args):
+            start_ns = time.perf_counter_ns()
+            try:
+                return callback(*args)
+            finally:
+                total_ns[0] += time.perf_counter_ns() - start_ns
+
+        return timed_callback
+
+    def end_frame(self):
+        """Pushes the phase times of the frame that just ended into the histories."""
+        now_ns = time.perf_counter_ns()
+        self.frame.push(now_ns - self._frame_start_ns)
+        self._frame_start_ns = now_ns
+        for index, total_ns in self._callback_totals_ns.items():
+            current_total_ns = total_ns[0]
+            self._current_ns[index] += current_total_ns - self._callback_seen_ns[index]
+            self._callback_seen_ns[index] = current_total_ns
+        for index, phase in enumerate(self.phases):
+            phase.push(self._current_ns[index])
+            self._current_ns[index] = 0
+        self.frame_count += 1
+        if self._csv_file is not None:
+            row = [str(self.frame_count), str(self.frame.last_ns())]
+            row.extend(str(phase.last_ns()) for phase in self.phases)
+            self._csv_file.write(",".join(row) + "\n")
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the statistics of the frames and of each phase, over the history."""
+        return {
+            "frames": self.frame_count,
+            "history_frames": self.frame.count,
+            "frame": self.frame.summary(),
+            "phases": {phase.name: phase.summary() for phase in self.phases},
+        }
+
+    def write_json(self, path: Path):
+        path.write_text(json.dumps(self.summary(), indent=2), encoding="utf-8")
+
+    def open_csv(self, path: Path):
+        """Starts writing one row per frame to a CSV file: frame, frame_ns, then one column per phase."""
+        self._csv_file = open(path, "w", encoding="utf-8")
+        self._csv_file.write(",".join(["frame", "frame_ns"] + [f"{phase.name}_ns" for phase in self.phases]) + "\n")
+
+    def close(self):
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+
+    def draw(self, pos_x: int, pos_y: int):
+        """Draws the frame-time graph (the phase times of each frame stacked, as one line strip per phase,
+        so a few draw calls whatever the history) and the phase readout."""
+        rl.draw_rectangle(pos_x, pos_y, GRAPH_WIDTH, GRAPH_HEIGHT, rl.fade(rl.BLACK, 0.7))
+        scale = GRAPH_HEIGHT / (GRAPH_MAX_MS * 1e6)
+        bottom = pos_y + GRAPH_HEIGHT
+        count = self.frame.count
+        # Oldest sample on the left
+        first = self.frame.index if count == HISTORY_SIZE else 0
+        stacked_ns = self._graph_stacked_ns
+        points = self._graph_points
+        for x in range(count):
+            points[2 * x] = pos_x + x
+            stacked_ns[x] = 0
+        for index, phase in enumerate(self.phases):
+            samples_ns = phase.samples_ns
+            for x in range(count):
+                stacked_ns[x] += samples_ns[(first + x) % HISTORY_SIZE]
+                points[2 * x + 1] = max(bottom - stacked_ns[x] * scale, pos_y)
+            if count > 1:
+                rl.draw_line_strip(self._graph_points_v, count, PHASE_COLORS[index % len(PHASE_COLORS)])
+        target_y = bottom - int(TARGET_FRAME_MS * 1e6 * scale)
+        rl.draw_line(pos_x, target_y, pos_x + GRAPH_WIDTH, target_y, rl.RED)
+
+        text_y = bottom + 4
+        frame_ms = self.frame.mean_ms()
+        fps = 1000.0 / frame_ms if frame_ms > 0 else 0.0
+        rl.draw_text(f"{fps:.0f} FPS  frame {frame_ms:.2f} ms  p95 {self.frame.percentile_ms(0.95):.1f} ms",
+                     pos_x, text_y, 10, rl.LIME)
+        for index, phase in enumerate(self.phases):
+            text_y += 12
+            rl.draw_text(f"{phase.name}: {phase.mean_ms():.2f} ms  p95 {phase.percentile_ms(0.95):.1f} ms",
+                         pos_x, text_y, 10, PHASE_COLORS[index % len(PHASE_COLORS)])
+
+    def install(self):
+        """Patches pyray to profile an unmodified example.
+
+        - "update" is the time from the end of rl.end_drawing() to the next rl.begin_drawing(),
+        - "draw" is the time between rl.begin_drawing() and rl.end_drawing(),
+        - "end_drawing" is the time spent in rl.end_drawing() (batch flush, swap and frame wait),
+        - rl.draw_fps(x, y) draws the profiler instead.
+        """
+        for name in AUTO_PHASES:
+            self.add_phase(name)
+        for name in ("begin_drawing", "end_drawing", "draw_fps"):
+            self._originals[name] = getattr(rl, name)
+        original_begin_drawing = self._originals["begin_drawing"]
+        original_end_drawing = self._originals["end_drawing"]
+        self.begin("update")
+
+        def begin_drawing():
+            self.end("update")
+            original_begin_drawing()
+            self.begin("draw")
+
+        def end_drawing():
+            self.end("draw")
+            self.begin("end_drawing")
+            original_end_drawing()
+            self.end("end_drawing")
+            self.end_frame()
+            self.begin("update")
+
+        rl.begin_drawing = begin_drawing
+        rl.end_drawing = end_drawing
+        rl.draw_fps = self.draw
+
+    def uninstall(self):
+        """Restores the functions patched by install()."""
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
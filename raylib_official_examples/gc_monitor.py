@@ -0,0 +1,208 @@
+"""
+Garbage collector pause monitor, and frame-aligned collection scheduler.
+
+GcMonitor hooks gc.callbacks to measure the duration of each collection, per generation, and
+attributes it to the frame during which it happened (frames are delimited by rl.end_drawing()).
+Examples holding many Python objects (e.g. the Bunny and rl.Vector2 objects of
+textures/textures_bunnymark.py) can get multi-millisecond generation 2 pauses at random frames.
+
+Two optional modes reduce those stalls:
+- schedule: automatic collection is disabled (gc.disable()). At the end of each frame, before
+  rl.end_drawing() (which then waits for the next frame), the generations that are due
+  (gc.get_count() above gc.get_threshold()) are collected with gc.collect(generation), if the
+  estimated pause fits in what remains of the frame budget. A generation too far behind
+  (FORCE_COLLECT_FACTOR times its threshold, or due for MAX_DEFERRED_FRAMES frames) is collected
+  anyway, so memory stays bounded even when the frames are over budget. As in CPython, generation 2 is only due when the objects
+  moved to it since the last full collection are 25% of those it held then (counted from the
+  young generations sizes and the collections results), so there are no more full collections
+  than in automatic mode.
+- freeze: at the first frame, everything allocated by the example setup is collected once, then
+  moved to the permanent generation with gc.freeze(): later collections don't scan it anymore.
+
+Usage with example_harness.py (any example):
+
+    python raylib_official_examples/example_harness.py --gc-schedule --gc-freeze \
+        raylib_official_examples/textures/textures_bunnymark.py
+"""
+import array
+import gc
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import pyray as rl
+
+GENERATIONS = 3
+DEFAULT_FRAME_BUDGET_MS = 1000.0 / 60.0
+# In schedule mode, a due generation is collected even without budget once its count reaches
+# this multiple of its threshold
+FORCE_COLLECT_FACTOR = 10
+MAX_DEFERRED_FRAMES = 120  # Frames a due generation waits for budget before being collected anyway
+LONG_LIVED_PENDING_RATIO = 0.25  # CPython full collection condition: pending > ratio * long lived
+PAUSE_ESTIMATE_SMOOTHING = 0.2  # Weight of the last pause in the pause duration estimate
+MAX_RECORDED_PAUSES = 4096
+TOP_PAUSES = 10
+
+
+class GcMonitor:
+    """Measures the collections per generation and per frame, see the module docstring."""
+
+    def __init__(self, schedule: bool = False, freeze: bool = False,
+                 frame_budget_ms: float = DEFAULT_FRAME_BUDGET_MS):
+        self.schedule = schedule
+        self.freeze = freeze
+        self.frame_budget_ns = int(frame_budget_ms * 1e6)
+        self.frame_count = 0
+        # Per generation statistics
+        self.collections = array.array("q", [0]) * GENERATIONS
+        self.scheduled_collections = array.array("q", [0]) * GENERATIONS
+        self.total_pause_ns = array.array("q", [0]) * GENERATIONS
+        self.max_pause_ns = array.array("q", [0]) * GENERATIONS
+        self.estimated_pause_ns = [0.0] * GENERATIONS
+        # Per frame statistics
+        self.frames_with_pauses = 0
+        self.max_frame_pause_ns = 0
+        self.max_frame_pause_frame = 0
+        self.pauses: List[Tuple[int, int, int, bool]] = []  # (frame, generation, duration, scheduled)
+        self.frozen_objects = 0
+        self._frame_pause_ns = 0
+        self._frame_start_ns = 0
+        self._pause_start_ns = 0
+        self._scheduled = False  # True while a collection is run by the scheduler
+        # Objects in generation 2 after the last full collection, and moved to it since (schedule mode)
+        self._long_lived_total = 0
+        self._long_lived_pending = 0
+        self._due_frames = [-1] * GENERATIONS  # Frame at which each generation became due, -1 if not due
+        self._originals: Dict[str, Callable[..., Any]] = {}
+
+    def _on_gc(self, phase: str, info: Dict[str, int]):
+        if phase == "start":
+            self._pause_start_ns = time.perf_counter_ns()
+            return
+        duration_ns = time.perf_counter_ns() - self._pause_start_ns
+        generation = info["generation"]
+        self.collections[generation] += 1
+        if self._scheduled:
+            self.scheduled_collections[generation] += 1
+        self.total_pause_ns[generation] += duration_ns
+        if duration_ns > self.max_pause_ns[generation]:
+            self.max_pause_ns[generation] = duration_ns
+        self.estimated_pause_ns[generation] += PAUSE_ESTIMATE_SMOOTHING * (
+                duration_ns - self.estimated_pause_ns[generation])
+        self._frame_pause_ns += duration_ns
+        if len(self.pauses) < MAX_RECORDED_PAUSES:
+            self.pauses.append((self.frame_count, generation, duration_ns, self._scheduled))
+
+    def install(self):
+        """Registers the gc callback, and patches rl.window_should_close() and rl.end_drawing()."""
+        gc.callbacks.append(self._on_gc)
+        if self.schedule:
+            gc.disable()
+            self._long_lived_total = len(gc.get_objects(generation=2))
+        for name in ("window_should_close", "end_drawing"):
+            self._originals[name] = getattr(rl, name)
+        original_window_should_close = self._originals["window_should_close"]
+        original_end_drawing = self._originals["end_drawing"]
+
+        def window_should_close():
+            if self.freeze and self.frame_count == 0 and not self.frozen_objects:
+                # Setup is done: collect its garbage, and exclude what remains from future collections
+                gc.collect()
+                gc.freeze()
+                self.frozen_objects = gc.get_freeze_count()
+                self._long_lived_total = self._long_lived_pending = 0  # Moved to the permanent generation
+                self._frame_pause_ns = 0  # Not accounted to the first frame
+            return original_window_should_close()
+
+        def end_drawing():
+            if self.schedule:
+                self.collect_in_budget()
+            original_end_drawing()
+            self.end_frame()
+
+        rl.window_should_close = window_should_close
+        rl.end_drawing = end_drawing
+        self._frame_start_ns = time.perf_counter_ns()
+
+    def collect_in_budget(self):
+        """Collects the due generations, if their estimated pause fits in the rest of the frame budget."""
+        counts = gc.get_count()
+        thresholds = gc.get_threshold()
+        remaining_ns = self.frame_budget_ns - (time.perf_counter_ns() - self._frame_start_ns)
+        for generation in range(GENERATIONS - 1, -1, -1):
+            # gc.collect(generation) also collects the younger generations
+            # Generation 2 isn't worth a full collection yet, CPython collects generation 1 instead
+            due = counts[generation] >= thresholds[generation] and (
+                generation < GENERATIONS - 1
+                or self._long_lived_pending > LONG_LIVED_PENDING_RATIO * self._long_lived_total)
+            if not due:
+                self._due_frames[generation] = -1
+                continue
+            if self._due_frames[generation] < 0:
+                self._due_frames[generation] = self.frame_count
+            if self.estimated_pause_ns[generation] <= remaining_ns or \
+                    counts[generation] >= thresholds[generation] * FORCE_COLLECT_FACTOR or \
+                    self.frame_count - self._due_frames[generation] >= MAX_DEFERRED_FRAMES:
+                self._collect(generation)
+                return
+
+    def _collect(self, generation: int):
+        # Objects collected: the young generations are small, counting them is cheap
+        young = sum(len(gc.get_objects(generation=i)) for i in range(min(generation + 1, GENERATIONS - 1)))
+        self._scheduled = True
+        try:
+            unreachable = gc.collect(generation)
+        finally:
+            self._scheduled = False
+        for collected in range(generation + 1):
+            self._due_frames[collected] = -1
+        if generation == GENERATIONS - 2:
+            self._long_lived_pending += max(young - unreachable, 0)  # Survivors moved to generation 2
+        elif generation == GENERATIONS - 1:
+            self._long_lived_total = max(self._long_lived_total + self._long_lived_pending + young - unreachable, 0)
+            self._long_lived_pending = 0
+
+    def end_frame(self):
+        """Attributes the pauses of the frame that just ended."""
+        if self._frame_pause_ns:
+            self.frames_with_pauses += 1
+            if self._frame_pause_ns > self.max_frame_pause_ns:
+                self.max_frame_pause_ns = self._frame_pause_ns
+                self.max_frame_pause_frame = self.frame_count
+            self._frame_pause_ns = 0
+        self.frame_count += 1
+        self._frame_start_ns = time.perf_counter_ns()
+
+    def uninstall(self):
+        """Unregisters the gc callback, restores the automatic collection and the pyray functions."""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self.schedule:
+            gc.enable()
+        if self.frozen_objects:
+            gc.unfreeze()
+        for name, function in self._originals.items():
+            setattr(rl, name, function)
+        self._originals.clear()
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the pause statistics per generation and per frame, and the longest pauses."""
+        longest_pauses = sorted(self.pauses, key=lambda pause: pause[2], reverse=True)[:TOP_PAUSES]
+        return {
+            "mode": {"schedule": self.schedule, "freeze": self.freeze},
+            "frames": self.frame_count,
+            "frozen_objects": self.frozen_objects,
+            "generations": [{
+                "collections": self.collections[generation],
+                "scheduled_collections": self.scheduled_collections[generation],
+                "total_pause_ms": self.total_pause_ns[generation] / 1e6,
+                "mean_pause_ms": (self.total_pause_ns[generation] / self.collections[generation] / 1e6
+                                  if self.collections[generation] else 0.0),
+                "max_pause_ms": self.max_pause_ns[generation] / 1e6,
+            } for generation in range(GENERATIONS)],
+            "frames_with_pauses": self.frames_with_pauses,
+            "max_frame_pause_ms": self.max_frame_pause_ns / 1e6,
+            "max_frame_pause_frame": self.max_frame_pause_frame,
+            "longest_pauses": [{"frame": frame, "generation": generation, "pause_ms": duration_ns / 1e6,
+                                "scheduled": scheduled}
+                               for frame, generation, duration_ns, scheduled in longest_pauses],
+        }
@@ -12,7 +12,7 @@ Finally, it prints a summary of the findings.
 import argparse
 from pathlib import Path
 import re
-from typing import Set
+from typing import FrozenSet, Set
 
 THIS_DIR: Path = Path(__file__).parent
 REPO_DIR: Path = THIS_DIR.parent
@@ -22,13 +22,43 @@ MIGRATION_ISSUES_FILENAME: str = "migration_issues.md"
 OUTPUT_WORKING_FILENAME: str = "examples_list_working.txt"
 OUTPUT_ISSUES_FILENAME: str = "examples_list_with_issues.txt"
 
+# Tools, and modules shared by the examples, not examples themselves (relative to THIS_DIR)
+NON_EXAMPLE_MODULES: FrozenSet[str] = frozenset({
+    # Tools
+    "alloc_tracker.py",
+    "asset_cache.py",
+    "async_loader.py",
+    "audio_callback_monitor.py",
+    "automation_replay.py",
+    "bench_examples.py",
+    "copyright_comment.py",
+    "example_harness.py",
+    "frame_profiler.py",
+    "gc_monitor.py",
+    "list_working_examples.py",
+    # Helper modules
+    "audio/audio_effects.py",
+    "audio/ring_buffer.py",
+    "audio/wavetable.py",
+    "core/automation_event_log.py",
+    "shaders/rlights.py",
+    "shaders/shader_uniforms.py",
+    "textures/gif_stream.py",
+    "textures/image_arrays.py",
+    "textures/image_convolution.py",
+    "textures/image_worker.py",
+    "textures/particle_pool.py",
+    "textures/sprite_batch.py",
+    "textures/tile_layer.py",
+})
+
 
 def scan_all_examples(examples_base_dir: Path, repo_dir: Path) -> Set[str]:
-    """Scans the directory for all .py example files."""
+    """Scans the directory for all .py example files, without the tools and helper modules."""
     all_examples_paths: Set[str] = set()
     if examples_base_dir.is_dir():
         for py_file in examples_base_dir.rglob("*.py"):
-            if py_file.resolve() != Path(__file__).resolve():  # Exclude self
+            if py_file.relative_to(examples_base_dir).as_posix() not in NON_EXAMPLE_MODULES:
                 all_examples_paths.add(py_file.relative_to(repo_dir).as_posix())
     else:
         print(f"WARNING: Examples directory {examples_base_dir} not found.")
@@ -11,11 +11,15 @@ This source has been converted from C raylib examples to Python.
 
 import pyray as rl
 import os
+import sys
 from pathlib import Path
 
 # Get the directory of the current script
 THIS_DIR = Path(__file__).resolve().parent
 
+sys.path.insert(0, str(THIS_DIR.parent/"shaders"))  # rlights module is shared by other examples
+from rlights import LIGHT_POINT, LightArray, create_light, stage_light_values
+
 # Define constants
 MAX_VOX_FILES = 4
 MAX_LIGHTS = 4
@@ -24,63 +28,6 @@ MAX_LIGHTS = 4
 GLSL_VERSION = 330
 # GLSL_VERSION = 100 # No shaders available for GLSL_VERSION 1.0; original code decide based on PLATFORM_DESKTOP
 
-# Light type enumeration
-LIGHT_DIRECTIONAL = 0
-LIGHT_POINT = 1
-
-# Light data class (replacement for C struct)
-class Light:
-    def __init__(self):
-        self.type = 0
-        self.enabled = False
-        self.position = rl.Vector3(0, 0, 0)
-        self.target = rl.Vector3(0, 0, 0)
-        self.color = rl.BLACK
-        # Shader locations/values
-        self.enabled_loc = -1
-        self.type_loc = -1
-        self.position_loc = -1
-        self.target_loc = -1
-        self.color_loc = -1
-
-# Function to create a light
-def create_light(type, position, target, color, shader):
-    light = Light()
-    light.type = type
-    light.enabled = True
-    light.position = position
-    light.target = target
-    light.color = color
-    
-    # Get shader locations for light properties
-    light.enabled_loc = rl.get_shader_location(shader, f"lights[{next_light}].enabled")
-    light.type_loc = rl.get_shader_location(shader, f"lights[{next_light}].type")
-    light.position_loc = rl.get_shader_location(shader, f"lights[{next_light}].position")
-    light.target_loc = rl.get_shader_location(shader, f"lights[{next_light}].target")
-    light.color_loc = rl.get_shader_location(shader, f"lights[{next_light}].color")
-    
-    # Set shader values for this light
-    update_light_values(shader, light)
-    
-    return light
-
-# Function to update light values
-def update_light_values(shader, light):
-    # Send to shader light enabled state and type
-    rl.set_shader_value(shader, light.enabled_loc, rl.ffi.new("int*", int(light.enabled)), rl.SHADER_UNIFORM_INT)
-    rl.set_shader_value(shader, light.type_loc, rl.ffi.new("int*", light.type), rl.SHADER_UNIFORM_INT)
-    
-    # Send to shader light position values
-    rl.set_shader_value(shader, light.position_loc, rl.ffi.addressof(light.position), rl.SHADER_UNIFORM_VEC3)
-    
-    # Send to shader light target position values
-    rl.set_shader_value(shader, light.target_loc, rl.ffi.addressof(light.target), rl.SHADER_UNIFORM_VEC3)
-    
-    # Send to shader light color values
-    # Assuming light.color is a tuple (r, g, b, a)
-    normalized_color = [light.color[0]/255.0, light.color[1]/255.0, light.color[2]/255.0, light.color[3]/255.0]
-    rl.set_shader_value(shader, light.color_loc, rl.ffi.new("float[]", normalized_color), rl.SHADER_UNIFORM_VEC4)
-
 #------------------------------------------------------------------------------------
 # Program main entry point
 #------------------------------------------------------------------------------------
@@ -153,16 +100,12 @@ if __name__ == "__main__":
             m.materials[j].shader = shader
 
     # Create lights
+    light_array = LightArray(shader)  # Light slots of the shader, shared by its lights
     lights = [None] * MAX_LIGHTS
-    next_light = 0  # Used by create_light function
-    
-    lights[0] = create_light(LIGHT_POINT, rl.Vector3(-20, 20, -20), rl.Vector3(0, 0, 0), rl.GRAY, shader)
-    next_light += 1
-    lights[1] = create_light(LIGHT_POINT, rl.Vector3(20, -20, 20), rl.Vector3(0, 0, 0), rl.GRAY, shader)
-    next_light += 1
-    lights[2] = create_light(LIGHT_POINT, rl.Vector3(-20, 20, 20), rl.Vector3(0, 0, 0), rl.GRAY, shader)
-    next_light += 1
-    lights[3] = create_light(LIGHT_POINT, rl.Vector3(20, -20, -20), rl.Vector3(0, 0, 0), rl.GRAY, shader)
+    lights[0] = create_light(LIGHT_POINT, rl.Vector3(-20, 20, -20), rl.Vector3(0, 0, 0), rl.GRAY, shader, light_array)
+    lights[1] = create_light(LIGHT_POINT, rl.Vector3(20, -20, 20), rl.Vector3(0, 0, 0), rl.GRAY, shader, light_array)
+    lights[2] = create_light(LIGHT_POINT, rl.Vector3(-20, 20, 20), rl.Vector3(0, 0, 0), rl.GRAY, shader, light_array)
+    lights[3] = create_light(LIGHT_POINT, rl.Vector3(20, -20, -20), rl.Vector3(0, 0, 0), rl.GRAY, shader, light_array)
 
     rl.set_target_fps(60)               # Set our game to run at 60 frames-per-second
 
@@ -205,7 +148,8 @@ if __name__ == "__main__":
 
         # Update light values (actually, only enable/disable them)
         for i in range(MAX_LIGHTS):
-            update_light_values(shader, lights[i])
+            stage_light_values(lights[i])
+        light_array.upload()  # Only the modified lights are sent, one call per light field
 
         #----------------------------------------------------------------------------------
         # Draw
@@ -15,20 +15,18 @@ out vec4 finalColor;
 
 // NOTE: Add your custom variables here
 
-#define     MAX_LIGHTS              4
+#define     MAX_LIGHTS              16
 #define     LIGHT_DIRECTIONAL       0
 #define     LIGHT_POINT             1
 
-struct Light {
-    int enabled;
-    int type;
-    vec3 position;
-    vec3 target;
-    vec4 color;
-};
-
 // Input lighting values
-uniform Light lights[MAX_LIGHTS];
+// NOTE: One array per light field (instead of an array of Light structs),
+// so each field of all the lights can be set with a single SetShaderValueV() call
+uniform int lightsEnabled[MAX_LIGHTS];
+uniform int lightsType[MAX_LIGHTS];
+uniform vec3 lightsPosition[MAX_LIGHTS];
+uniform vec3 lightsTarget[MAX_LIGHTS];
+uniform vec4 lightsColor[MAX_LIGHTS];
 uniform vec4 ambient;
 uniform vec3 viewPos;
 
@@ -45,22 +43,22 @@ void main()
 
     for (int i = 0; i < MAX_LIGHTS; i++)
     {
-        if (lights[i].enabled == 1)
+        if (lightsEnabled[i] == 1)
         {
             vec3 light = vec3(0.0);
 
-            if (lights[i].type == LIGHT_DIRECTIONAL)
+            if (lightsType[i] == LIGHT_DIRECTIONAL)
             {
-                light = -normalize(lights[i].target - lights[i].position);
+                light = -normalize(lightsTarget[i] - lightsPosition[i]);
             }
 
-            if (lights[i].type == LIGHT_POINT)
+            if (lightsType[i] == LIGHT_POINT)
             {
-                light = normalize(lights[i].position - fragPosition);
+                light = normalize(lightsPosition[i] - fragPosition);
             }
 
             float NdotL = max(dot(normal, light), 0.0);
-            lightDot += lights[i].color.rgb*NdotL;
+            lightDot += lightsColor[i].rgb*NdotL;
 
             float specCo = 0.0;
             if (NdotL > 0.0) specCo = pow(max(0.0, dot(viewD, reflect(-(light), normal))), 16.0); // 16 refers to shine
@@ -25,15 +25,25 @@
 
 import pyray as rl
 
-# Max dynamic lights supported by shader
+from shader_uniforms import Uniform
+
+# Lights supported by the provided shaders using the Light struct (lights[i].position...).
+# The capacity of a shader is queried when its LightArray is created.
 MAX_LIGHTS = 4
+MAX_QUERIED_LIGHTS = 256
 
 # Light types
 LIGHT_DIRECTIONAL = 0
 LIGHT_POINT = 1
 
-# Global variable to keep track of the number of lights
-lights_count = 0
+# Light fields, and their uniform type
+LIGHT_FIELDS = (
+    ("enabled", rl.SHADER_UNIFORM_INT),
+    ("type", rl.SHADER_UNIFORM_INT),
+    ("position", rl.SHADER_UNIFORM_VEC3),
+    ("target", rl.SHADER_UNIFORM_VEC3),
+    ("color", rl.SHADER_UNIFORM_VEC4),
+)
 
 class Light:
     def __init__(self):
@@ -44,59 +54,119 @@ class Light:
         self.color = rl.Color(0, 0, 0, 255)
         self.attenuation = 0.0
         
-        # Shader locations
-        self.enabled_loc = 0
-        self.type_loc = 0
-        self.position_loc = 0
-        self.target_loc = 0
-        self.color_loc = 0
-        self.attenuation_loc = 0
+        # Slot of the light in the LightArray of its shader (None if the shader has no slot left)
+        self.array = None
+        self.index = -1
 
-def create_light(light_type, position, target, color, shader):
-    """Create a light and get shader locations"""
-    global lights_count
+class LightArray:
+    """Values of the lights of a shader, one contiguous buffer per field.
     
-    light = Light()
+    Shaders declaring one uniform array per field (lightsEnabled[], lightsType[], lightsPosition[],
+    lightsTarget[], lightsColor[]) get each field of the modified lights uploaded with a single
+    rl.set_shader_value_v() call. Shaders declaring an array of Light structs (lights[].enabled...)
+    can only be set one light at a time, the modified lights are uploaded from the same buffers.
+    """
     
-    if lights_count < MAX_LIGHTS:
-        light.enabled = True
-        light.type = light_type
-        light.position = position
-        light.target = target
-        light.color = color
+    def __init__(self, shader):
+        self.shader = shader
+        self.field_arrays = rl.get_shader_location(shader, "lightsEnabled") != -1
+        if self.field_arrays:
+            def uniform_name(field, index):
+                return f"lights{field.capitalize()}[{index}]"
+        else:
+            def uniform_name(field, index):
+                return f"lights[{index}].{field}"
         
-        # NOTE: Lighting shader naming must be the provided ones
-        light.enabled_loc = rl.get_shader_location(shader, f"lights[{lights_count}].enabled")
-        light.type_loc = rl.get_shader_location(shader, f"lights[{lights_count}].type")
-        light.position_loc = rl.get_shader_location(shader, f"lights[{lights_count}].position")
-        light.target_loc = rl.get_shader_location(shader, f"lights[{lights_count}].target")
-        light.color_loc = rl.get_shader_location(shader, f"lights[{lights_count}].color")
+        # Locations of each field of each light, up to the size of the array declared by the shader
+        self.locations = {field: [] for field, _ in LIGHT_FIELDS}
+        for index in range(MAX_QUERIED_LIGHTS):
+            if rl.get_shader_location(shader, uniform_name("enabled", index)) == -1:
+                break
+            for field, _ in LIGHT_FIELDS:
+                self.locations[field].append(rl.get_shader_location(shader, uniform_name(field, index)))
+        self.capacity = len(self.locations["enabled"])
         
-        update_light_values(shader, light)
-        
-        lights_count += 1
+        self.fields = {field: Uniform(field, uniform_type, max(self.capacity, 1)) for field, uniform_type in LIGHT_FIELDS}
+        self.lights = []
+        # Range of lights [low, high[ modified since the last upload, per field
+        self.dirty_ranges = {field: None for field, _ in LIGHT_FIELDS}
     
-    return light
+    def add(self, light):
+        """Gives a slot to the light, returns False if the shader has no slot left"""
+        if len(self.lights) >= self.capacity:
+            return False
+        light.array = self
+        light.index = len(self.lights)
+        self.lights.append(light)
+        self.update(light)
+        return True
+    
+    def _set(self, field, index, changed):
+        if changed:
+            dirty_range = self.dirty_ranges[field]
+            self.dirty_ranges[field] = (index, index + 1) if dirty_range is None else (
+                min(dirty_range[0], index), max(dirty_range[1], index + 1))
+    
+    def update(self, light):
+        """Copies the light properties into the buffers, nothing is uploaded until upload()"""
+        index = light.index
+        fields = self.fields
+        self._set("enabled", index, fields["enabled"].set(int(light.enabled), index=index))
+        self._set("type", index, fields["type"].set(light.type, index=index))
+        self._set("position", index, fields["position"].set_vector3(light.position, index=index))
+        self._set("target", index, fields["target"].set_vector3(light.target, index=index))
+        self._set("color", index, fields["color"].set_color(light.color, index=index))
+    
+    def upload(self):
+        """Sends the modified lights to the shader"""
+        shader = self.shader
+        for field, uniform_type in LIGHT_FIELDS:
+            dirty_range = self.dirty_ranges[field]
+            if dirty_range is None:
+                continue
+            low, high = dirty_range
+            uniform = self.fields[field]
+            locations = self.locations[field]
+            if self.field_arrays:
+                # Elements low to high - 1 in one call, starting at the location of element low
+                rl.set_shader_value_v(shader, locations[low], uniform.buffer + low * uniform.components,
+                                      uniform_type, high - low)
+            else:
+                for index in range(low, high):
+                    rl.set_shader_value(shader, locations[index], uniform.buffer + index * uniform.components,
+                                        uniform_type)
+            uniform.dirty = False
+            self.dirty_ranges[field] = None
 
-def update_light_values(shader, light):
-    """Send light properties to shader"""
-    # Send to shader light enabled state and type
-    rl.set_shader_value(shader, light.enabled_loc, rl.ffi.new("int *", light.enabled), rl.SHADER_UNIFORM_INT)
-    rl.set_shader_value(shader, light.type_loc, rl.ffi.new("int *", light.type), rl.SHADER_UNIFORM_INT)
+def create_light(light_type, position, target, color, shader, light_array=None):
+    """Create a light, and send its properties to the shader.
     
-    # Send to shader light position values
-    position = rl.ffi.new("float[3]", [light.position.x, light.position.y, light.position.z])
-    rl.set_shader_value(shader, light.position_loc, position, rl.SHADER_UNIFORM_VEC3)
+    The lights of a shader share its LightArray: pass the same light_array (created with
+    LightArray(shader), owned by the caller) for each light of the shader. If None, the light
+    gets a new array, with the first slot of the shader.
+    """
+    light = Light()
+    light.enabled = True
+    light.type = light_type
+    light.position = position
+    light.target = target
+    light.color = color
     
-    # Send to shader light target position values
-    target = rl.ffi.new("float[3]", [light.target.x, light.target.y, light.target.z])
-    rl.set_shader_value(shader, light.target_loc, target, rl.SHADER_UNIFORM_VEC3)
+    # NOTE: Lighting shader naming must be the provided ones
+    if light_array is None:
+        light_array = LightArray(shader)
+    if light_array.add(light):
+        light_array.upload()
     
-    # Send to shader light color values
-    color = rl.ffi.new("float[4]", [
-        light.color[0]/255.0,
-        light.color[1]/255.0,
-        light.color[2]/255.0,
-        light.color[3]/255.0
-    ])
-    rl.set_shader_value(shader, light.color_loc, color, rl.SHADER_UNIFORM_VEC4)
+    return light
+
+def update_light_values(shader, light):
+    """Send light properties to shader"""
+    if light.array is not None:
+        light.array.update(light)
+        light.array.upload()
+
+def stage_light_values(light):
+    """Copy light properties for the next upload() of its LightArray, to send all the modified lights at once"""
+    if light.array is not None:
+        light.array.update(light)
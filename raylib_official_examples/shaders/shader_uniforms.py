@@ -0,0 +1,129 @@
+"""
+Typed shader uniforms, with persistent buffers and dirty upload, used by multiple examples.
+
+rl.set_shader_value() only accepts a pointer, so examples allocate a new rl.ffi.new("float[3]", ...)
+for each uniform at each frame, and upload every uniform even when its value did not change.
+UniformBlock declares the uniforms of a shader once:
+- shader locations are looked up once with rl.get_shader_location() (and again by rebind(),
+  after a shader reload),
+- each uniform owns one ffi buffer, its set_*() methods write the values in place and mark the
+  uniform dirty only if a value changed,
+- upload() sends the dirty uniforms only. begin_shader_mode() does upload() then
+  rl.begin_shader_mode(), for shaders used with rl.begin_shader_mode(); call upload() before
+  drawing for shaders used through a material.
+
+    uniforms = UniformBlock(shader, {"resolution": rl.SHADER_UNIFORM_VEC2, "time": rl.SHADER_UNIFORM_FLOAT})
+    uniforms["resolution"].set(screen_width, screen_height)
+    while not rl.window_should_close():
+        uniforms["time"].set(rl.get_time())
+        ...
+        uniforms.begin_shader_mode()  # Uploads "time", "resolution" was uploaded at the first frame
+        rl.draw_rectangle(0, 0, screen_width, screen_height, rl.WHITE)
+        rl.end_shader_mode()
+"""
+from typing import Dict, Tuple, Union
+
+import pyray as rl
+
+# Uniform type: (C type of the buffer, components per element)
+UNIFORM_LAYOUTS = {
+    rl.SHADER_UNIFORM_FLOAT: ("float", 1),
+    rl.SHADER_UNIFORM_VEC2: ("float", 2),
+    rl.SHADER_UNIFORM_VEC3: ("float", 3),
+    rl.SHADER_UNIFORM_VEC4: ("float", 4),
+    rl.SHADER_UNIFORM_INT: ("int", 1),
+    rl.SHADER_UNIFORM_IVEC2: ("int", 2),
+    rl.SHADER_UNIFORM_IVEC3: ("int", 3),
+    rl.SHADER_UNIFORM_IVEC4: ("int", 4),
+    rl.SHADER_UNIFORM_SAMPLER2D: ("int", 1),
+}
+
+
+class Uniform:
+    """One uniform (or uniform array of count elements), with its own value buffer."""
+
+    def __init__(self, name: str, uniform_type: int, count: int = 1):
+        ctype, self.components = UNIFORM_LAYOUTS[uniform_type]
+        self.name = name  # Name in the shader
+        self.uniform_type = uniform_type
+        self.count = count
+        self.location = -1
+        self.buffer = rl.ffi.new(f"{ctype}[{self.components * count}]")
+        self.dirty = True  # Uploaded at least once, even if the values stay 0
+
+    def set(self, *values, index: int = 0) -> bool:
+        """Sets the components of the element at index, e.g. set(x, y, z) for a vec3.
+        Returns True if a value changed."""
+        buffer = self.buffer
+        offset = index * self.components
+        changed = False
+        for i, value in enumerate(values):
+            # Compared after the conversion to the buffer C type, e.g. 0.1 is not exactly a float
+            previous = buffer[offset + i]
+            buffer[offset + i] = value
+            if buffer[offset + i] != previous:
+                changed = True
+        if changed:
+            self.dirty = True
+        return changed
+
+    def set_vector2(self, vector, index: int = 0) -> bool:
+        return self.set(vector.x, vector.y, index=index)
+
+    def set_vector3(self, vector, index: int = 0) -> bool:
+        return self.set(vector.x, vector.y, vector.z, index=index)
+
+    def set_color(self, color, index: int = 0) -> bool:
+        """Sets a vec4 (or vec3) to the normalized components of an rl.Color (or color tuple)."""
+        if not isinstance(color, tuple):
+            color = (color.r, color.g, color.b, color.a)
+        return self.set(*(color[i] / 255.0 for i in range(self.components)), index=index)
+
+    def upload(self, shader):
+        if self.location != -1:
+            if self.count == 1:
+                rl.set_shader_value(shader, self.location, self.buffer, self.uniform_type)
+            else:
+                rl.set_shader_value_v(shader, self.location, self.buffer, self.uniform_type, self.count)
+        self.dirty = False
+
+
+UniformDeclaration = Union[int, Tuple[int, int]]  # Uniform type, or (uniform type, array count)
+
+
+class UniformBlock:
+    """The declared uniforms of a shader, see the module docstring."""
+
+    def __init__(self, shader, declarations: Dict[str, UniformDeclaration], prefix: str = ""):
+        """prefix is prepended to the declared names to get the names in the shader, e.g. lights[0]."""
+        self.shader = shader
+        self.prefix = prefix
+        self.uniforms: Dict[str, Uniform] = {}
+        for name, declaration in declarations.items():
+            self.declare(name, *(declaration if isinstance(declaration, tuple) else (declaration,)))
+
+    def declare(self, name: str, uniform_type: int, count: int = 1) -> Uniform:
+        uniform = Uniform(self.prefix + name, uniform_type, count)
+        uniform.location = rl.get_shader_location(self.shader, uniform.name)
+        self.uniforms[name] = uniform
+        return uniform
+
+    def __getitem__(self, name: str) -> Uniform:
+        return self.uniforms[name]
+
+    def rebind(self, shader):
+        """Switches to a reloaded shader: looks the locations up again, and uploads every value at next upload()."""
+        self.shader = shader
+        for uniform in self.uniforms.values():
+            uniform.location = rl.get_shader_location(shader, uniform.name)
+            uniform.dirty = True
+
+    def upload(self):
+        """Uploads the uniforms whose values changed since the last upload."""
+        for uniform in self.uniforms.values():
+            if uniform.dirty:
+                uniform.upload(self.shader)
+
+    def begin_shader_mode(self):
+        self.upload()
+        rl.begin_shader_mode(self.shader)
@@ -17,7 +17,7 @@ from pathlib import Path
 THIS_DIR = Path(__file__).resolve().parent
 
 # Import our lights helper
-from rlights import create_light, update_light_values, MAX_LIGHTS, LIGHT_POINT
+from rlights import LightArray, create_light, stage_light_values, MAX_LIGHTS, LIGHT_POINT
 
 # Check if platform is web or desktop
 if rl.is_window_fullscreen():  # This is a simple way to check if we're on web (fullscreen by default)
@@ -58,11 +58,12 @@ def main():
     ambient_loc = rl.get_shader_location(shader, "ambient")
     values = rl.ffi.new("float[4]", [0.1, 0.1, 0.1, 1.0])
     rl.set_shader_value(shader, ambient_loc, values, rl.SHADER_UNIFORM_VEC4)    # Create lights
+    light_array = LightArray(shader)  # Light slots of the shader, shared by its lights
     lights = [None] * MAX_LIGHTS
-    lights[0] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, -2), rl.Vector3(0, 0, 0), rl.YELLOW, shader)
-    lights[1] = create_light(LIGHT_POINT, rl.Vector3(2, 1, 2), rl.Vector3(0, 0, 0), rl.RED, shader)
-    lights[2] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, 2), rl.Vector3(0, 0, 0), rl.GREEN, shader)
-    lights[3] = create_light(LIGHT_POINT, rl.Vector3(2, 1, -2), rl.Vector3(0, 0, 0), rl.BLUE, shader)
+    lights[0] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, -2), rl.Vector3(0, 0, 0), rl.YELLOW, shader, light_array)
+    lights[1] = create_light(LIGHT_POINT, rl.Vector3(2, 1, 2), rl.Vector3(0, 0, 0), rl.RED, shader, light_array)
+    lights[2] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, 2), rl.Vector3(0, 0, 0), rl.GREEN, shader, light_array)
+    lights[3] = create_light(LIGHT_POINT, rl.Vector3(2, 1, -2), rl.Vector3(0, 0, 0), rl.BLUE, shader, light_array)
 
     rl.set_target_fps(60)                   # Set our game to run at 60 frames-per-second
     #--------------------------------------------------------------------------------------
@@ -92,7 +93,8 @@ def main():
         
         # Update light values (actually, only enable/disable them)
         for i in range(MAX_LIGHTS):
-            update_light_values(shader, lights[i])
+            stage_light_values(lights[i])
+        light_array.upload()  # Only the modified lights are sent
         #----------------------------------------------------------------------------------
 
         # Draw
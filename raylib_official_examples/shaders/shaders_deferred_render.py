@@ -17,7 +17,7 @@ from dataclasses import dataclass
 THIS_DIR = Path(__file__).resolve().parent
 
 # Import the rlights module from local directory
-from rlights import Light, create_light, update_light_values, LIGHT_POINT
+from rlights import LightArray, create_light, stage_light_values, LIGHT_POINT
 
 # Check if platform is web or desktop
 if rl.is_window_fullscreen():  # This is a simple way to check if we're on web (fullscreen by default)
@@ -138,11 +138,12 @@ def main():
 
     # Create lights
     #--------------------------------------------------------------------------------------
+    light_array = LightArray(deferred_shader)  # Light slots of the shader, shared by its lights
     lights = [None] * MAX_LIGHTS
-    lights[0] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, -2), rl.Vector3(0, 0, 0), rl.YELLOW, deferred_shader)
-    lights[1] = create_light(LIGHT_POINT, rl.Vector3(2, 1, 2), rl.Vector3(0, 0, 0), rl.RED, deferred_shader)
-    lights[2] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, 2), rl.Vector3(0, 0, 0), rl.GREEN, deferred_shader)
-    lights[3] = create_light(LIGHT_POINT, rl.Vector3(2, 1, -2), rl.Vector3(0, 0, 0), rl.BLUE, deferred_shader)
+    lights[0] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, -2), rl.Vector3(0, 0, 0), rl.YELLOW, deferred_shader, light_array)
+    lights[1] = create_light(LIGHT_POINT, rl.Vector3(2, 1, 2), rl.Vector3(0, 0, 0), rl.RED, deferred_shader, light_array)
+    lights[2] = create_light(LIGHT_POINT, rl.Vector3(-2, 1, 2), rl.Vector3(0, 0, 0), rl.GREEN, deferred_shader, light_array)
+    lights[3] = create_light(LIGHT_POINT, rl.Vector3(2, 1, -2), rl.Vector3(0, 0, 0), rl.BLUE, deferred_shader, light_array)
 
     CUBE_SCALE = 0.25
     cube_positions = [rl.Vector3(0, 0, 0)] * MAX_CUBES
@@ -196,7 +197,8 @@ def main():
 
         # Update light values (actually, only enable/disable them)
         for i in range(MAX_LIGHTS):
-            update_light_values(deferred_shader, lights[i])
+            stage_light_values(lights[i])
+        light_array.upload()  # Only the modified lights are sent
         #----------------------------------------------------------------------------------
 
         # Draw
@@ -15,6 +15,8 @@ import time
 from pathlib import Path
 THIS_DIR = Path(__file__).resolve().parent
 
+from shader_uniforms import UniformBlock
+
 # Check if platform is web or desktop
 if rl.is_window_fullscreen():  # This is a simple way to check if we're on web (fullscreen by default)
     GLSL_VERSION = 100
@@ -36,13 +38,13 @@ def main():
     # NOTE: Defining 0 (NULL) for vertex shader forces usage of internal default vertex shader
     shader = rl.load_shader("", frag_shader_file_name)
 
-    # Get shader locations for required uniforms
-    resolution_loc = rl.get_shader_location(shader, "resolution")
-    mouse_loc = rl.get_shader_location(shader, "mouse")
-    time_loc = rl.get_shader_location(shader, "time")
-
-    resolution = rl.ffi.new("float[2]", [screen_width, screen_height])
-    rl.set_shader_value(shader, resolution_loc, resolution, rl.SHADER_UNIFORM_VEC2)
+    # Get shader locations for required uniforms, their values are kept in persistent buffers
+    uniforms = UniformBlock(shader, {
+        "resolution": rl.SHADER_UNIFORM_VEC2,
+        "mouse": rl.SHADER_UNIFORM_VEC2,
+        "time": rl.SHADER_UNIFORM_FLOAT,
+    })
+    uniforms["resolution"].set(screen_width, screen_height)
 
     total_time = 0.0
     shader_auto_reloading = False
@@ -55,12 +57,10 @@ def main():
         # Update
         #----------------------------------------------------------------------------------
         total_time += rl.get_frame_time()
-        mouse = rl.get_mouse_position()
-        mouse_pos = rl.ffi.new("float[2]", [mouse.x, mouse.y])
 
-        # Set shader required uniform values
-        rl.set_shader_value(shader, time_loc, rl.ffi.new("float *", total_time), rl.SHADER_UNIFORM_FLOAT)
-        rl.set_shader_value(shader, mouse_loc, mouse_pos, rl.SHADER_UNIFORM_VEC2)
+        # Set shader required uniform values (uploaded by uniforms.begin_shader_mode() if changed)
+        uniforms["time"].set(total_time)
+        uniforms["mouse"].set_vector2(rl.get_mouse_position())
 
         # Hot shader reloading
         if shader_auto_reloading or (rl.is_mouse_button_pressed(rl.MOUSE_BUTTON_LEFT)):
@@ -75,13 +75,8 @@ def main():
                     rl.unload_shader(shader)
                     shader = updated_shader
 
-                    # Get shader locations for required uniforms
-                    resolution_loc = rl.get_shader_location(shader, "resolution")
-                    mouse_loc = rl.get_shader_location(shader, "mouse")
-                    time_loc = rl.get_shader_location(shader, "time")
-
-                    # Reset required uniforms
-                    rl.set_shader_value(shader, resolution_loc, resolution, rl.SHADER_UNIFORM_VEC2)
+                    # Get shader locations for required uniforms, and reset their values
+                    uniforms.rebind(shader)
 
                 frag_shader_file_mod_time = current_frag_shader_mod_time
 
@@ -96,7 +91,7 @@ def main():
         rl.clear_background(rl.RAYWHITE)
 
         # We only draw a white full-screen rectangle, frame is generated in shader
-        rl.begin_shader_mode(shader)
+        uniforms.begin_shader_mode()
         rl.draw_rectangle(0, 0, screen_width, screen_height, rl.WHITE)
         rl.end_shader_mode()
 
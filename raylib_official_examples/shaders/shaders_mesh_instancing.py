@@ -13,6 +13,7 @@ import pyray as rl
 import random
 from pathlib import Path
 from rlights import create_light
+from shader_uniforms import UniformBlock
 
 THIS_DIR = Path(__file__).resolve().parent
 
@@ -75,10 +76,11 @@ def main():
     shader.locs[rl.SHADER_LOC_MATRIX_MVP] = rl.get_shader_location(shader, "mvp")
     shader.locs[rl.SHADER_LOC_VECTOR_VIEW] = rl.get_shader_location(shader, "viewPos")
 
+    # Shader uniforms set by the example, their values are kept in persistent buffers
+    uniforms = UniformBlock(shader, {"viewPos": rl.SHADER_UNIFORM_VEC3, "ambient": rl.SHADER_UNIFORM_VEC4})
+
     # Set shader value: ambient light level
-    ambient_loc = rl.get_shader_location(shader, "ambient")
-    ambient_value = rl.ffi.new("float[4]", [0.2, 0.2, 0.2, 1.0])
-    rl.set_shader_value(shader, ambient_loc, ambient_value, rl.SHADER_UNIFORM_VEC4)
+    uniforms["ambient"].set(0.2, 0.2, 0.2, 1.0)
 
     # Create one light
     create_light(rl.LIGHT_DIRECTIONAL, rl.Vector3(50.0, 50.0, 0.0), rl.Vector3(0, 0, 0), rl.WHITE, shader)
@@ -105,8 +107,9 @@ def main():
         rl.update_camera(rl.byref(camera), rl.CAMERA_ORBITAL)
 
         # Update the light shader with the camera view position
-        camera_pos = rl.ffi.new("float[3]", [camera.position.x, camera.position.y, camera.position.z])
-        rl.set_shader_value(shader, shader.locs[rl.SHADER_LOC_VECTOR_VIEW], camera_pos, rl.SHADER_UNIFORM_VEC3)
+        # NOTE: Uploaded only if the camera moved
+        uniforms["viewPos"].set_vector3(camera.position)
+        uniforms.upload()
         #----------------------------------------------------------------------------------
 
         # Draw
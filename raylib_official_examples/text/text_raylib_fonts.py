@@ -8,12 +8,18 @@ BSD-like license that allows static linking with closed source software
 Copyright (c) 2017-2025 Ramon Santamaria (@raysan5)
 
 This source has been converted from C raylib examples to Python.
+
+Fonts are loaded through an AssetCache (see asset_cache.py), which returns the already loaded
+font when the same file is requested again.
 """
 
 import pyray as rl
 from pathlib import Path
+import sys
 
 THIS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THIS_DIR.parent))  # asset_cache module is shared by other examples
+from asset_cache import AssetCache
 
 MAX_FONTS = 8
 
@@ -26,15 +32,16 @@ def main():
 
     # NOTE: Textures MUST be loaded after Window initialization (OpenGL context is required)
     fonts = [None] * MAX_FONTS
+    asset_cache = AssetCache()
 
-    fonts[0] = rl.load_font(str(THIS_DIR/"resources/fonts/alagard.png"))
-    fonts[1] = rl.load_font(str(THIS_DIR/"resources/fonts/pixelplay.png"))
-    fonts[2] = rl.load_font(str(THIS_DIR/"resources/fonts/mecha.png"))
-    fonts[3] = rl.load_font(str(THIS_DIR/"resources/fonts/setback.png"))
-    fonts[4] = rl.load_font(str(THIS_DIR/"resources/fonts/romulus.png"))
-    fonts[5] = rl.load_font(str(THIS_DIR/"resources/fonts/pixantiqua.png"))
-    fonts[6] = rl.load_font(str(THIS_DIR/"resources/fonts/alpha_beta.png"))
-    fonts[7] = rl.load_font(str(THIS_DIR/"resources/fonts/jupiter_crash.png"))
+    fonts[0] = asset_cache.font(str(THIS_DIR/"resources/fonts/alagard.png"))
+    fonts[1] = asset_cache.font(str(THIS_DIR/"resources/fonts/pixelplay.png"))
+    fonts[2] = asset_cache.font(str(THIS_DIR/"resources/fonts/mecha.png"))
+    fonts[3] = asset_cache.font(str(THIS_DIR/"resources/fonts/setback.png"))
+    fonts[4] = asset_cache.font(str(THIS_DIR/"resources/fonts/romulus.png"))
+    fonts[5] = asset_cache.font(str(THIS_DIR/"resources/fonts/pixantiqua.png"))
+    fonts[6] = asset_cache.font(str(THIS_DIR/"resources/fonts/alpha_beta.png"))
+    fonts[7] = asset_cache.font(str(THIS_DIR/"resources/fonts/jupiter_crash.png"))
 
     messages = [
         "ALAGARD FONT designed by Hewett Tsoi",
@@ -84,8 +91,7 @@ def main():
 
     # De-Initialization
     # Fonts unloading
-    for i in range(MAX_FONTS):
-        rl.unload_font(fonts[i])
+    asset_cache.unload_all()
 
     rl.close_window()  # Close window and OpenGL context
 
@@ -0,0 +1,340 @@
+"""
+Streaming GIF playback: frames decoded one at a time on a worker thread, into a ring of buffers.
+
+rl.load_image_anim() decodes all the frames of a GIF at once, into one image holding
+width*height*4 bytes per frame, so long animations use hundreds of megabytes of RAM just to be
+played. GifStream decodes the frames when they are needed instead:
+- GifDecoder decodes one frame at a time (LZW, palettes, transparency, disposal and interlacing),
+  reading the file through mmap, and keeps only the composited canvas (plus the previous one,
+  for frames restoring it),
+- a worker thread decodes the next frames into a ring of RING_FRAMES preallocated RGBA buffers,
+  waiting while all of them hold frames not played yet,
+- the main thread takes the frames in order with update_texture(), which uploads the next
+  decoded frame into an existing texture with rl.update_texture(), and returns its buffer to
+  the worker,
+so the memory used is a few frames, whatever the animation length.
+
+    stream = GifStream(str(THIS_DIR/"resources/scarfy_run.gif"))
+    texture = stream.load_texture()  # RGBA texture of the animation size, showing the first frame
+    while not rl.window_should_close():
+        if time_for_next_frame:
+            stream.update_texture(texture)
+        ...
+    stream.close()
+
+NOTE: The LZW decompression is done in Python (about 2 ms per frame of scarfy_run.gif, 128x128),
+it is fast enough for small and medium animations, frames of large animations may be decoded
+slower than they are played: update_texture() then keeps the current frame until the next is ready.
+"""
+import mmap
+import queue
+import threading
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+import pyray as rl
+
+RING_FRAMES = 3  # Frame buffers shared by the worker and the main thread
+MAX_LZW_CODE_SIZE = 12
+DISPOSE_BACKGROUND = 2  # Frame area cleared to transparent after the frame
+DISPOSE_PREVIOUS = 3  # Canvas restored to its state before the frame
+INTERLACE_PASSES = ((0, 8), (4, 8), (2, 4), (1, 2))  # (first row, row step) of each pass
+
+
+def lzw_decode(data: bytes, min_code_size: int) -> bytearray:
+    """Returns the color indices of GIF LZW data (sub-blocks already joined)."""
+    clear_code = 1 << min_code_size
+    end_code = clear_code + 1
+    max_table_size = 1 << MAX_LZW_CODE_SIZE
+    code_size = min_code_size + 1
+    code_mask = (1 << code_size) - 1
+    table: List[bytes] = [bytes((i,)) for i in range(clear_code)] + [b"", b""]
+    table_size = len(table)  # len(table), kept in a local for speed
+    out = bytearray()
+    previous = None
+    value = 0  # Bits not consumed yet, least significant first
+    bits = 0
+    for byte in data:
+        value |= byte << bits
+        bits += 8
+        while bits >= code_size:
+            code = value & code_mask
+            value >>= code_size
+            bits -= code_size
+            if code < table_size:
+                if code == clear_code:
+                    del table[end_code + 1:]
+                    table_size = end_code + 1
+                    code_size = min_code_size + 1
+                    code_mask = (1 << code_size) - 1
+                    previous = None
+                    continue
+                if code == end_code:
+                    return out
+                entry = table[code]
+                if previous is not None and table_size < max_table_size:
+                    table.append(previous + entry[:1])
+                    table_size += 1
+            elif previous is not None and code == table_size:
+                entry = previous + previous[:1]
+                table.append(entry)
+                table_size += 1
+            else:
+                return out  # Corrupted data
+            out += entry
+            previous = entry
+            if table_size > code_mask and code_size < MAX_LZW_CODE_SIZE:
+                code_size += 1
+                code_mask = (1 << code_size) - 1
+    return out
+
+
+def _palette(data, offset: int, size: int) -> np.ndarray:
+    """Returns a (256, 4) RGBA palette from a GIF color table of size entries."""
+    palette = np.zeros((256, 4), np.uint8)
+    palette[:size, :3] = np.frombuffer(data[offset:offset + size * 3], np.uint8).reshape(size, 3)
+    palette[:size, 3] = 255
+    return palette
+
+
+class GifDecoder:
+    """Decodes the frames of a GIF file in order, as composited (height, width, 4) RGBA canvases."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        data = self._data
+        if data[:3] != b"GIF":
+            raise ValueError(f"{path} is not a GIF file")
+        self.width = int.from_bytes(data[6:8], "little")
+        self.height = int.from_bytes(data[8:10], "little")
+        flags = data[10]
+        self._first_block = 13
+        self._global_palette = None
+        if flags & 0x80:
+            size = 2 << (flags & 0x07)
+            self._global_palette = _palette(data, 13, size)
+            self._first_block += size * 3
+        self.canvas = np.zeros((self.height, self.width, 4), np.uint8)
+        self._previous_canvas: Optional[np.ndarray] = None
+        self.rewind()
+
+    def rewind(self):
+        """Restarts from the first frame, with a transparent canvas."""
+        self._position = self._first_block
+        self._pending_dispose: Optional[Tuple[int, int, int, int, int]] = None  # (method, x, y, w, h)
+        self.canvas[...] = 0
+
+    def _skip_sub_blocks(self, position: int) -> int:
+        data = self._data
+        while data[position]:
+            position += data[position] + 1
+        return position + 1
+
+    def _read_sub_blocks(self, position: int) -> Tuple[bytes, int]:
+        data = self._data
+        chunks = []
+        while data[position]:
+            size = data[position]
+            chunks.append(data[position + 1:position + 1 + size])
+            position += size + 1
+        return b"".join(chunks), position + 1
+
+    def count_frames(self) -> int:
+        """Counts the frames, by scanning the blocks without decoding them."""
+        data = self._data
+        position = self._first_block
+        count = 0
+        while position < len(data):
+            block = data[position]
+            if block == 0x21:  # Extension
+                position = self._skip_sub_blocks(position + 2)
+            elif block == 0x2C:  # Image descriptor
+                flags = data[position + 9]
+                position += 10
+                if flags & 0x80:
+                    position += (2 << (flags & 0x07)) * 3
+                position = self._skip_sub_blocks(position + 1)
+                count += 1
+            else:  # Trailer (0x3B) or unexpected data
+                break
+        return count
+
+    def _dispose(self):
+        if self._pending_dispose is None:
+            return
+        method, x, y, width, height = self._pending_dispose
+        if method == DISPOSE_BACKGROUND:
+            self.canvas[y:y + height, x:x + width] = 0
+        elif method == DISPOSE_PREVIOUS and self._previous_canvas is not None:
+            self.canvas[...] = self._previous_canvas
+        self._pending_dispose = None
+
+    def read_frame(self, out: Optional[np.ndarray] = None) -> Optional[int]:
+        """Decodes the next frame into canvas, and copies it into out if given.
+        Returns the frame delay in 1/100 s, or None after the last frame."""
+        data = self._data
+        position = self._position
+        dispose_method = 0
+        delay = 0
+        transparent_index = -1
+        while position < len(data):
+            block = data[position]
+            if block == 0x21:  # Extension
+                if data[position + 1] == 0xF9:  # Graphic control extension
+                    flags = data[position + 3]
+                    dispose_method = (flags >> 2) & 0x07
+                    delay = int.from_bytes(data[position + 4:position + 6], "little")
+                    if flags & 0x01:
+                        transparent_index = data[position + 6]
+                position = self._skip_sub_blocks(position + 2)
+            elif block == 0x2C:  # Image descriptor
+                break
+            else:  # Trailer (0x3B) or unexpected data
+                self._position = position
+                return None
+        else:
+            self._position = position
+            return None
+
+        x = int.from_bytes(data[position + 1:position + 3], "little")
+        y = int.from_bytes(data[position + 3:position + 5], "little")
+        width = int.from_bytes(data[position + 5:position + 7], "little")
+        height = int.from_bytes(data[position + 7:position + 9], "little")
+        flags = data[position + 9]
+        position += 10
+        palette = self._global_palette
+        if flags & 0x80:
+            size = 2 << (flags & 0x07)
+            palette = _palette(data, position, size)
+            position += size * 3
+        if palette is None:
+            palette = np.zeros((256, 4), np.uint8)
+        min_code_size = data[position]
+        lzw_data, position = self._read_sub_blocks(position + 1)
+        self._position = position
+
+        indices = np.zeros(width * height, np.uint8)
+        decoded = lzw_decode(lzw_data, min_code_size)[:width * height]
+        indices[:len(decoded)] = np.frombuffer(decoded, np.uint8)
+        indices = indices.reshape(height, width)
+        if flags & 0x40:  # Interlaced: rows are stored by pass
+            rows = np.concatenate([np.arange(first, height, step) for first, step in INTERLACE_PASSES])
+            deinterlaced = np.empty_like(indices)
+            deinterlaced[rows] = indices
+            indices = deinterlaced
+
+        self._dispose()  # Of the previous frame
+        if dispose_method == DISPOSE_PREVIOUS:
+            if self._previous_canvas is None:
+                self._previous_canvas = np.empty_like(self.canvas)
+            self._previous_canvas[...] = self.canvas
+        # Frame area clipped to the canvas
+        width = min(width, self.width - x)
+        height = min(height, self.height - y)
+        if width > 0 and height > 0:
+            indices = indices[:height, :width]
+            area = self.canvas[y:y + height, x:x + width]
+            if transparent_index >= 0:
+                opaque = indices != transparent_index
+                area[opaque] = palette[indices[opaque]]
+            else:
+                area[...] = palette[indices]
+        self._pending_dispose = (dispose_method, x, y, max(width, 0), max(height, 0))
+
+        if out is not None:
+            out[...] = self.canvas
+        return delay
+
+    def close(self):
+        self._data.close()
+
+
+class GifStream:
+    """Plays a GIF through a ring of frame buffers filled by a worker thread, see the module docstring."""
+
+    def __init__(self, path: str, ring_frames: int = RING_FRAMES, loop: bool = True):
+        self.decoder = GifDecoder(path)
+        self.width = self.decoder.width
+        self.height = self.decoder.height
+        self.frame_count = self.decoder.count_frames()
+        self.loop = loop
+        self.frames = np.zeros((ring_frames, self.height, self.width, 4), np.uint8)
+        self._frames_c = [rl.ffi.from_buffer(frame) for frame in self.frames]
+        self._free: "queue.Queue[int]" = queue.Queue()  # Buffers the worker can decode into
+        # (buffer, frame, delay), None at end, or the exception that stopped the worker
+        self._ready: "queue.Queue[Union[Tuple[int, int, int], Exception, None]]" = queue.Queue()
+        for i in range(ring_frames):
+            self._free.put(i)
+        self.current_frame = -1  # Index of the last frame given to update_texture()
+        self.current_delay = 0  # Of the last frame given to update_texture(), in 1/100 s
+        self.finished = False  # Not looping, and all the frames were played
+        self._stop = False
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    @property
+    def memory_size(self) -> int:
+        """Bytes used by the frame buffers and the decoder canvases."""
+        canvases = 1 if self.decoder._previous_canvas is None else 2
+        return self.frames.nbytes + canvases * self.decoder.canvas.nbytes
+
+    def _worker(self):
+        try:
+            self._decode_frames()
+        except Exception as error:  # Raised by update_texture(), instead of leaving the main thread waiting
+            self._ready.put(error)
+
+    def _decode_frames(self):
+        frame = 0
+        while True:
+            buffer = self._free.get()
+            if self._stop:
+                return
+            delay = self.decoder.read_frame(self.frames[buffer])
+            if delay is None:
+                if not self.loop or frame == 0:  # Not looping, or no frame at all
+                    self._ready.put(None)
+                    return
+                self.decoder.rewind()
+                frame = 0
+                delay = self.decoder.read_frame(self.frames[buffer])
+            self._ready.put((buffer, frame, delay))
+            frame += 1
+
+    def update_texture(self, texture, block: bool = False) -> bool:
+        """Uploads the next frame into texture (RGBA, animation size), if it is decoded (or waits for it
+        if block is True). Returns False if no frame was uploaded: the texture keeps the current frame.
+        Raises the exception that stopped the worker (e.g. a corrupted file)."""
+        if self.finished:
+            return False
+        try:
+            ready = self._ready.get(block)
+        except queue.Empty:
+            return False
+        if ready is None:
+            self.finished = True
+            return False
+        if isinstance(ready, Exception):
+            self.finished = True
+            raise ready
+        buffer, self.current_frame, self.current_delay = ready
+        rl.update_texture(texture, self._frames_c[buffer])
+        self._free.put(buffer)
+        return True
+
+    def load_texture(self):
+        """Returns a new RGBA texture of the animation size, showing the first frame."""
+        image = rl.gen_image_color(self.width, self.height, rl.BLANK)
+        texture = rl.load_texture_from_image(image)
+        rl.unload_image(image)
+        self.update_texture(texture, block=True)
+        return texture
+
+    def close(self):
+        """Stops the worker and closes the file."""
+        self._stop = True
+        self._free.put(-1)  # Wakes the worker up if it waits for a buffer
+        self._thread.join()
+        self.decoder.close()
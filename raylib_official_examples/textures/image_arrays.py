@@ -0,0 +1,81 @@
+"""
+Zero-copy NumPy views of rl.Image pixel data, used by multiple examples.
+
+Filling or filtering an rl.Image pixel by pixel from Python (image.data cast to Color *, or
+rl.image_draw_pixel()) costs seconds for a few hundred thousand pixels. These helpers share
+the pixel memory between raylib and NumPy, so images can be generated and processed with
+vectorized NumPy operations:
+- image_array(image) returns a writable NumPy array viewing image.data (rl.ffi.buffer(), no copy),
+  with the dtype and shape of the pixel format: (height, width, channels), or (height, width) for
+  single channel and packed 16 bits formats (R5G6B5, R5G5B5A1, R4G4B4A4 are uint16 values),
+- image_from_array(array) returns an rl.Image whose data points to the array memory (no copy),
+  the pixel format being deduced from the dtype and the number of channels.
+
+    image = rl.load_image(str(THIS_DIR/"resources/cat.png"))
+    rl.image_format(image, rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8)
+    pixels = image_array(image)  # (height, width, 4) uint8 view
+    pixels[..., :3] = 255 - pixels[..., :3]  # Negative, in place
+
+The views are only valid while the memory they share is: an image_array() view must not be used
+after the image is unloaded or modified by an rl.image_*() function that reallocates its data
+(rl.image_format(), rl.image_resize(), rl.image_crop()...), and an image_from_array() image must
+not be unloaded with rl.unload_image() (its memory belongs to NumPy), the array must be kept alive
+as long as the image is used.
+"""
+from typing import Dict, Tuple
+
+import numpy as np
+
+import pyray as rl
+
+# Pixel format: (NumPy dtype, channels)
+PIXEL_LAYOUTS: Dict[int, Tuple[np.dtype, int]] = {
+    rl.PIXELFORMAT_UNCOMPRESSED_GRAYSCALE: (np.dtype(np.uint8), 1),
+    rl.PIXELFORMAT_UNCOMPRESSED_GRAY_ALPHA: (np.dtype(np.uint8), 2),
+    rl.PIXELFORMAT_UNCOMPRESSED_R5G6B5: (np.dtype(np.uint16), 1),
+    rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8: (np.dtype(np.uint8), 3),
+    rl.PIXELFORMAT_UNCOMPRESSED_R5G5B5A1: (np.dtype(np.uint16), 1),
+    rl.PIXELFORMAT_UNCOMPRESSED_R4G4B4A4: (np.dtype(np.uint16), 1),
+    rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8: (np.dtype(np.uint8), 4),
+    rl.PIXELFORMAT_UNCOMPRESSED_R32: (np.dtype(np.float32), 1),
+    rl.PIXELFORMAT_UNCOMPRESSED_R32G32B32: (np.dtype(np.float32), 3),
+    rl.PIXELFORMAT_UNCOMPRESSED_R32G32B32A32: (np.dtype(np.float32), 4),
+    rl.PIXELFORMAT_UNCOMPRESSED_R16: (np.dtype(np.float16), 1),
+    rl.PIXELFORMAT_UNCOMPRESSED_R16G16B16: (np.dtype(np.float16), 3),
+    rl.PIXELFORMAT_UNCOMPRESSED_R16G16B16A16: (np.dtype(np.float16), 4),
+}
+
+# (dtype, channels): pixel format, used to deduce the format of arrays
+# NOTE: uint16 arrays are ambiguous (3 packed formats), their format must be given
+ARRAY_FORMATS: Dict[Tuple[np.dtype, int], int] = {
+    layout: pixel_format for pixel_format, layout in PIXEL_LAYOUTS.items() if layout[0] != np.uint16
+}
+
+
+def image_array(image) -> np.ndarray:
+    """Returns a writable array viewing the pixels of the first mipmap level of an image."""
+    if image.format not in PIXEL_LAYOUTS:
+        raise ValueError(f"Pixel format {image.format} has no array layout (compressed format)")
+    if image.data == rl.ffi.NULL:
+        raise ValueError("Image has no data")
+    dtype, channels = PIXEL_LAYOUTS[image.format]
+    size = rl.get_pixel_data_size(image.width, image.height, image.format)
+    array = np.frombuffer(rl.ffi.buffer(image.data, size), dtype)
+    return array.reshape((image.height, image.width, channels) if channels > 1 else (image.height, image.width))
+
+
+def image_from_array(array: np.ndarray, pixel_format: int = 0):
+    """Returns an rl.Image using the memory of a C-contiguous (height, width[, channels]) array.
+
+    pixel_format is deduced from the array dtype and channels if not given.
+    """
+    if not array.flags.c_contiguous:
+        raise ValueError("Array must be C-contiguous, to be shared without copy")
+    channels = array.shape[2] if array.ndim == 3 else 1
+    if not pixel_format:
+        pixel_format = ARRAY_FORMATS.get((array.dtype, channels), 0)
+        if not pixel_format:
+            raise ValueError(f"No pixel format for {channels} channel(s) of {array.dtype}, give pixel_format")
+    if PIXEL_LAYOUTS[pixel_format] != (array.dtype, channels):
+        raise ValueError(f"Array of {channels} channel(s) of {array.dtype} doesn't match pixel format {pixel_format}")
+    return rl.Image(rl.ffi.cast("void *", rl.ffi.from_buffer(array)), array.shape[1], array.shape[0], 1, pixel_format)
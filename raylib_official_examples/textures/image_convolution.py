@@ -0,0 +1,190 @@
+"""
+Image convolution with NumPy: separable kernels in two 1D passes, large kernels with FFT.
+
+rl.image_kernel_convolution() costs k*k multiplications per pixel and channel, so a wide blur
+is usually obtained by applying a small kernel several times, which is slow on large images.
+image_convolution() gives the same results, with:
+- kernels up to DIRECT_MAX_TAPS coefficients: one vectorized pass per coefficient,
+- larger separable kernels (rank 1, e.g. Gaussian or box blur): one horizontal and one vertical
+  1D pass, k + k multiplications per pixel,
+- other large kernels: FFT convolution, whose cost doesn't depend on the kernel size.
+
+The direct method computes the same float32 products and sums as raylib, in the same order, its
+results are identical. The separable and FFT methods round differently (factored coefficients,
+other summation order, FFT errors), results landing next to an integer boundary are then truncated
+to the other side: they differ by 1 in some of the values (up to 40% of the cat image values
+with the 3x3 kernels of textures_image_kernel.py), never more.
+
+The pixels are processed on a NumPy view of the image data (see image_arrays.py), and the
+raylib semantics are reproduced: the kernel is correlated (not flipped), its center is at
+(height//2, width//2), the color results are clamped to [0, 255] and truncated, and pixels are
+addressed by their linear index, so coefficients out of the left or right border read the end of
+the previous row or the start of the next one, and those out of the top or bottom border read 0.
+NOTE: raylib doesn't clamp the alpha results, they wrap around: alpha values above 1.0 (kernels
+summing above 1.0) overflow to low values, and negative ones to high values. This is reproduced.
+
+    image_convolution(image, kernel)  # 3x3 kernel: exact, one vectorized pass per coefficient
+
+repeat_kernel(kernel, times) is the kernel of times passes merged in one (e.g. 13x13 for a 3x3
+kernel applied 6 times). It is not equivalent to times calls of rl.image_kernel_convolution(): each
+raylib pass truncates its results to bytes (up to -1 per pass, a darker image after several
+passes), and the pixels read out of the borders are the unfiltered ones (or 0), not the results of
+the previous pass. Use it when an approximation of the repeated filter is enough.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+import pyray as rl
+
+from image_arrays import image_array
+
+DIRECT_MAX_TAPS = 49  # Non separable kernels with more coefficients use FFT convolution
+SEPARABLE_TOLERANCE = 1e-6  # Relative size of the second singular value of a separable kernel
+METHODS = ("auto", "direct", "separable", "fft")
+
+
+def as_kernel(kernel) -> np.ndarray:
+    """Returns a 2D float64 kernel, from a 2D array, or a flat square kernel as used by raylib."""
+    kernel = np.asarray(kernel, np.float64)
+    if kernel.ndim == 1:
+        size = int(round(np.sqrt(kernel.size)))
+        if size * size != kernel.size:
+            raise ValueError("Flat kernels must be square")
+        kernel = kernel.reshape(size, size)
+    return kernel
+
+
+def separate_kernel(kernel: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Returns (column, row) such that kernel = outer(column, row), or None if the kernel is not separable."""
+    u, s, vt = np.linalg.svd(kernel)
+    if s[0] == 0.0 or (len(s) > 1 and s[1] > SEPARABLE_TOLERANCE * s[0]):
+        return None
+    scale = np.sqrt(s[0])
+    return u[:, 0] * scale, vt[0] * scale
+
+
+def repeat_kernel(kernel, times: int) -> np.ndarray:
+    """Returns the kernel equivalent to applying kernel times in a row."""
+    kernel = as_kernel(kernel)
+    result = kernel
+    for _ in range(times - 1):
+        result = _convolve_full(result, kernel)
+    return result
+
+
+def _convolve_full(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Full 2D convolution of two small kernels."""
+    result = np.zeros((a.shape[0] + b.shape[0] - 1, a.shape[1] + b.shape[1] - 1))
+    for (i, j), value in np.ndenumerate(b):
+        result[i:i + a.shape[0], j:j + a.shape[1]] += value * a
+    return result
+
+
+def _shift_add(out: np.ndarray, source: np.ndarray, offset: int, weight: float):
+    """out[i] += weight*source[i + offset], source being 0 outside of its range."""
+    n = len(source)
+    if 0 <= offset < n:
+        out[:n - offset] += weight * source[offset:]
+    elif 0 < -offset < n:
+        out[-offset:] += weight * source[:n + offset]
+
+
+def _correlate_direct(pixels: np.ndarray, kernel: np.ndarray, width: int) -> np.ndarray:
+    out = np.zeros_like(pixels)
+    center_y, center_x = kernel.shape[0] // 2, kernel.shape[1] // 2
+    for (i, j), weight in np.ndenumerate(kernel):
+        if weight != 0.0:
+            _shift_add(out, pixels, (i - center_y) * width + j - center_x, weight)
+    return out
+
+
+def _correlate_separable(pixels: np.ndarray, column: np.ndarray, row: np.ndarray, width: int) -> np.ndarray:
+    # The horizontal pass also covers the rows above and below the image, whose first and last
+    # pixels read the image through the linear index wrapping (raylib reads them directly)
+    above = (len(column) // 2) * width
+    below = (len(column) - 1 - len(column) // 2) * width
+    padded = np.zeros((above + len(pixels) + below, pixels.shape[1]), pixels.dtype)
+    padded[above:above + len(pixels)] = pixels
+    rows = np.zeros_like(padded)
+    for j, weight in enumerate(row):
+        if weight != 0.0:
+            _shift_add(rows, padded, j - len(row) // 2, weight)
+    out = np.zeros_like(pixels)
+    for i, weight in enumerate(column):
+        if weight != 0.0:
+            start = i * width
+            out += weight * rows[start:start + len(pixels)]
+    return out
+
+
+def _fast_length(n: int) -> int:
+    """Smallest 2^a*3^b*5^c >= n, a fast FFT length."""
+    best = 1 << (n - 1).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _correlate_fft(pixels: np.ndarray, kernel: np.ndarray, width: int) -> np.ndarray:
+    # The 2D kernel on linear indexes is a 1D kernel of span (height - 1)*width + kernel width
+    span = (kernel.shape[0] - 1) * width + kernel.shape[1]
+    kernel_1d = np.zeros(span)
+    for i in range(kernel.shape[0]):
+        kernel_1d[i * width:i * width + kernel.shape[1]] = kernel[i]
+    origin = (kernel.shape[0] // 2) * width + kernel.shape[1] // 2
+    n = len(pixels)
+    length = _fast_length(n + span - 1)
+    # Correlation is the convolution with the reversed kernel, shifted by its span
+    spectrum = np.fft.rfft(pixels, length, axis=0) * np.fft.rfft(kernel_1d[::-1], length)[:, None]
+    convolved = np.fft.irfft(spectrum, length, axis=0)
+    start = span - 1 - origin
+    return convolved[start:start + n]
+
+
+def convolve_pixels(pixels: np.ndarray, kernel, method: str = "auto") -> np.ndarray:
+    """Returns the convolution of (height, width, channels) uint8 pixels, as a new uint8 array."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown convolution method {method}, expected one of {METHODS}")
+    kernel = as_kernel(kernel)
+    height, width, channels = pixels.shape
+    # Normalized values, as raylib computes the products (in float32)
+    flat = pixels.reshape(height * width, channels) / np.float32(255.0)
+    if method == "auto" and kernel.size <= DIRECT_MAX_TAPS:
+        method = "direct"  # Exact, and as fast as the others for small kernels
+    separable = separate_kernel(kernel) if method in ("auto", "separable") else None
+    if method == "separable" and separable is None:
+        raise ValueError("Kernel is not separable")
+    if method == "direct":
+        out = _correlate_direct(flat, kernel.astype(flat.dtype), width)
+    elif separable is not None:
+        out = _correlate_separable(flat, separable[0].astype(flat.dtype), separable[1].astype(flat.dtype), width)
+    else:
+        out = _correlate_fft(flat, kernel, width)
+    # Colors clamped then truncated, as raylib converts the results to bytes, alpha truncated and wrapped
+    out *= np.float32(255.0)
+    result = np.empty(out.shape, np.uint8)
+    if channels == 4:
+        result[:, 3] = out[:, 3].astype(np.int64) & 0xFF
+    color = slice(0, 3) if channels == 4 else slice(None)
+    result[:, color] = np.clip(out[:, color], 0.0, 255.0)
+    return result.reshape(height, width, channels)
+
+
+def image_convolution(image, kernel, method: str = "auto"):
+    """Same as rl.image_kernel_convolution(image, kernel, size), in place, kernel being any 2D (or flat square) array."""
+    pixel_format = image.format
+    if pixel_format != rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8:
+        rl.image_format(image, rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8)
+    pixels = image_array(image)
+    pixels[...] = convolve_pixels(pixels, kernel, method)
+    if pixel_format != rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8:
+        rl.image_format(image, pixel_format)
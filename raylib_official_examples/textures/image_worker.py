@@ -0,0 +1,113 @@
+"""
+Image processing on a worker thread, with the results uploaded into an existing texture.
+
+Processing an image with rl.image_blur_gaussian(), rl.image_color_contrast()... on the render
+thread freezes the window for the whole processing, hundreds of milliseconds for large images.
+ImageWorker processes a copy of a source image on a worker thread instead (cffi releases the
+GIL during the C calls), and update() pushes the results into the texture from the main thread:
+- the results are double-buffered: the worker writes the RGBA pixels of a result into the back
+  buffer, then swaps it with the front buffer, which update() uploads with rl.update_texture(),
+  so the texture is never reallocated and the pixel buffers are allocated once,
+- only the latest submitted process matters: the processes submitted while the worker is busy
+  replace each other, and the results of processes submitted before the latest one are dropped.
+
+    worker = ImageWorker(image, texture)  # RGBA image, texture of the same size
+    worker.submit(lambda image: rl.image_blur_gaussian(image, 10))
+    while not rl.window_should_close():
+        worker.update()  # In the main loop, uploads the new result, if any
+        ...
+    worker.shutdown()  # Before unloading the image and the texture
+"""
+import threading
+from typing import Callable, Optional, Tuple
+
+import pyray as rl
+
+ImageProcess = Callable[..., None]  # Modifies the rl.Image it is given, in place
+
+
+class ImageWorker:
+    """Processes copies of an image on a worker thread, see the module docstring."""
+
+    def __init__(self, image, texture):
+        if image.format != rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8:
+            raise ValueError("Image must be RGBA 32bit, the format used to update the texture")
+        if (image.width, image.height) != (texture.width, texture.height):
+            raise ValueError("Image and texture sizes differ")
+        self.image = image  # Source, only read by the worker, must not be modified while the worker runs
+        self.texture = texture
+        self._size = rl.get_pixel_data_size(image.width, image.height, image.format)
+        self._front = rl.ffi.new("unsigned char[]", self._size)  # Latest result, read by update()
+        self._back = rl.ffi.new("unsigned char[]", self._size)  # Written by the worker
+        self._ready = False  # The front buffer holds a result not uploaded yet
+        self._buffers_lock = threading.Lock()
+        self._job: Optional[Tuple[int, Optional[ImageProcess]]] = None  # Latest submitted (generation, process)
+        self._generation = 0  # Of the latest submitted process
+        self._done_generation = 0  # Of the latest result written to the front buffer
+        self.uploaded_generation = 0  # Of the result shown by the texture
+        self.error: Optional[str] = None  # Of the latest process that raised an exception
+        self._failed_generation = 0
+        self._job_available = threading.Condition()
+        self._thread = threading.Thread(target=self._worker, daemon=True)
+        self._thread.start()
+
+    def submit(self, process: Optional[ImageProcess]) -> int:
+        """Processes a copy of the source image with process(image), None uploads the source image.
+        Returns the generation of the process, the texture shows it once uploaded_generation reaches it."""
+        with self._job_available:
+            self._generation += 1
+            self._job = (self._generation, process)
+            self._job_available.notify()
+            return self._generation
+
+    @property
+    def busy(self) -> bool:
+        """True until the result of the latest submitted process is uploaded (or the process failed)."""
+        return self._generation not in (self.uploaded_generation, self._failed_generation)
+
+    def _worker(self):
+        while True:
+            with self._job_available:
+                while self._job is None:
+                    self._job_available.wait()
+                (generation, process), self._job = self._job, None
+            if generation < 0:  # Shutdown
+                return
+            image = rl.image_copy(self.image)
+            try:
+                if process is not None:
+                    process(image)
+                # Processes may change the image format (e.g. grayscale), the results are RGBA
+                pixels = rl.load_image_colors(image)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self._failed_generation = generation
+                continue
+            finally:
+                rl.unload_image(image)
+            rl.ffi.memmove(self._back, pixels, self._size)
+            rl.unload_image_colors(pixels)
+            with self._job_available:
+                if self._job is not None:  # Outdated, a newer process was submitted meanwhile
+                    continue
+            with self._buffers_lock:
+                self._front, self._back = self._back, self._front
+                self._ready = True
+                self._done_generation = generation
+
+    def update(self) -> bool:
+        """Uploads the latest result into the texture, if there is a new one. Returns True if uploaded."""
+        with self._buffers_lock:
+            if not self._ready:
+                return False
+            rl.update_texture(self.texture, self._front)
+            self._ready = False
+            self.uploaded_generation = self._done_generation
+        return True
+
+    def shutdown(self):
+        """Stops the worker, after the process it is running. Results not uploaded are dropped."""
+        with self._job_available:
+            self._job = (-1, None)
+            self._job_available.notify()
+        self._thread.join()
@@ -0,0 +1,110 @@
+"""
+Particle pool: NumPy structure of arrays, free list spawning, vectorized update and bulk drawing.
+
+A pool of Python particle objects scans the particles to find an inactive one at each spawn,
+updates them one by one, and draws them with one rl.draw_texture_pro() call each, which limits
+effects to a few hundred particles. ParticlePool stores the particles as arrays instead:
+- positions (capacity, 2), colors (capacity, 4) uint8, alphas, sizes and rotations (degrees),
+  the slots of inactive particles being flagged by active,
+- the indices of the inactive slots are kept in a free list (a stack), so spawning n particles
+  costs O(n), without scanning, and the particles dying in update() are pushed back at once,
+- update() integrates all the particles with vectorized operations,
+- draw() builds the rotated quads of the active particles (same geometry as
+  rl.draw_texture_pro() with the origin at the quad center), and draws them through a
+  SpriteBatch, in the current blend mode (e.g. BLEND_ALPHA or BLEND_ADDITIVE).
+
+    pool = ParticlePool(100000)
+    pool.colors[:] = ...  # Per slot attributes, kept when slots are reused
+    batch = SpriteBatch(texture)
+    while not rl.window_should_close():
+        pool.spawn(mouse.x, mouse.y, 500)
+        pool.update(gravity=1.5, alpha_decay=0.005, rotation_speed=2.0)
+        ...
+        rl.begin_blend_mode(rl.BLEND_ADDITIVE)
+        pool.draw(batch)
+        rl.end_blend_mode()
+"""
+import numpy as np
+
+from sprite_batch import SpriteBatch
+
+
+class ParticlePool:
+    """Fixed capacity particles, see the module docstring."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2), np.float32)  # Centers
+        self.colors = np.full((capacity, 4), 255, np.uint8)  # Alpha is replaced by alphas when drawn
+        self.alphas = np.zeros(capacity, np.float32)
+        self.sizes = np.ones(capacity, np.float32)  # Scale of the texture size
+        self.rotations = np.zeros(capacity, np.float32)
+        self.active = np.zeros(capacity, bool)
+        # Free slots stack, the last free_count entries being popped first: slot 0 is used first
+        self._free = np.arange(capacity - 1, -1, -1, dtype=np.int32)
+        self._free_count = capacity
+
+    @property
+    def count(self) -> int:
+        """Number of active particles."""
+        return self.capacity - self._free_count
+
+    def spawn(self, x: float, y: float, count: int = 1) -> np.ndarray:
+        """Activates up to count particles at (x, y), with alpha 1.0. Returns their indices,
+        e.g. to set other attributes; fewer particles are spawned if the pool is full."""
+        count = min(count, self._free_count)
+        self._free_count -= count
+        indices = self._free[self._free_count:self._free_count + count][::-1].copy()
+        self.active[indices] = True
+        self.alphas[indices] = 1.0
+        self.positions[indices] = (x, y)
+        return indices
+
+    def update(self, gravity: float, alpha_decay: float, rotation_speed: float):
+        """Moves the active particles down by gravity, fades them by alpha_decay and rotates them by
+        rotation_speed degrees. Particles whose alpha reaches 0.0 are freed."""
+        active = self.active
+        np.add(self.positions[:, 1], gravity, out=self.positions[:, 1], where=active)
+        np.subtract(self.alphas, alpha_decay, out=self.alphas, where=active)
+        np.add(self.rotations, rotation_speed, out=self.rotations, where=active)
+        dead = np.flatnonzero(active & (self.alphas <= 0.0))
+        if len(dead):
+            active[dead] = False
+            self._free[self._free_count:self._free_count + len(dead)] = dead
+            self._free_count += len(dead)
+
+    def quads(self, width: float, height: float):
+        """Returns the (n, 4, 2) corners and (n, 4) colors of the active particles, for a width x height texture."""
+        indices = np.flatnonzero(self.active)
+        # NOTE: np.take() gathers much faster than fancy indexing, and the corner coordinates are
+        # computed as contiguous (4, 2, n) planes, much faster than strided (n, 4, 2) slices
+        centers = np.take(self.positions, indices, axis=0)
+        center_x = centers[:, 0]
+        center_y = centers[:, 1]
+        angles = np.radians(np.take(self.rotations, indices))
+        cos = np.cos(angles)
+        sin = np.sin(angles)
+        half_sizes = np.take(self.sizes, indices) * np.float32(0.5)
+        # Half width (u) and half height (v) vectors of the rotated quads, corners are center -/+ u -/+ v
+        half_widths = half_sizes * np.float32(width)
+        half_heights = half_sizes * np.float32(height)
+        u_x = cos * half_widths
+        u_y = sin * half_widths
+        v_x = -sin * half_heights
+        v_y = cos * half_heights
+        planes = np.empty((4, 2, len(indices)), np.float32)
+        for corner, (u_sign, v_sign) in enumerate(((-1, -1), (-1, 1), (1, 1), (1, -1))):
+            for axis, center, u, v in ((0, center_x, u_x, v_x), (1, center_y, u_y, v_y)):
+                out = planes[corner, axis]
+                (np.add if u_sign > 0 else np.subtract)(center, u, out=out)
+                (np.add if v_sign > 0 else np.subtract)(out, v, out=out)
+        corners = planes.transpose(2, 0, 1)  # (n, 4, 2) view, copied into the vertex buffers when drawn
+        colors = np.take(self.colors, indices, axis=0)
+        # Same as rl.fade(color, alpha)
+        colors[:, 3] = np.clip(np.take(self.alphas, indices), 0.0, 1.0) * np.float32(255.0)
+        return corners, colors
+
+    def draw(self, batch: SpriteBatch):
+        """Draws the active particles with the batch texture, in the current blend mode."""
+        corners, colors = self.quads(batch.texture.width, batch.texture.height)
+        batch.draw_quads(corners, colors)
@@ -0,0 +1,137 @@
+"""
+Bulk sprite drawing: quads built with NumPy from position/color arrays, drawn through rlgl.
+
+rl.draw_texture() is one Python to C call per sprite, and the quad vertices are then written
+one by one into the rlgl render batch. SpriteBatch builds the vertices of all the sprites with
+NumPy operations, and draws them with its own vertex array, the same way rlgl draws its batch:
+- the vertex buffers hold MAX_BATCH_ELEMENTS quads (the rlgl default batch size), so sprites are
+  drawn in chunks of at most MAX_BATCH_ELEMENTS quads, each one costing two buffer updates and
+  one draw call, whatever the number of sprites in the chunk,
+- the texture coordinates and the indices are the same for all the chunks, they are uploaded once,
+- the rlgl default shader is used, with the current modelview/projection matrices, and the
+  current blend mode (e.g. inside rl.begin_blend_mode(rl.BLEND_ADDITIVE)).
+
+    batch = SpriteBatch(texture)
+    ...
+    rl.begin_drawing()
+    batch.draw(positions, colors)  # (n, 2) float32 top-left corners, (n, 4) uint8 colors
+    batch.draw_quads(corners, colors)  # Or (n, 4, 2) float32 quad corners, e.g. rotated sprites
+    ...
+    batch.unload()  # Before rl.close_window()
+"""
+import numpy as np
+
+import pyray as rl
+
+# This is the maximum amount of elements (quads) per batch
+# NOTE: This value is defined in [rlgl] module and can be changed there
+MAX_BATCH_ELEMENTS = 8192
+
+SPRITE_DEPTH = -0.5  # Inside the near/far range of the default 2D projection (rlgl uses ~-1.0)
+
+# Quad corners, in the order used by rlgl: top-left, bottom-left, bottom-right, top-right
+QUAD_X = np.array([0, 0, 1, 1], np.float32)
+QUAD_Y = np.array([0, 1, 1, 0], np.float32)
+QUAD_INDICES = np.array([0, 1, 2, 0, 2, 3], np.uint16)  # Two triangles per quad
+
+
+class SpriteBatch:
+    """Draws many copies of a texture, see the module docstring."""
+
+    def __init__(self, texture, quads_per_draw: int = MAX_BATCH_ELEMENTS):
+        self.texture = texture
+        self.quads_per_draw = quads_per_draw
+        self.draw_calls = 0  # Of the last draw()
+        # Vertex data of one chunk, rebuilt for each chunk from the sprites arrays
+        self.vertices = np.zeros((quads_per_draw, 4, 3), np.float32)
+        self.vertices[:, :, 2] = SPRITE_DEPTH
+        self.colors = np.zeros((quads_per_draw, 4, 4), np.uint8)
+        self._vertices_c = rl.ffi.from_buffer(self.vertices)
+        self._colors_c = rl.ffi.from_buffer(self.colors)
+
+        texcoords = np.empty((quads_per_draw, 4, 2), np.float32)
+        texcoords[:, :, 0] = QUAD_X
+        texcoords[:, :, 1] = QUAD_Y
+        # Unsigned short indices, as expected by rl.rl_draw_vertex_array_elements()
+        indices = (QUAD_INDICES + 4 * np.arange(quads_per_draw, dtype=np.uint16)[:, None]).astype(np.uint16)
+
+        locs = rl.rl_get_shader_locs_default()
+        self.shader_id = rl.rl_get_shader_id_default()
+        self.mvp_loc = locs[rl.RL_SHADER_LOC_MATRIX_MVP]
+        self.color_diffuse_loc = locs[rl.RL_SHADER_LOC_COLOR_DIFFUSE]
+        self.map_diffuse_loc = locs[rl.RL_SHADER_LOC_MAP_DIFFUSE]
+        self._white = rl.ffi.new("float[4]", [1.0, 1.0, 1.0, 1.0])
+        self._texture_slot = rl.ffi.new("int *", 0)
+
+        self.vao_id = rl.rl_load_vertex_array()
+        rl.rl_enable_vertex_array(self.vao_id)
+        self.vertices_vbo_id = rl.rl_load_vertex_buffer(self._vertices_c, self.vertices.nbytes, True)
+        rl.rl_set_vertex_attribute(locs[rl.RL_SHADER_LOC_VERTEX_POSITION], 3, rl.RL_FLOAT, False, 0, 0)
+        rl.rl_enable_vertex_attribute(locs[rl.RL_SHADER_LOC_VERTEX_POSITION])
+        self.texcoords_vbo_id = rl.rl_load_vertex_buffer(rl.ffi.from_buffer(texcoords), texcoords.nbytes, False)
+        rl.rl_set_vertex_attribute(locs[rl.RL_SHADER_LOC_VERTEX_TEXCOORD01], 2, rl.RL_FLOAT, False, 0, 0)
+        rl.rl_enable_vertex_attribute(locs[rl.RL_SHADER_LOC_VERTEX_TEXCOORD01])
+        self.colors_vbo_id = rl.rl_load_vertex_buffer(self._colors_c, self.colors.nbytes, True)
+        rl.rl_set_vertex_attribute(locs[rl.RL_SHADER_LOC_VERTEX_COLOR], 4, rl.RL_UNSIGNED_BYTE, True, 0, 0)
+        rl.rl_enable_vertex_attribute(locs[rl.RL_SHADER_LOC_VERTEX_COLOR])
+        self.indices_vbo_id = rl.rl_load_vertex_buffer_element(rl.ffi.from_buffer(indices), indices.nbytes, False)
+        rl.rl_disable_vertex_array()
+
+    def draw(self, positions: np.ndarray, colors: np.ndarray):
+        """Draws one sprite per row: positions (n, 2) are the top-left corners, colors (n, 4) the tints."""
+        self._begin()
+        quad_x = QUAD_X * self.texture.width
+        quad_y = QUAD_Y * self.texture.height
+        count = len(positions)
+        for start in range(0, count, self.quads_per_draw):
+            quads = min(self.quads_per_draw, count - start)
+            chunk = positions[start:start + quads]
+            np.add(chunk[:, 0, None], quad_x, out=self.vertices[:quads, :, 0])
+            np.add(chunk[:, 1, None], quad_y, out=self.vertices[:quads, :, 1])
+            self.colors[:quads] = colors[start:start + quads, None, :]
+            self._flush(quads)
+        self._end()
+
+    def draw_quads(self, corners: np.ndarray, colors: np.ndarray):
+        """Draws one textured quad per row, e.g. rotated or scaled sprites: corners (n, 4, 2) are
+        the top-left, bottom-left, bottom-right and top-right corners, colors (n, 4) the tints."""
+        self._begin()
+        count = len(corners)
+        for start in range(0, count, self.quads_per_draw):
+            quads = min(self.quads_per_draw, count - start)
+            self.vertices[:quads, :, :2] = corners[start:start + quads]
+            self.colors[:quads] = colors[start:start + quads, None, :]
+            self._flush(quads)
+        self._end()
+
+    def _begin(self):
+        # Sprites must be drawn after what was already batched by rlgl
+        rl.rl_draw_render_batch_active()
+
+        rl.rl_enable_shader(self.shader_id)
+        rl.rl_set_uniform_matrix(self.mvp_loc, rl.matrix_multiply(rl.rl_get_matrix_modelview(),
+                                                                  rl.rl_get_matrix_projection()))
+        rl.rl_set_uniform(self.color_diffuse_loc, self._white, rl.RL_SHADER_UNIFORM_VEC4, 1)
+        rl.rl_set_uniform(self.map_diffuse_loc, self._texture_slot, rl.RL_SHADER_UNIFORM_SAMPLER2D, 1)
+        rl.rl_active_texture_slot(0)
+        rl.rl_enable_texture(self.texture.id)
+        rl.rl_enable_vertex_array(self.vao_id)
+        self.draw_calls = 0
+
+    def _flush(self, quads: int):
+        """Draws the first quads of the chunk buffers."""
+        rl.rl_update_vertex_buffer(self.vertices_vbo_id, self._vertices_c, quads * 4 * 3 * 4, 0)
+        rl.rl_update_vertex_buffer(self.colors_vbo_id, self._colors_c, quads * 4 * 4, 0)
+        rl.rl_draw_vertex_array_elements(0, quads * 6, rl.ffi.NULL)
+        self.draw_calls += 1
+
+    @staticmethod
+    def _end():
+        rl.rl_disable_vertex_array()
+        rl.rl_disable_texture()
+        rl.rl_disable_shader()
+
+    def unload(self):
+        rl.rl_unload_vertex_array(self.vao_id)
+        for vbo_id in (self.vertices_vbo_id, self.texcoords_vbo_id, self.colors_vbo_id, self.indices_vbo_id):
+            rl.rl_unload_vertex_buffer(vbo_id)
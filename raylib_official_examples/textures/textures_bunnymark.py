@@ -11,6 +11,8 @@ This source has been converted from C raylib examples to Python.
 import pyray as rl
 from pathlib import Path
 import random
+import sys
+import time
 
 THIS_DIR = Path(__file__).resolve().parent
 
@@ -20,12 +22,128 @@ MAX_BUNNIES = 50000  # 50K bunnies limit
 # NOTE: This value is defined in [rlgl] module and can be changed there
 MAX_BATCH_ELEMENTS = 8192
 
+# With --numpy, bunnies are stored in NumPy arrays (structure of arrays) and updated with
+# vectorized operations, instead of one Python object per bunny.
+# With --bulk, the arrays are also drawn in bulk by a SpriteBatch (see sprite_batch.py), instead
+# of one rl.draw_texture() call per bunny, so many more bunnies can be drawn
+USE_BULK = "--bulk" in sys.argv[1:]
+USE_NUMPY = USE_BULK or "--numpy" in sys.argv[1:]
+if USE_NUMPY:
+    try:
+        import numpy as np
+    except ImportError:
+        print("The --numpy and --bulk modes require NumPy. Please install it using: pip install numpy")
+        sys.exit(1)
+    import raylib  # Unwrapped C functions, called with the cdata views of the arrays
+if USE_BULK:
+    from sprite_batch import SpriteBatch
+    MAX_BUNNIES = 500000  # 500K bunnies limit
+    BUNNIES_PER_FRAME = 1000
+else:
+    BUNNIES_PER_FRAME = 100
+
+# With --benchmark, the bunnies count is set by a Calibrator instead of the mouse, the frame rate
+# is uncapped, and the max bunnies count drawn within the frame budget is printed on one line
+BENCHMARK = "--benchmark" in sys.argv[1:]
+FRAME_BUDGET_MS = 1000.0/60.0
+CALIBRATION_START = 1000  # First bunnies count tried, doubled until over budget
+CALIBRATION_SETTLE_FRAMES = 30  # Frames not measured after a count change
+CALIBRATION_MEASURE_FRAMES = 60  # Frames averaged for each count
+
 class Bunny:
     def __init__(self, pos, speed, color):
         self.position = pos
         self.speed = speed
         self.color = color
 
+class Calibrator:
+    """Searches the max bunnies count whose averaged frame time stays within the frame budget.
+    
+    The count is doubled until the budget is exceeded, then binary searched between the last
+    count within budget and the first one over budget, down to 1% of the count.
+    """
+    def __init__(self, max_count):
+        self.max_count = max_count
+        self.target = min(CALIBRATION_START, max_count)  # Bunnies count to measure
+        self.low = 0  # Highest count measured within budget
+        self.high = None  # Lowest count measured over budget
+        self.low_frame_ms = 0.0
+        self.low_draw_calls = 0
+        self.done = False
+        self.frames = 0
+        self.measured_ns = 0
+        self.last_ns = time.perf_counter_ns()
+
+    def end_frame(self, draw_calls):
+        now_ns = time.perf_counter_ns()
+        frame_ns = now_ns - self.last_ns
+        self.last_ns = now_ns
+        self.frames += 1
+        if self.frames <= CALIBRATION_SETTLE_FRAMES:
+            return
+        self.measured_ns += frame_ns
+        if self.frames < CALIBRATION_SETTLE_FRAMES + CALIBRATION_MEASURE_FRAMES:
+            return
+
+        frame_ms = self.measured_ns/CALIBRATION_MEASURE_FRAMES/1e6
+        if frame_ms <= FRAME_BUDGET_MS:
+            self.low = self.target
+            self.low_frame_ms = frame_ms
+            self.low_draw_calls = draw_calls
+        else:
+            self.high = self.target
+        if self.high is None:
+            # Still within budget: double the count, until the limit
+            self.done = self.low == self.max_count
+            self.target = min(self.target*2, self.max_count)
+        else:
+            # Over budget once: back off, and binary search
+            self.done = self.high - self.low <= max(1, self.low//100)
+            self.target = (self.low + self.high)//2
+        self.frames = 0
+        self.measured_ns = 0
+
+class BunnyArrays:
+    """All the bunnies, one row per bunny in each array"""
+    def __init__(self, capacity):
+        self.count = 0
+        self.positions = np.zeros((capacity, 2), np.float32)
+        self.speeds = np.zeros((capacity, 2), np.float32)
+        self.colors = np.zeros((capacity, 4), np.uint8)
+        # Color structs viewing the colors array memory: passed to C without conversion
+        self.colors_c = rl.ffi.from_buffer("Color[]", self.colors)
+        self.rng = np.random.default_rng(random.getrandbits(64))
+
+    def spawn(self, position, count):
+        start = self.count
+        end = min(start + count, len(self.positions))
+        self.positions[start:end] = (position.x, position.y)
+        self.speeds[start:end] = self.rng.uniform(-250, 250, (end - start, 2)) / 60.0
+        self.colors[start:end, 0] = self.rng.integers(50, 241, end - start)
+        self.colors[start:end, 1] = self.rng.integers(80, 241, end - start)
+        self.colors[start:end, 2] = self.rng.integers(100, 241, end - start)
+        self.colors[start:end, 3] = 255
+        self.count = end
+
+    def update(self, half_width, half_height, screen_width, screen_height):
+        positions = self.positions[:self.count]
+        speeds = self.speeds[:self.count]
+        positions += speeds
+
+        center_x = positions[:, 0] + half_width
+        speeds[:, 0][(center_x > screen_width) | (center_x < 0)] *= -1
+        center_y = positions[:, 1] + half_height
+        speeds[:, 1][(center_y > screen_height) | (center_y - 40 < 0)] *= -1
+
+    def draw(self, texture):
+        # Integer coordinates converted in bulk, as rl.draw_texture() does with int()
+        xs = self.positions[:self.count, 0].astype(np.int32).tolist()
+        ys = self.positions[:self.count, 1].astype(np.int32).tolist()
+        draw_texture = raylib.DrawTexture
+        colors = self.colors_c
+        for i in range(self.count):
+            draw_texture(texture, xs[i], ys[i], colors[i])
+
 # Initialization
 screenWidth = 800
 screenHeight = 450
@@ -35,68 +153,115 @@ rl.init_window(screenWidth, screenHeight, "raylib [textures] example - bunnymark
 # Load bunny texture
 texBunny = rl.load_texture(str(THIS_DIR/"resources/wabbit_alpha.png"))
 
-bunnies = []  # Bunnies list
+bunnies = BunnyArrays(MAX_BUNNIES) if USE_NUMPY else []  # Bunnies list
+spriteBatch = SpriteBatch(texBunny) if USE_BULK else None
 bunniesCount = 0  # Bunnies counter
+calibrator = Calibrator(MAX_BUNNIES) if BENCHMARK else None
 
-rl.set_target_fps(60)  # Set our game to run at 60 frames-per-second
+rl.set_target_fps(0 if BENCHMARK else 60)  # Set our game to run at 60 frames-per-second (uncapped for benchmark)
 
 # Main game loop
 while not rl.window_should_close():  # Detect window close button or ESC key
     # Update
-    if rl.is_mouse_button_down(rl.MOUSE_BUTTON_LEFT):
-        # Create more bunnies
-        for i in range(100):
-            if bunniesCount < MAX_BUNNIES:
-                pos = rl.get_mouse_position()
-                speed = rl.Vector2(
-                    random.uniform(-250, 250) / 60.0,
-                    random.uniform(-250, 250) / 60.0
-                )
-                color = rl.Color(
-                    random.randint(50, 240),
-                    random.randint(80, 240),
-                    random.randint(100, 240),
-                    255
-                )
+    spawnCount = 0
+    if calibrator is not None:
+        # Bunnies are added at the screen center, or removed, to get the calibrator count
+        spawnCount = calibrator.target - bunniesCount
+        if spawnCount < 0:
+            if USE_NUMPY:
+                bunnies.count = calibrator.target
+            else:
+                del bunnies[calibrator.target:]
+            bunniesCount = calibrator.target
+    elif rl.is_mouse_button_down(rl.MOUSE_BUTTON_LEFT):
+        spawnCount = BUNNIES_PER_FRAME
+
+    if USE_NUMPY:
+        if spawnCount > 0:
+            spawnPosition = rl.Vector2(screenWidth/2, screenHeight/2) if BENCHMARK else rl.get_mouse_position()
+            bunnies.spawn(spawnPosition, spawnCount)  # Create more bunnies
+            bunniesCount = bunnies.count
+
+        # Update bunnies, all at once
+        bunnies.update(texBunny.width/2, texBunny.height/2, rl.get_screen_width(), rl.get_screen_height())
+    else:
+        if spawnCount > 0:
+            # Create more bunnies
+            for i in range(spawnCount):
+                if bunniesCount < MAX_BUNNIES:
+                    pos = rl.Vector2(screenWidth/2, screenHeight/2) if BENCHMARK else rl.get_mouse_position()
+                    speed = rl.Vector2(
+                        random.uniform(-250, 250) / 60.0,
+                        random.uniform(-250, 250) / 60.0
+                    )
+                    color = rl.Color(
+                        random.randint(50, 240),
+                        random.randint(80, 240),
+                        random.randint(100, 240),
+                        255
+                    )
                 
-                bunnies.append(Bunny(pos, speed, color))
-                bunniesCount += 1
+                    bunnies.append(Bunny(pos, speed, color))
+                    bunniesCount += 1
 
-    # Update bunnies
-    for i in range(bunniesCount):
-        bunnies[i].position.x += bunnies[i].speed.x
-        bunnies[i].position.y += bunnies[i].speed.y
+        # Update bunnies
+        for i in range(bunniesCount):
+            bunnies[i].position.x += bunnies[i].speed.x
+            bunnies[i].position.y += bunnies[i].speed.y
 
-        if ((bunnies[i].position.x + texBunny.width/2) > rl.get_screen_width() or
-            (bunnies[i].position.x + texBunny.width/2) < 0):
-            bunnies[i].speed.x *= -1
+            if ((bunnies[i].position.x + texBunny.width/2) > rl.get_screen_width() or
+                (bunnies[i].position.x + texBunny.width/2) < 0):
+                bunnies[i].speed.x *= -1
 
-        if ((bunnies[i].position.y + texBunny.height/2) > rl.get_screen_height() or
-            (bunnies[i].position.y + texBunny.height/2 - 40) < 0):
-            bunnies[i].speed.y *= -1
+            if ((bunnies[i].position.y + texBunny.height/2) > rl.get_screen_height() or
+                (bunnies[i].position.y + texBunny.height/2 - 40) < 0):
+                bunnies[i].speed.y *= -1
 
     # Draw
     rl.begin_drawing()
     
     rl.clear_background(rl.RAYWHITE)
     
-    for i in range(bunniesCount):
-        # NOTE: When internal batch buffer limit is reached (MAX_BATCH_ELEMENTS),
-        # a draw call is launched and buffer starts being filled again;
-        # before issuing a draw call, updated vertex data from internal CPU buffer is sent to GPU...
-        # Process of sending data is costly and it could happen that GPU data has not been completely
-        # processed for drawing while new data is tried to be sent (updating current in-use buffers)
-        # it could generates a stall and consequently a frame drop, limiting the number of drawn bunnies
-        rl.draw_texture(texBunny, int(bunnies[i].position.x), int(bunnies[i].position.y), bunnies[i].color)
+    if USE_BULK:
+        spriteBatch.draw(bunnies.positions[:bunniesCount], bunnies.colors[:bunniesCount])
+    elif USE_NUMPY:
+        bunnies.draw(texBunny)
+    else:
+        for i in range(bunniesCount):
+            # NOTE: When internal batch buffer limit is reached (MAX_BATCH_ELEMENTS),
+            # a draw call is launched and buffer starts being filled again;
+            # before issuing a draw call, updated vertex data from internal CPU buffer is sent to GPU...
+            # Process of sending data is costly and it could happen that GPU data has not been completely
+            # processed for drawing while new data is tried to be sent (updating current in-use buffers)
+            # it could generates a stall and consequently a frame drop, limiting the number of drawn bunnies
+            rl.draw_texture(texBunny, int(bunnies[i].position.x), int(bunnies[i].position.y), bunnies[i].color)
+    
+    if USE_BULK:
+        drawCalls = spriteBatch.draw_calls + 1  # Sprite batch chunks, then the rlgl batch of the overlay
+    else:
+        drawCalls = 1 + bunniesCount // MAX_BATCH_ELEMENTS
     
     rl.draw_rectangle(0, 0, screenWidth, 40, rl.BLACK)
     rl.draw_text(f"bunnies: {bunniesCount}", 120, 10, 20, rl.GREEN)
-    rl.draw_text(f"batched draw calls: {1 + bunniesCount // MAX_BATCH_ELEMENTS}", 320, 10, 20, rl.MAROON)
+    rl.draw_text(f"batched draw calls: {drawCalls}", 320, 10, 20, rl.MAROON)
+    if USE_NUMPY:
+        rl.draw_text("bulk" if USE_BULK else "numpy", 620, 10, 20, rl.SKYBLUE)
     
     rl.draw_fps(10, 10)
     
     rl.end_drawing()
 
+    if calibrator is not None:
+        calibrator.end_frame(drawCalls)
+        if calibrator.done:
+            mode = "bulk" if USE_BULK else "numpy" if USE_NUMPY else "objects"
+            print(f"bunnymark mode={mode} bunnies={calibrator.low} "
+                  f"draw_calls={calibrator.low_draw_calls} frame_ms={calibrator.low_frame_ms:.2f} "
+                  f"budget_ms={FRAME_BUDGET_MS:.2f}")
+            break
+
 # De-Initialization
+if spriteBatch is not None:
+    spriteBatch.unload()
 rl.unload_texture(texBunny)  # Unload bunny texture
 rl.close_window()  # Close window and OpenGL context
\ No newline at end of file
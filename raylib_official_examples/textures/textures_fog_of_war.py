@@ -9,8 +9,18 @@ This source has been converted from C raylib examples to Python.
 """
 
 import pyray as rl
+import random
+import sys
 from pathlib import Path
-import ctypes
+
+try:
+    import numpy as np
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
+
+from image_arrays import image_from_array
+from tile_layer import TileLayer
 
 THIS_DIR = Path(__file__).resolve().parent
 
@@ -18,14 +28,17 @@ MAP_TILE_SIZE = 32         # Tiles size 32x32 pixels
 PLAYER_SIZE = 16           # Player size
 PLAYER_TILE_VISIBILITY = 2  # Player can see 2 tiles around its position
 
+# Fog alpha for each tile fog state: 0 = not visited (black), 1 = visible, 2 = visited (partial fog)
+FOG_ALPHA = np.array([255, 0, int(255 * 0.8)], np.uint8)
+
 # Map data type
 class Map:
     def __init__(self, tiles_x, tiles_y):
         self.tilesX = tiles_x
         self.tilesY = tiles_y
-        # Initialize arrays of unsigned chars (bytes)
-        self.tileIds = bytearray(tiles_x * tiles_y)
-        self.tileFog = bytearray(tiles_x * tiles_y)
+        # Initialize arrays of unsigned chars (bytes), indexed [y, x]
+        self.tileIds = np.zeros((tiles_y, tiles_x), np.uint8)
+        self.tileFog = np.zeros((tiles_y, tiles_x), np.uint8)
 
 # Initialization
 screenWidth = 800
@@ -38,19 +51,37 @@ map_data = Map(25, 15)
 
 # Load map tiles (generating 2 random tile ids for testing)
 # NOTE: Map tile ids should be probably loaded from an external map file
-for i in range(map_data.tilesY * map_data.tilesX):
-    map_data.tileIds[i] = rl.get_random_value(0, 1)
+map_data.tileIds[...] = np.random.default_rng(random.getrandbits(64)).integers(0, 2, (map_data.tilesY, map_data.tilesX))
+
+# Draws a tile (and its border), into the tile layer chunks
+def draw_tile(tile_id, x, y):
+    if tile_id == 0:
+        tile_color = rl.BLUE
+    else:
+        tile_color = rl.fade(rl.BLUE, 0.9)
+
+    rl.draw_rectangle(x, y, MAP_TILE_SIZE, MAP_TILE_SIZE, tile_color)
+    rl.draw_rectangle_lines(x, y, MAP_TILE_SIZE, MAP_TILE_SIZE, rl.fade(rl.DARKBLUE, 0.5))
+
+# Tiles never change, they are rendered once into chunk render textures, drawn instead of the tiles
+# NOTE: Chunks are cleared with the screen background, translucent tiles look the same as when drawn on screen
+tileLayer = TileLayer(map_data.tileIds, MAP_TILE_SIZE, draw_tile, background=rl.RAYWHITE)
+screenView = rl.Rectangle(0, 0, screenWidth, screenHeight)
 
 # Player position on the screen (pixel coordinates, not tile coordinates)
 playerPosition = rl.Vector2(180, 130)
 playerTileX = 0
 playerTileY = 0
 
-# Render texture to render fog of war
-# NOTE: To get an automatic smooth-fog effect we use a render texture to render fog
+# Texture to render fog of war
+# NOTE: To get an automatic smooth-fog effect we use a texture with the fog
 # at a smaller size (one pixel per tile) and scale it on drawing with bilinear filtering
-fogOfWar = rl.load_render_texture(map_data.tilesX, map_data.tilesY)
-rl.set_texture_filter(fogOfWar.texture, rl.TEXTURE_FILTER_BILINEAR)
+# The fog pixels (black, alpha from the tile fog state) are computed with NumPy,
+# and uploaded with one rl.update_texture() per frame
+fogPixels = np.zeros((map_data.tilesY, map_data.tilesX, 4), np.uint8)
+fogOfWar = rl.load_texture_from_image(image_from_array(fogPixels))
+rl.set_texture_filter(fogOfWar, rl.TEXTURE_FILTER_BILINEAR)
+fogPixelsData = rl.ffi.from_buffer(fogPixels)
 
 rl.set_target_fps(60)  # Set our game to run at 60 frames-per-second
 
@@ -79,70 +110,38 @@ while not rl.window_should_close():  # Detect window close button or ESC key
         playerPosition.y = map_data.tilesY * MAP_TILE_SIZE - PLAYER_SIZE
 
     # Previous visited tiles are set to partial fog
-    for i in range(map_data.tilesX * map_data.tilesY):
-        if map_data.tileFog[i] == 1:
-            map_data.tileFog[i] = 2
+    map_data.tileFog[map_data.tileFog == 1] = 2
 
     # Get current tile position from player pixel position
     playerTileX = int((playerPosition.x + MAP_TILE_SIZE/2) / MAP_TILE_SIZE)
     playerTileY = int((playerPosition.y + MAP_TILE_SIZE/2) / MAP_TILE_SIZE)
 
     # Check visibility and update fog
-    # NOTE: We check tilemap limits to avoid processing tiles out-of-array-bounds (it could crash program)
-    for y in range(playerTileY - PLAYER_TILE_VISIBILITY, playerTileY + PLAYER_TILE_VISIBILITY):
-        for x in range(playerTileX - PLAYER_TILE_VISIBILITY, playerTileX + PLAYER_TILE_VISIBILITY):
-            if (x >= 0) and (x < map_data.tilesX) and (y >= 0) and (y < map_data.tilesY):
-                map_data.tileFog[y * map_data.tilesX + x] = 1
+    # NOTE: We clip the visible area to tilemap limits (negative slice bounds would wrap around)
+    map_data.tileFog[max(playerTileY - PLAYER_TILE_VISIBILITY, 0):max(playerTileY + PLAYER_TILE_VISIBILITY, 0),
+                     max(playerTileX - PLAYER_TILE_VISIBILITY, 0):max(playerTileX + PLAYER_TILE_VISIBILITY, 0)] = 1
 
     # Draw
-    # Draw fog of war to a small render texture for automatic smoothing on scaling
-    rl.begin_texture_mode(fogOfWar)
-    rl.clear_background(rl.BLANK)
-    
-    for y in range(map_data.tilesY):
-        for x in range(map_data.tilesX):
-            if map_data.tileFog[y * map_data.tilesX + x] == 0:
-                rl.draw_rectangle(x, y, 1, 1, rl.BLACK)
-            elif map_data.tileFog[y * map_data.tilesX + x] == 2:
-                rl.draw_rectangle(x, y, 1, 1, rl.fade(rl.BLACK, 0.8))
-    
-    rl.end_texture_mode()
+    # Update fog of war texture, one pixel per tile for automatic smoothing on scaling
+    np.take(FOG_ALPHA, map_data.tileFog, out=fogPixels[:, :, 3])
+    rl.update_texture(fogOfWar, fogPixelsData)
+
+    tileLayer.update(screenView)  # Render the visible chunks not rendered yet
 
     rl.begin_drawing()
     
     rl.clear_background(rl.RAYWHITE)
 
-    for y in range(map_data.tilesY):
-        for x in range(map_data.tilesX):
-            # Draw tiles from id (and tile borders)
-            if map_data.tileIds[y * map_data.tilesX + x] == 0:
-                tile_color = rl.BLUE
-            else:
-                tile_color = rl.fade(rl.BLUE, 0.9)
-                
-            rl.draw_rectangle(
-                x * MAP_TILE_SIZE, 
-                y * MAP_TILE_SIZE, 
-                MAP_TILE_SIZE, 
-                MAP_TILE_SIZE, 
-                tile_color
-            )
-            
-            rl.draw_rectangle_lines(
-                x * MAP_TILE_SIZE, 
-                y * MAP_TILE_SIZE, 
-                MAP_TILE_SIZE, 
-                MAP_TILE_SIZE, 
-                rl.fade(rl.DARKBLUE, 0.5)
-            )
+    # Draw tiles from id (and tile borders), through the chunks intersecting the screen
+    tileLayer.draw(screenView)
 
     # Draw player
     rl.draw_rectangle_v(playerPosition, rl.Vector2(PLAYER_SIZE, PLAYER_SIZE), rl.RED)
 
     # Draw fog of war (scaled to full map, bilinear filtering)
     rl.draw_texture_pro(
-        fogOfWar.texture, 
-        rl.Rectangle(0, 0, fogOfWar.texture.width, -fogOfWar.texture.height),
+        fogOfWar, 
+        rl.Rectangle(0, 0, fogOfWar.width, fogOfWar.height),
         rl.Rectangle(0, 0, map_data.tilesX * MAP_TILE_SIZE, map_data.tilesY * MAP_TILE_SIZE),
         rl.Vector2(0, 0), 
         0.0, 
@@ -156,5 +155,6 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     rl.end_drawing()
 
 # De-Initialization
-rl.unload_render_texture(fogOfWar)  # Unload render texture
+rl.unload_texture(fogOfWar)  # Unload fog texture
+tileLayer.unload()  # Unload chunk render textures
 rl.close_window()  # Close window and OpenGL context
\ No newline at end of file
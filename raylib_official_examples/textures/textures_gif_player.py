@@ -9,9 +9,15 @@ This source has been converted from C raylib examples to Python.
 """
 
 import pyray as rl
-import ctypes
+import sys
 from pathlib import Path
 
+try:
+    from gif_stream import GifStream  # Requires NumPy
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
+
 THIS_DIR = Path(__file__).resolve().parent
 
 MAX_FRAME_DELAY = 20
@@ -23,24 +29,18 @@ screenHeight = 450
 
 rl.init_window(screenWidth, screenHeight, "raylib [textures] example - gif playing")
 
-# Create a pointer to store the number of animation frames
-animFrames = rl.ffi.new("int *", 0)
-
-# Load all GIF animation frames into a single Image
-# NOTE: GIF data is always loaded as RGBA (32bit) by default
-# NOTE: Frames are just appended one after another in image.data memory
-imScarfyAnim = rl.load_image_anim(str(THIS_DIR/"resources/scarfy_run.gif"), animFrames)
-
-# Extract the value from the pointer
-animFrames_value = animFrames[0]
+# Open the GIF animation for streaming
+# NOTE: Frames are decoded one at a time by a worker thread (see gif_stream.py),
+# into a small ring of RGBA (32bit) frame buffers, instead of loading all of them
+# into a single Image with rl.load_image_anim(), so memory doesn't grow with the animation length
+gifStream = GifStream(str(THIS_DIR/"resources/scarfy_run.gif"))
+animFrames_value = gifStream.frame_count
 
-# Load texture from image
+# Load texture showing the first frame
 # NOTE: We will update this texture when required with next frame data
 # WARNING: It's not recommended to use this technique for sprites animation,
 # use spritesheets instead, like illustrated in textures_sprite_anim example
-texScarfyAnim = rl.load_texture_from_image(imScarfyAnim)
-
-nextFrameDataOffset = 0  # Current byte offset to next frame in image.data
+texScarfyAnim = gifStream.load_texture()
 
 currentAnimFrame = 0    # Current animation frame to load and draw
 frameDelay = 8          # Frame delay to switch between animation frames
@@ -54,20 +54,11 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     frameCounter += 1
     if frameCounter >= frameDelay:
         # Move to next frame
-        # NOTE: If final frame is reached we return to first frame
-        currentAnimFrame += 1
-        if currentAnimFrame >= animFrames_value:
-            currentAnimFrame = 0
-        
-        # Get memory offset position for next frame data in image.data
-        nextFrameDataOffset = imScarfyAnim.width * imScarfyAnim.height * 4 * currentAnimFrame
-        
-        # Update GPU texture data with next frame image data
+        # NOTE: If final frame is reached the stream returns to first frame
+        # Update GPU texture data with next frame image data, once decoded
         # WARNING: Data size (frame size) and pixel format must match already created texture
-        # We need to get a pointer to the image data, offset by the nextFrameDataOffset
-        data_ptr = rl.ffi.cast("unsigned char *", imScarfyAnim.data)
-        offset_ptr = rl.ffi.cast("void *", data_ptr + nextFrameDataOffset)
-        rl.update_texture(texScarfyAnim, offset_ptr)
+        gifStream.update_texture(texScarfyAnim)
+        currentAnimFrame = gifStream.current_frame
         
         frameCounter = 0
     
@@ -89,7 +80,7 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     
     rl.draw_text(f"TOTAL GIF FRAMES:  {animFrames_value:02d}", 50, 30, 20, rl.LIGHTGRAY)
     rl.draw_text(f"CURRENT FRAME: {currentAnimFrame:02d}", 50, 60, 20, rl.GRAY)
-    rl.draw_text(f"CURRENT FRAME IMAGE.DATA OFFSET: {nextFrameDataOffset}", 50, 90, 20, rl.GRAY)
+    rl.draw_text(f"FRAME BUFFERS MEMORY: {gifStream.memory_size // 1024} KB", 50, 90, 20, rl.GRAY)
     
     rl.draw_text("FRAMES DELAY: ", 100, 305, 10, rl.DARKGRAY)
     rl.draw_text(f"{frameDelay:02d} frames", 620, 305, 10, rl.DARKGRAY)
@@ -107,6 +98,6 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     rl.end_drawing()
 
 # De-Initialization
+gifStream.close()                 # Stop decoding, close the file
 rl.unload_texture(texScarfyAnim)  # Unload texture
-rl.unload_image(imScarfyAnim)     # Unload image (contains all frames)
 rl.close_window()                 # Close window and OpenGL context
\ No newline at end of file
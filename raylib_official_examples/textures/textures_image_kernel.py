@@ -11,17 +11,25 @@ This source has been converted from C raylib examples to Python.
 """
 
 import pyray as rl
+import sys
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
+
+from image_convolution import image_convolution
+
 THIS_DIR = Path(__file__).resolve().parent
 
-def normalize_kernel(kernel, size):
-    """Normalize values in a kernel"""
-    total = sum(kernel)
+def normalize_kernel(kernel):
+    """Normalize values in a kernel (NumPy float32 array), in place"""
+    total = kernel.sum()
     
     if total != 0.0:
-        for i in range(size):
-            kernel[i] /= total
+        kernel /= total
     
     return kernel
 
@@ -34,39 +42,41 @@ rl.init_window(screenWidth, screenHeight, "raylib [textures] example - image con
 image = rl.load_image(str(THIS_DIR/"resources/cat.png"))  # Loaded in CPU memory (RAM)
 
 # Define kernels for different effects
-gaussian_kernel = rl.ffi.new("float[]", [
+gaussian_kernel = np.array([
     1.0, 2.0, 1.0,
     2.0, 4.0, 2.0,
     1.0, 2.0, 1.0
-])
+], np.float32)
 
-sobel_kernel = rl.ffi.new("float[]", [
+sobel_kernel = np.array([
     1.0, 0.0, -1.0,
     2.0, 0.0, -2.0,
     1.0, 0.0, -1.0
-])
+], np.float32)
 
-sharpen_kernel = rl.ffi.new("float[]", [
+sharpen_kernel = np.array([
     0.0, -1.0, 0.0,
     -1.0, 5.0, -1.0,
     0.0, -1.0, 0.0
-])
+], np.float32)
 
 # Normalize kernels
-gaussian_kernel = normalize_kernel(gaussian_kernel, 9)
-sharpen_kernel = normalize_kernel(sharpen_kernel, 9)
-sobel_kernel = normalize_kernel(sobel_kernel, 9)
+gaussian_kernel = normalize_kernel(gaussian_kernel)
+sharpen_kernel = normalize_kernel(sharpen_kernel)
+sobel_kernel = normalize_kernel(sobel_kernel)
 
 # Apply kernels to create different image effects
+# NOTE: image_convolution() gives the same results as rl.image_kernel_convolution(), computed with NumPy,
+# one vectorized pass per kernel coefficient
 cat_sharpened = rl.image_copy(image)
-rl.image_kernel_convolution(cat_sharpened, rl.ffi.cast("float *", sharpen_kernel), 9)
+image_convolution(cat_sharpened, sharpen_kernel)
 
 cat_sobel = rl.image_copy(image)
-rl.image_kernel_convolution(cat_sobel, rl.ffi.cast("float *", sobel_kernel), 9)
+image_convolution(cat_sobel, sobel_kernel)
 
 cat_gaussian = rl.image_copy(image)
 for i in range(6):
-    rl.image_kernel_convolution(cat_gaussian, rl.ffi.cast("float *", gaussian_kernel), 9)
+    image_convolution(cat_gaussian, gaussian_kernel)
 
 # Crop images to show side by side
 rl.image_crop(image, rl.Rectangle(0, 0, 200, 450))
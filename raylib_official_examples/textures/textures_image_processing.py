@@ -13,6 +13,8 @@ import pyray as rl
 from pathlib import Path
 from enum import IntEnum
 
+from image_worker import ImageWorker
+
 THIS_DIR = Path(__file__).resolve().parent
 
 NUM_PROCESSES = 9
@@ -42,6 +44,22 @@ processText = [
     "FLIP HORIZONTAL"
 ]
 
+# Processing applied to a copy of the original image, for each option
+# NOTE: Image processing is a costly CPU process, done here by a worker thread,
+# if image processing is required in a frame-basis, it should be done
+# with a texture and by shaders
+processFunctions = [
+    None,
+    rl.image_color_grayscale,
+    lambda image: rl.image_color_tint(image, rl.GREEN),
+    rl.image_color_invert,
+    lambda image: rl.image_color_contrast(image, -40),
+    lambda image: rl.image_color_brightness(image, -80),
+    lambda image: rl.image_blur_gaussian(image, 10),
+    rl.image_flip_vertical,
+    rl.image_flip_horizontal
+]
+
 # Initialization
 screenWidth = 800
 screenHeight = 450
@@ -53,7 +71,8 @@ imOrigin = rl.load_image(str(THIS_DIR/"resources/parrots.png"))   # Loaded in CP
 rl.image_format(imOrigin, rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8)   # Format image to RGBA 32bit (required for texture update)
 texture = rl.load_texture_from_image(imOrigin)    # Image converted to texture, GPU memory (VRAM)
 
-imCopy = rl.image_copy(imOrigin)
+# Processes copies of imOrigin off the render thread, and updates the texture (without reallocating it)
+worker = ImageWorker(imOrigin, texture)
 
 currentProcess = ImageProcess.NONE
 textureReload = False
@@ -95,41 +114,19 @@ while not rl.window_should_close():  # Detect window close button or ESC key
 
     # Reload texture when required
     if textureReload:
-        rl.unload_image(imCopy)           # Unload image-copy data
-        imCopy = rl.image_copy(imOrigin)  # Restore image-copy from image-origin
-
-        # NOTE: Image processing is a costly CPU process to be done every frame,
-        # If image processing is required in a frame-basis, it should be done
-        # with a texture and by shaders
-        if currentProcess == ImageProcess.COLOR_GRAYSCALE:
-            rl.image_color_grayscale(imCopy)
-        elif currentProcess == ImageProcess.COLOR_TINT:
-            rl.image_color_tint(imCopy, rl.GREEN)
-        elif currentProcess == ImageProcess.COLOR_INVERT:
-            rl.image_color_invert(imCopy)
-        elif currentProcess == ImageProcess.COLOR_CONTRAST:
-            rl.image_color_contrast(imCopy, -40)
-        elif currentProcess == ImageProcess.COLOR_BRIGHTNESS:
-            rl.image_color_brightness(imCopy, -80)
-        elif currentProcess == ImageProcess.GAUSSIAN_BLUR:
-            rl.image_blur_gaussian(imCopy, 10)
-        elif currentProcess == ImageProcess.FLIP_VERTICAL:
-            rl.image_flip_vertical(imCopy)
-        elif currentProcess == ImageProcess.FLIP_HORIZONTAL:
-            rl.image_flip_horizontal(imCopy)
-
-        pixels = rl.load_image_colors(imCopy)    # Load pixel data from image (RGBA 32bit)
-        rl.update_texture(texture, pixels)       # Update texture with new image data
-        rl.unload_image_colors(pixels)           # Unload pixels data from RAM
-
+        worker.submit(processFunctions[currentProcess])
         textureReload = False
 
+    worker.update()  # Update texture with the processed image data, once ready
+
     # Draw
     rl.begin_drawing()
     
     rl.clear_background(rl.RAYWHITE)
     
     rl.draw_text("IMAGE PROCESSING:", 40, 30, 10, rl.DARKGRAY)
+    if worker.busy:
+        rl.draw_text("PROCESSING...", 140, 30, 10, rl.MAROON)
 
     # Draw rectangles
     for i in range(NUM_PROCESSES):
@@ -176,8 +173,8 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     rl.end_drawing()
 
 # De-Initialization
+worker.shutdown()             # Stop the worker, it reads imOrigin
 rl.unload_texture(texture)    # Unload texture from VRAM
 rl.unload_image(imOrigin)     # Unload image-origin from RAM
-rl.unload_image(imCopy)       # Unload image-copy from RAM
 
 rl.close_window()             # Close window and OpenGL context
\ No newline at end of file
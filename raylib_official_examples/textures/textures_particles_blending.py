@@ -9,23 +9,30 @@ This source has been converted from C raylib examples to Python.
 """
 
 import pyray as rl
-from dataclasses import dataclass
 from pathlib import Path
 import random
+import sys
 
-THIS_DIR = Path(__file__).resolve().parent
+try:
+    import numpy as np
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
+
+from particle_pool import ParticlePool
+from sprite_batch import SpriteBatch
 
-MAX_PARTICLES = 200
+THIS_DIR = Path(__file__).resolve().parent
 
-@dataclass
-class Particle:
-    """Particle structure with basic data"""
-    position: rl.Vector2
-    color: rl.Color
-    alpha: float
-    size: float
-    rotation: float
-    active: bool  # NOTE: Use it to activate/deactivate particle
+# Particles are stored in NumPy arrays (see particle_pool.py), spawned from a free list,
+# updated with vectorized operations and drawn in bulk by a SpriteBatch (see sprite_batch.py)
+# With --stress, 500 particles are spawned per frame instead of 1, up to 100K particles
+if "--stress" in sys.argv[1:]:
+    MAX_PARTICLES = 100000
+    PARTICLES_PER_FRAME = 500
+else:
+    MAX_PARTICLES = 200
+    PARTICLES_PER_FRAME = 1
 
 # Initialization
 screenWidth = 800
@@ -34,27 +41,18 @@ screenHeight = 450
 rl.init_window(screenWidth, screenHeight, "raylib [textures] example - particles blending")
 
 # Particles pool, reuse them!
-mouseTail = []
+mouseTail = ParticlePool(MAX_PARTICLES)
 
 # Initialize particles
-for i in range(MAX_PARTICLES):
-    mouseTail.append(Particle(
-        position=rl.Vector2(0, 0),
-        color=rl.Color(
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255),
-            255
-        ),
-        alpha=1.0,
-        size=random.randint(1, 30) / 20.0,
-        rotation=random.randint(0, 360),
-        active=False
-    ))
+rng = np.random.default_rng(random.getrandbits(64))
+mouseTail.colors[:, :3] = rng.integers(0, 256, (MAX_PARTICLES, 3))
+mouseTail.sizes[:] = rng.integers(1, 31, MAX_PARTICLES) / 20.0
+mouseTail.rotations[:] = rng.integers(0, 361, MAX_PARTICLES)
 
 gravity = 3.0
 
 smoke = rl.load_texture(str(THIS_DIR/"resources/spark_flame.png"))
+smokeBatch = SpriteBatch(smoke)
 
 blending = rl.BLEND_ALPHA
 
@@ -64,27 +62,14 @@ rl.set_target_fps(60)
 while not rl.window_should_close():  # Detect window close button or ESC key
     # Update
     
-    # Activate one particle every frame and Update active particles
+    # Activate particles every frame and Update active particles
     # NOTE: Particles initial position should be mouse position when activated
     # NOTE: Particles fall down with gravity and rotation... and disappear after 2 seconds (alpha = 0)
-    # NOTE: When a particle disappears, active = false and it can be reused.
-    for i in range(MAX_PARTICLES):
-        if not mouseTail[i].active:
-            mouseTail[i].active = True
-            mouseTail[i].alpha = 1.0
-            mouseTail[i].position = rl.get_mouse_position()
-            break
-    
-    for i in range(MAX_PARTICLES):
-        if mouseTail[i].active:
-            mouseTail[i].position.y += gravity / 2
-            mouseTail[i].alpha -= 0.005
-            
-            if mouseTail[i].alpha <= 0.0:
-                mouseTail[i].active = False
-            
-            mouseTail[i].rotation += 2.0
-    
+    # NOTE: When a particle disappears, it returns to the free list and it can be reused.
+    mousePosition = rl.get_mouse_position()
+    mouseTail.spawn(mousePosition.x, mousePosition.y, PARTICLES_PER_FRAME)
+    mouseTail.update(gravity / 2, 0.005, 2.0)
+
     if rl.is_key_pressed(rl.KEY_SPACE):
         if blending == rl.BLEND_ALPHA:
             blending = rl.BLEND_ADDITIVE
@@ -99,25 +84,8 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     rl.begin_blend_mode(blending)
     
     # Draw active particles
-    for i in range(MAX_PARTICLES):
-        if mouseTail[i].active:
-            rl.draw_texture_pro(
-                smoke, 
-                rl.Rectangle(0.0, 0.0, smoke.width, smoke.height),
-                rl.Rectangle(
-                    mouseTail[i].position.x, 
-                    mouseTail[i].position.y, 
-                    smoke.width * mouseTail[i].size, 
-                    smoke.height * mouseTail[i].size
-                ),
-                rl.Vector2(
-                    smoke.width * mouseTail[i].size / 2.0, 
-                    smoke.height * mouseTail[i].size / 2.0
-                ), 
-                mouseTail[i].rotation,
-                rl.fade(mouseTail[i].color, mouseTail[i].alpha)
-            )
-    
+    mouseTail.draw(smokeBatch)
+
     rl.end_blend_mode()
     
     rl.draw_text("PRESS SPACE to CHANGE BLENDING MODE", 180, 20, 20, rl.BLACK)
@@ -127,8 +95,11 @@ while not rl.window_should_close():  # Detect window close button or ESC key
     else:
         rl.draw_text("ADDITIVE BLENDING", 280, screenHeight - 40, 20, rl.RAYWHITE)
     
+    rl.draw_text(f"{mouseTail.count} particles", 10, 10, 20, rl.RAYWHITE)
+    
     rl.end_drawing()
 
 # De-Initialization
+smokeBatch.unload()
 rl.unload_texture(smoke)
 rl.close_window()  # Close window and OpenGL context
\ No newline at end of file
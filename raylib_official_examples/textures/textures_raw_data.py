@@ -10,9 +10,17 @@ This source has been converted from C raylib examples to Python.
 """
 
 import pyray as rl
-import ctypes
+import sys
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:
+    print("This example requires NumPy. Please install it using: pip install numpy")
+    sys.exit(1)
+
+from image_arrays import image_from_array
+
 THIS_DIR = Path(__file__).resolve().parent
 
 # Initialization
@@ -33,30 +41,19 @@ rl.unload_image(fudesumiRaw)                      # Unload CPU (RAM) image data
 width = 960
 height = 480
 
-# Create a Color array and fill it with pattern
-# We'll use pyray's ffi to create the array properly
-pixels = rl.ffi.new("Color[%d]" % (width * height))
-
-for y in range(height):
-    for x in range(width):
-        if (((x//32 + y//32)//1) % 2 == 0):
-            pixels[y*width + x] = rl.ORANGE
-        else:
-            pixels[y*width + x] = rl.GOLD
-
-# Create image using the pixel data
-checkedIm = rl.Image()
-checkedIm.data = rl.ffi.cast("void *", pixels)
-checkedIm.width = width
-checkedIm.height = height
-checkedIm.format = rl.PIXELFORMAT_UNCOMPRESSED_R8G8B8A8
-checkedIm.mipmaps = 1
+# Create a (height, width, 4) RGBA array and fill it with pattern, all pixels at once
+y, x = np.mgrid[0:height, 0:width]
+pixels = np.where(((x//32 + y//32) % 2 == 0)[..., None],
+                  np.array(rl.ORANGE, np.uint8), np.array(rl.GOLD, np.uint8))
+
+# Create image using the pixel data (R8G8B8A8 format, deduced from the array), without copy
+checkedIm = image_from_array(pixels)
 
 checked = rl.load_texture_from_image(checkedIm)
 
-# Note: We don't unload checkedIm here as it would free our pixels array
-# which is managed by FFI. In a real application, you'd want to ensure
-# proper memory management.
+# NOTE: checkedIm must not be unloaded with rl.unload_image(), its pixels belong to the NumPy
+# array, they are freed with the array
+del checkedIm, pixels
 
 rl.set_target_fps(60)  # Set our game to run at 60 frames-per-second
 
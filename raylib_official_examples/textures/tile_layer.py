@@ -0,0 +1,146 @@
+"""
+Static tilemap layer, cached in chunk render textures.
+
+Drawing a tilemap tile by tile costs one or more draw calls per tile at each frame, so the
+frame time grows with the map size, even when the tiles never change. TileLayer renders the
+tiles once into render textures of CHUNK_TILES x CHUNK_TILES tiles (chunks), and draws the
+chunks instead:
+- only the chunks intersecting the view are drawn, so a frame costs a roughly constant number
+  of draws (about (view size / chunk size + 1)^2) whatever the map size,
+- a chunk is rendered when it becomes visible, and rendered again only after set_tile() or
+  invalidate() changed its tiles,
+- at most max_chunks render textures are kept, the least recently visible ones are unloaded
+  (and rendered again if they become visible), so large maps don't exhaust the VRAM. Visible
+  chunks are never unloaded: max_chunks grows if a view shows more chunks (e.g. zooming out).
+
+Chunks are opaque, cleared with the background color before drawing their tiles, so
+translucent tiles blend with the background the same way as when drawn on screen.
+
+    layer = TileLayer(tile_ids, MAP_TILE_SIZE, draw_tile, background=rl.RAYWHITE)
+    while not rl.window_should_close():
+        layer.update(view)  # Before rl.begin_drawing(), renders the visible dirty chunks
+        rl.begin_drawing()
+        layer.draw(view)  # view: map area shown, e.g. camera_view(camera, screen_width, screen_height)
+        ...
+    layer.unload()
+"""
+from collections import OrderedDict
+from typing import Callable, Iterator, Set, Tuple
+
+import pyray as rl
+
+CHUNK_TILES = 16  # Chunk width and height, in tiles
+DEFAULT_MAX_CHUNKS = 64  # Render textures kept, e.g. 64 chunks of 16x16 tiles of 32 pixels use 64 MB
+
+# Draws one tile at (x, y) pixels, relative to the chunk: draw_tile(tile_id, x, y)
+TileDrawer = Callable[[int, int, int], None]
+
+
+def camera_view(camera, width: int, height: int):
+    """Returns the world rectangle seen through a Camera2D (without rotation) on a width x height screen."""
+    top_left = rl.get_screen_to_world_2d(rl.Vector2(0, 0), camera)
+    bottom_right = rl.get_screen_to_world_2d(rl.Vector2(width, height), camera)
+    return rl.Rectangle(top_left.x, top_left.y, bottom_right.x - top_left.x, bottom_right.y - top_left.y)
+
+
+class TileLayer:
+    """Tiles drawn through cached chunk render textures, see the module docstring."""
+
+    def __init__(self, tile_ids, tile_size: int, draw_tile: TileDrawer, background=rl.BLANK,
+                 chunk_tiles: int = CHUNK_TILES, max_chunks: int = DEFAULT_MAX_CHUNKS):
+        """tile_ids is indexed [y, x] (e.g. a 2D NumPy array), its shape is (tiles_y, tiles_x)."""
+        self.tile_ids = tile_ids
+        self.tiles_y, self.tiles_x = tile_ids.shape
+        self.tile_size = tile_size
+        self.draw_tile = draw_tile
+        self.background = background
+        self.chunk_tiles = chunk_tiles
+        self.chunk_size = chunk_tiles * tile_size  # In pixels
+        self.chunks_x = (self.tiles_x + chunk_tiles - 1) // chunk_tiles
+        self.chunks_y = (self.tiles_y + chunk_tiles - 1) // chunk_tiles
+        self.max_chunks = max_chunks
+        self._chunks: "OrderedDict[Tuple[int, int], rl.RenderTexture]" = OrderedDict()  # Least recently drawn first
+        self._dirty: Set[Tuple[int, int]] = set()  # Loaded chunks to render again
+        self.chunks_rendered = 0  # By the last update()
+        self.chunks_drawn = 0  # By the last draw()
+
+    def set_tile(self, x: int, y: int, tile_id: int):
+        self.tile_ids[y, x] = tile_id
+        self.invalidate(x, y)
+
+    def invalidate(self, x: int, y: int, width: int = 1, height: int = 1):
+        """Renders the chunks of the tiles (x, y, width, height) again, after tile_ids was changed directly."""
+        for chunk_y in range(y // self.chunk_tiles, (y + height - 1) // self.chunk_tiles + 1):
+            for chunk_x in range(x // self.chunk_tiles, (x + width - 1) // self.chunk_tiles + 1):
+                if (chunk_x, chunk_y) in self._chunks:
+                    self._dirty.add((chunk_x, chunk_y))
+
+    def visible_chunks(self, view) -> Iterator[Tuple[int, int]]:
+        """Chunks intersecting the view rectangle (in map pixels)."""
+        first_x = max(int(view.x // self.chunk_size), 0)
+        first_y = max(int(view.y // self.chunk_size), 0)
+        last_x = min(int((view.x + view.width) // self.chunk_size), self.chunks_x - 1)
+        last_y = min(int((view.y + view.height) // self.chunk_size), self.chunks_y - 1)
+        for chunk_y in range(first_y, last_y + 1):
+            for chunk_x in range(first_x, last_x + 1):
+                yield chunk_x, chunk_y
+
+    def _render_chunk(self, chunk_x: int, chunk_y: int, target):
+        first_x = chunk_x * self.chunk_tiles
+        first_y = chunk_y * self.chunk_tiles
+        rl.begin_texture_mode(target)
+        rl.clear_background(self.background)
+        for y in range(first_y, min(first_y + self.chunk_tiles, self.tiles_y)):
+            for x in range(first_x, min(first_x + self.chunk_tiles, self.tiles_x)):
+                self.draw_tile(int(self.tile_ids[y, x]), (x - first_x) * self.tile_size, (y - first_y) * self.tile_size)
+        rl.end_texture_mode()
+
+    def update(self, view):
+        """Renders the visible chunks not rendered yet, or whose tiles changed. Call it outside of drawing."""
+        self.chunks_rendered = 0
+        visible = list(self.visible_chunks(view))
+        self.max_chunks = max(self.max_chunks, len(visible))
+        # Visible chunks become the most recently used, so the evicted chunks (least recently used
+        # first) are never visible: they are evicted only when more than max_chunks are loaded
+        for key in visible:
+            if key in self._chunks:
+                self._chunks.move_to_end(key)
+        for key in visible:
+            target = self._chunks.get(key)
+            if target is not None and key not in self._dirty:
+                continue
+            if target is None:
+                if len(self._chunks) >= self.max_chunks:
+                    evicted, evicted_target = self._chunks.popitem(last=False)
+                    rl.unload_render_texture(evicted_target)
+                    self._dirty.discard(evicted)
+                chunk_x, chunk_y = key
+                # Chunks on the right and bottom edges of the map may be smaller
+                width = (min((chunk_x + 1) * self.chunk_tiles, self.tiles_x) - chunk_x * self.chunk_tiles) * self.tile_size
+                height = (min((chunk_y + 1) * self.chunk_tiles, self.tiles_y) - chunk_y * self.chunk_tiles) * self.tile_size
+                target = rl.load_render_texture(width, height)
+                self._chunks[key] = target
+            self._render_chunk(*key, target)
+            self._dirty.discard(key)
+            self.chunks_rendered += 1
+
+    def draw(self, view, offset_x: float = 0.0, offset_y: float = 0.0):
+        """Draws the rendered chunks intersecting the view, the map origin being at (offset_x, offset_y)."""
+        self.chunks_drawn = 0
+        for key in self.visible_chunks(view):
+            target = self._chunks.get(key)
+            if target is None:  # Not rendered yet, update() was not called with this view
+                continue
+            self._chunks.move_to_end(key)
+            texture = target.texture
+            # NOTE: Render texture must be y-flipped due to default OpenGL coordinates (left-bottom)
+            rl.draw_texture_rec(texture, rl.Rectangle(0, 0, texture.width, -texture.height),
+                                rl.Vector2(offset_x + key[0] * self.chunk_size, offset_y + key[1] * self.chunk_size),
+                                rl.WHITE)
+            self.chunks_drawn += 1
+
+    def unload(self):
+        for target in self._chunks.values():
+            rl.unload_render_texture(target)
+        self._chunks.clear()
+        self._dirty.clear()